@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Hashable
 
 from PIL import Image, ImageTk
 
+from growpot.atlas import ATLAS_IMAGE, ATLAS_INDEX, load_atlas
+from growpot.rgba_cache import shared_rgba_cache
+
 
 @dataclass
 class FrameSet:
@@ -17,6 +25,10 @@ class FrameSet:
 
     def composite_with(self, other: FrameSet, index: int, max_w: int, max_h: int) -> ImageTk.PhotoImage:
         """Composite this frameset with another at given index."""
+        return ImageTk.PhotoImage(self.composite_image(other, index, max_w, max_h))
+
+    def composite_image(self, other: FrameSet, index: int, max_w: int, max_h: int) -> Image.Image:
+        """PIL version of composite_with"""
         base_frame = self.frames[index]
         overlay_frame = other.frames[index % len(other.frames)] if other.frames else None
 
@@ -34,22 +46,254 @@ class FrameSet:
             plant_y = max_h - other.height
             combined.paste(overlay_frame, (plant_x, plant_y), overlay_frame)
 
-        return ImageTk.PhotoImage(combined)
+        return combined
 
 
-def load_frames(folder: Path) -> FrameSet:
+class LRUCache:
+    """Thread-safe LRU mapping bounded by a byte budget, with sizeof(value) giving each entry's bytes"""
+
+    def __init__(self, budget_bytes: int, sizeof: Callable[[Any], int]):
+        self.budget_bytes = budget_bytes
+        self.sizeof = sizeof
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value):
+        """Insert or replace key; a value larger than the whole budget is not kept"""
+        nbytes = self.sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[1]
+            if nbytes <= self.budget_bytes:
+                self._entries[key] = (value, nbytes)
+                self.size_bytes += nbytes
+                self._evict()
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None):
+        """Drop the entries whose key matches predicate (all of them without one)"""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+                self.size_bytes = 0
+                return
+            for key in [key for key in self._entries if predicate(key)]:
+                self.size_bytes -= self._entries.pop(key)[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self):
+        while self.size_bytes > self.budget_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted
+            self.evictions += 1
+
+
+_decode_pool: ThreadPoolExecutor | None = None
+_decode_pool_lock = threading.Lock()
+
+
+def decode_pool() -> ThreadPoolExecutor:
+    """Thread pool shared by all frame decoding (Pillow releases the GIL while decoding)"""
+    global _decode_pool
+    with _decode_pool_lock:
+        if _decode_pool is None:
+            _decode_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="frame-decode")
+        return _decode_pool
+
+
+def _decode(path: Path) -> list[Image.Image]:
+    return [shared_rgba_cache.decode(path)]
+
+
+def _decode_atlas_or_frames(folder: Path) -> list[Image.Image]:
+    """Frames from the atlas of folder, or decoded one by one if it turned out to be stale"""
+    frames = load_atlas(folder)
+    if frames is None:
+        frames = [frame for path in sorted(folder.glob("frame_*.png")) for frame in _decode(path)]
+    return frames
+
+
+class PendingFrames:
+    """Frames of one folder being decoded on the shared pool; result() waits and checks them"""
+
+    def __init__(self, folder: Path, parts: list[Future], error: Exception | None = None):
+        self.folder = folder
+        self._parts = parts  # In frame order, each resolving to a list of frames
+        self._error = error
+        self._frameset: FrameSet | None = None
+        self._lock = threading.Lock()
+
+    def result(self) -> FrameSet:
+        """The decoded FrameSet; every caller (on any thread) gets the same object"""
+        with self._lock:
+            if self._frameset is None:
+                self._frameset = self._build()
+            return self._frameset
+
+    def _build(self) -> FrameSet:
+        if self._error is not None:
+            raise self._error
+        pil_frames = [frame for part in self._parts for frame in part.result()]
+        if not pil_frames:
+            # A stale atlas next to a folder with no frames left
+            raise FileNotFoundError(f"No frames found in {self.folder} (expected frame_*.png)")
+
+        w = pil_frames[0].width
+        h = pil_frames[0].height
+
+        # Ensure consistent size (common mistake with frame sequences)
+        for p in pil_frames:
+            if p.size != (w, h):
+                raise ValueError(f"Frame sizes differ in {self.folder}. Keep all frames same size.")
+
+        return FrameSet(frames=pil_frames, width=w, height=h)
+
+
+def submit_frames(folder: Path) -> PendingFrames:
+    """Start decoding the frames of folder, one pool task per file.
+
+    Submit every set a screen needs before calling result() on any of them, and their frames
+    decode together.
+    """
+    pool = decode_pool()
+    # A packed atlas (python -m growpot.atlas) is one file to decode instead of one per frame. Whether
+    # it is current is only decided by load_atlas itself, since the frames may change before it runs.
+    if (folder / ATLAS_INDEX).exists():
+        return PendingFrames(folder, [pool.submit(_decode_atlas_or_frames, folder)])
     files = sorted(folder.glob("frame_*.png"))
     if not files:
-        raise FileNotFoundError(f"No frames found in {folder} (expected frame_*.png)")
+        return PendingFrames(folder, [], FileNotFoundError(f"No frames found in {folder} (expected frame_*.png)"))
+    return PendingFrames(folder, [pool.submit(_decode, p) for p in files])
+
+
+def _frameset_bytes(frameset: FrameSet) -> int:
+    return sum(frame.width * frame.height * 4 for frame in frameset.frames)
+
+
+def load_frames(folder: Path) -> FrameSet:
+    return submit_frames(folder).result()
+
+
+class FrameSetCache:
+    """Process-wide LRU of decoded FrameSets, bounded by their RGBA size in bytes.
+
+    Entries are keyed by the resolved folder and checked against the names, mtimes and sizes of
+    its frame and atlas files, so a cache hit only costs one directory scan; edited assets are
+    decoded again. Safe to use from loader threads: a folder already being decoded for one caller
+    is waited on by the others instead of decoded twice.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.hits = 0
+        self.misses = 0
+        # path -> (signature, FrameSet)
+        self._entries = LRUCache(budget_bytes, lambda entry: _frameset_bytes(entry[1]))
+        self._in_flight: dict[tuple[Path, tuple], PendingFrames] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._entries.budget_bytes
+
+    def load(self, folder: Path) -> FrameSet:
+        """load_frames(folder), served from memory while the files are unchanged"""
+        return self.load_many([folder])[0]
+
+    def load_many(self, folders: list[Path], missing_ok: bool = False) -> list[FrameSet | None]:
+        """Load several folders at once: every miss is submitted to the decode pool before any is awaited.
+
+        A folder without frames raises FileNotFoundError, or gives None with missing_ok.
+        """
+        checked = []
+        for folder in folders:
+            path = folder.resolve()
+            signature = self._signature(path)
+            entry = self._entries.get(path)
+            with self._lock:
+                if entry is not None and entry[0] == signature:
+                    self.hits += 1
+                    checked.append((path, signature, entry[1], False))
+                    continue
+                self.misses += 1
+                pending = self._in_flight.get((path, signature))
+                owner = pending is None
+                if owner:
+                    pending = self._in_flight[(path, signature)] = submit_frames(folder)
+            checked.append((path, signature, pending, owner))
+
+        framesets = []
+        try:
+            for path, signature, loaded, owner in checked:
+                if isinstance(loaded, PendingFrames):
+                    try:
+                        frameset = loaded.result()
+                    except FileNotFoundError:
+                        if not missing_ok:
+                            raise
+                        frameset = None
+                    else:
+                        if owner:
+                            self._entries.put(path, (signature, frameset))
+                else:
+                    frameset = loaded
+                framesets.append(frameset)
+        finally:
+            # Stored (or failed): later callers go through the cache, or retry
+            with self._lock:
+                for path, signature, loaded, owner in checked:
+                    if owner:
+                        self._in_flight.pop((path, signature), None)
+        return framesets
+
+    def set_budget(self, budget_bytes: int):
+        self._entries.set_budget(budget_bytes)
+
+    def clear(self):
+        self._entries.invalidate()
 
-    pil_frames: list[Image.Image] = [Image.open(p).convert("RGBA") for p in files]
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries), "bytes": self._entries.size_bytes, "budget": self.budget_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self._entries.evictions,
+            }
 
-    w = pil_frames[0].width
-    h = pil_frames[0].height
+    @staticmethod
+    def _signature(path: Path) -> tuple:
+        """(name, mtime_ns, size) of the files load_frames may read from path"""
+        try:
+            with os.scandir(path) as entries:
+                files = [
+                    entry for entry in entries
+                    if (entry.name.startswith("frame_") and entry.name.endswith(".png"))
+                    or entry.name in (ATLAS_IMAGE, ATLAS_INDEX)
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return ()
+        signature = []
+        for entry in sorted(files, key=lambda entry: entry.name):
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
 
-    # Ensure consistent size (common mistake with frame sequences)
-    for p in pil_frames:
-        if p.size != (w, h):
-            raise ValueError(f"Frame sizes differ in {folder}. Keep all frames same size.")
 
-    return FrameSet(frames=pil_frames, width=w, height=h)
+# Shared by every AnimationManager (budget set from GameConfig.frame_cache_bytes)
+shared_frame_cache = FrameSetCache(32 * 1024 * 1024)
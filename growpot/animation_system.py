@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import logging
 import time
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-from growpot.anim import FrameSet, load_frames
+from growpot.anim import FrameSet, LRUCache, shared_frame_cache
 from PIL import ImageTk
 from growpot.game_config import GameConfig
 
 
+_STAGES = ("seed", "sprout", "plant")
+
+logger = logging.getLogger(__name__)
+
+
 class AnimationManager:
     """Handles all animation logic for plants and pets"""
     
@@ -26,69 +33,163 @@ class AnimationManager:
         self.plant_frames_sprout: FrameSet | None = None
         self.plant_frames_plant: FrameSet | None = None
         self.pet_frames: FrameSet | None = None
+        self.pet_tk_frames: list[ImageTk.PhotoImage] = []  # pet_frames converted once, on load
+        self.pot_type: str | None = None
+        self.plant_type: str | None = None
+        
+        # Plant stages load lazily: the current one on load_plant_frames, the next one in the background
+        self._plant_assets_dir: Path | None = None
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stage-prefetch")
+        self._prefetching: dict[str, Future] = {}
+        self._missing_stages: set[str] = set()
+        
+        # Decoded frame sets, shared process-wide
+        self.frame_cache = shared_frame_cache
+        self.frame_cache.set_budget(config.frame_cache_bytes)
         
-        # Current composite image
+        # Finished composites by (pot_type, plant_type, stage, frame index, canvas width, canvas height)
+        self.composite_cache = LRUCache(config.composite_cache_bytes, lambda image: image.width() * image.height() * 4)
+        
+        # Current composite image and what it was built from
         self.current_image: tk.PhotoImage | None = None
+        self._current_image_key: tuple | None = None
         self.pet_img_item: Optional[int] = None
+        self._pet_shown_key: tuple | None = None
+    
+    def preload_frames(self, assets_dir: Path, pot_type: str, plant_type: str, growth: float,
+                       pet_type: Optional[str]):
+        """Decode the pot, current plant stage and pet frames as one parallel batch, ahead of the load_* calls"""
+        stage = self.get_current_stage(max(growth, 0.0))
+        folders = [assets_dir / "pots" / pot_type, assets_dir / "plants" / plant_type / stage, assets_dir / stage]
+        if pet_type:
+            folders.append(assets_dir / "pets" / pet_type)
+        self.frame_cache.load_many(folders, missing_ok=True)
+    
+    def load_plant_frames(self, assets_dir: Path, plant_type: str, growth: float = 0.0) -> bool:
+        """Load the plant frames needed at growth; later stages are prefetched as the plant grows"""
+        self.plant_type = plant_type
+        self._plant_assets_dir = assets_dir
+        self.composite_cache.invalidate(lambda key: key[1] == plant_type)
+        # Loads still running for the previous plant are dropped
+        for future in self._prefetching.values():
+            future.cancel()
+        self._prefetching = {}
+        self._missing_stages = set()
+        self.plant_frames_seed = None
+        self.plant_frames_sprout = None
+        self.plant_frames_plant = None
+        
+        stage = self.get_current_stage(max(growth, 0.0))
+        frames = self._load_stage(assets_dir, plant_type, stage)
+        if frames is None:
+            return False
+        setattr(self, f"plant_frames_{stage}", frames)
+        return True
     
-    def load_plant_frames(self, assets_dir: Path, plant_type: str) -> bool:
-        """Load plant frames for the specified plant type"""
+    def _load_stage(self, assets_dir: Path, plant_type: str, stage: str) -> FrameSet | None:
         try:
-            self.plant_frames_seed = load_frames(assets_dir / "plants" / plant_type / "seed")
+            return self.frame_cache.load(assets_dir / "plants" / plant_type / stage)
         except FileNotFoundError:
             # Fallback to old structure
             try:
-                self.plant_frames_seed = load_frames(assets_dir / "seed")
+                return self.frame_cache.load(assets_dir / stage)
             except FileNotFoundError:
-                return False
-        
-        try:
-            self.plant_frames_sprout = load_frames(assets_dir / "plants" / plant_type / "sprout")
-        except FileNotFoundError:
+                return None
+    
+    def poll_stage_frames(self, growth: float) -> bool:
+        """Take in finished stage loads and start the next one as growth nears it (True if frames arrived)"""
+        arrived = False
+        for stage, future in list(self._prefetching.items()):
+            if not future.done():
+                continue
+            del self._prefetching[stage]
             try:
-                self.plant_frames_sprout = load_frames(assets_dir / "sprout")
-            except FileNotFoundError:
-                return False
+                frames = future.result()
+            except Exception:
+                # A broken frame set (bad PNG, mixed frame sizes): keep showing the stage before it
+                logger.exception("Could not load %s frames of %s", stage, self.plant_type)
+                frames = None
+            if frames is None:
+                self._missing_stages.add(stage)
+            else:
+                setattr(self, f"plant_frames_{stage}", frames)
+                arrived = True
         
-        try:
-            self.plant_frames_plant = load_frames(assets_dir / "plants" / plant_type / "plant")
-        except FileNotFoundError:
-            try:
-                self.plant_frames_plant = load_frames(assets_dir / "plant")
-            except FileNotFoundError:
-                return False
+        if self.plant_type is None or growth < 0:
+            return arrived
         
-        return True
+        stage = self.get_current_stage(growth)
+        wanted = [stage]
+        if stage == "seed" and growth >= self.cfg.sprout_at - self.cfg.stage_prefetch_ahead:
+            wanted.append("sprout")
+        elif stage == "sprout" and growth >= self.cfg.plant_at - self.cfg.stage_prefetch_ahead:
+            wanted.append("plant")
+        for stage in wanted:
+            if (getattr(self, f"plant_frames_{stage}") is None and stage not in self._prefetching
+                    and stage not in self._missing_stages):
+                self._prefetching[stage] = self._loader.submit(
+                    self._load_stage, self._plant_assets_dir, self.plant_type, stage
+                )
+        return arrived
     
     def load_pot_frames(self, assets_dir: Path, pot_type: str) -> bool:
         """Load pot frames for the specified pot type"""
         try:
-            self.pot_frames = load_frames(assets_dir / "pots" / pot_type)
+            self.pot_frames = self.frame_cache.load(assets_dir / "pots" / pot_type)
+            self.pot_type = pot_type
+            self.composite_cache.invalidate(lambda key: key[0] == pot_type)
             return True
         except FileNotFoundError:
             return False
     
     def load_pet_frames(self, assets_dir: Path, pet_type: Optional[str]) -> bool:
         """Load pet frames for the specified pet type"""
+        # Start the new pet from its first frame, shown on the next update even if nothing else moved
+        self._pet_anim_index = 0
+        self._pet_shown_key = None
         if pet_type:
             try:
-                self.pet_frames = load_frames(assets_dir / "pets" / pet_type)
+                self.pet_frames = self.frame_cache.load(assets_dir / "pets" / pet_type)
+                self.pet_tk_frames = [self.pet_frames.get_tk_frame(i) for i in range(len(self.pet_frames.frames))]
                 return True
             except FileNotFoundError:
                 self.pet_frames = None
+                self.pet_tk_frames = []
                 return False
         else:
             self.pet_frames = None
+            self.pet_tk_frames = []
             return True
     
+    def get_current_stage(self, growth: float) -> str:
+        """Growth stage name: empty, seed, sprout or plant"""
+        if growth < 0:
+            return "empty"
+        if growth >= self.cfg.plant_at:
+            return "plant"
+        if growth >= self.cfg.sprout_at:
+            return "sprout"
+        return "seed"
+    
+    def get_displayed_stage(self, growth: float) -> str:
+        """Stage whose frames are shown: the current one, or while that is still loading the latest earlier one"""
+        stage = self.get_current_stage(growth)
+        if stage == "empty":
+            return stage
+        for candidate in reversed(_STAGES[:_STAGES.index(stage) + 1]):
+            if getattr(self, f"plant_frames_{candidate}") is not None:
+                return candidate
+        return "empty"
+    
     def get_current_plant_frames(self, growth: float) -> FrameSet:
         """Get the appropriate plant frames based on growth stage"""
-        if growth < 0:
+        stage = self.get_displayed_stage(growth)
+        if stage == "empty":
             # Empty pot - return empty frameset that shows just the pot
             return FrameSet([], 0, 0)
-        if growth >= self.cfg.plant_at:
+        if stage == "plant":
             return self.plant_frames_plant or FrameSet([], 0, 0)
-        if growth >= self.cfg.sprout_at:
+        if stage == "sprout":
             return self.plant_frames_sprout or FrameSet([], 0, 0)
         return self.plant_frames_seed or FrameSet([], 0, 0)
     
@@ -107,19 +208,52 @@ class AnimationManager:
             if plant_frameset.frames:  # Only animate if there are frames
                 self._anim_index = (self._anim_index + 1) % len(plant_frameset.frames)
         
-        # Create composite image
-        self.current_image = self.pot_frames.composite_with(
-            plant_frameset, 
-            self._anim_index, 
-            max_canvas_width, 
-            max_canvas_height
+        # Skip the rebuild if nothing visible changed since the last composite
+        key = (self.pot_frames, plant_frameset.frames or None, self._anim_index, max_canvas_width, max_canvas_height)
+        if self._current_image_key is not None and self._same_image_key(key, self._current_image_key):
+            return None
+        
+        # Reuse a finished composite, or build and keep one
+        stage = self.get_displayed_stage(growth)
+        cache_key = (
+            self.pot_type, self.plant_type if plant_frameset.frames else None, stage,
+            self._anim_index, max_canvas_width, max_canvas_height,
         )
+        image = self.composite_cache.get(cache_key)
+        if image is None:
+            image = self.pot_frames.composite_with(
+                plant_frameset, 
+                self._anim_index, 
+                max_canvas_width, 
+                max_canvas_height
+            )
+            self.composite_cache.put(cache_key, image)
+        self.current_image = image
+        self._current_image_key = key
         
         return self.current_image
     
+    @staticmethod
+    def _same_image_key(a: tuple, b: tuple) -> bool:
+        # Frame sets are compared by identity; comparing them by value would compare pixels
+        return a[0] is b[0] and a[1] is b[1] and a[2:] == b[2:]
+    
+    def seconds_until_next_frame(self, growth: float) -> float:
+        """Seconds until a visible animation frame changes (inf if everything is static)"""
+        frame_period = 1.0 / max(1, self.cfg.anim_fps)
+        animating = len(self.get_current_plant_frames(growth).frames) > 1 if self.pot_frames else False
+        if self.pet_frames and len(self.pet_frames.frames) > 1:
+            animating = True
+        if self._prefetching:
+            # Keep ticking to pick up the stage being loaded
+            animating = True
+        if not animating:
+            return float("inf")
+        return max(0.0, frame_period - max(self._anim_accum, self._pet_anim_accum))
+    
     def update_pet_animation(self, dt: float, max_canvas_width: int, max_canvas_height: int) -> Optional[tk.PhotoImage]:
-        """Update pet animation and return the current pet frame"""
-        if not self.pet_frames or not self.pet_frames.frames:
+        """Update pet animation and return the current pet frame (None if the pet layer is unchanged)"""
+        if not self.pet_frames or not self.pet_tk_frames:
             return None
         
         # Animate pet
@@ -129,9 +263,12 @@ class AnimationManager:
             self._pet_anim_accum -= frame_period
             self._pet_anim_index = (self._pet_anim_index + 1) % len(self.pet_frames.frames)
         
-        # Convert PIL Image to PhotoImage
-        pil_frame = self.pet_frames.frames[self._pet_anim_index]
-        return ImageTk.PhotoImage(pil_frame)
+        # Point the canvas at a pre-built frame, and only when it or the canvas size changed
+        key = (self._pet_anim_index, max_canvas_width, max_canvas_height)
+        if key == self._pet_shown_key:
+            return None
+        self._pet_shown_key = key
+        return self.pet_tk_frames[self._pet_anim_index]
     
     def get_pet_position(self, max_canvas_width: int, max_canvas_height: int) -> tuple[int, int]:
         """Get the position where pet should be displayed"""
@@ -163,3 +300,4 @@ class AnimationManager:
         self._pet_anim_index = 0
         self._anim_accum = 0.0
         self._pet_anim_accum = 0.0
+        self._pet_shown_key = None
@@ -4,23 +4,23 @@ import time
 import tkinter as tk
 from pathlib import Path
 
-from growpot.state import GameState, load_state, now_ts, save_state
+from growpot.state import GameState, load_state, save_state
 from growpot.game_config import GameConfig
 from growpot.ui_config import UIConfig
 from growpot.ui_components import UIManager
-from growpot.game_logic import GameEngine
 from growpot.animation_system import AnimationManager
-from growpot.warehouse_system import WarehouseManager
-from growpot.pet_system import PetManager
-from growpot.shop_system import ShopManager
-from growpot.profile_system import ProfileManager
+from growpot.session import GameSession
+from growpot.persistence import StateSaver
+from growpot.journal import DEFAULT_JOURNAL_FILE, DEFAULT_SNAPSHOT_FILE, InputJournal
+from growpot.ledger import DEFAULT_LEDGER_DIR, Ledger
+from growpot.live_snapshot import DEFAULT_LIVE_FILE, LiveSnapshotWriter
 from growpot.event_handlers import EventHandler
 
 
 class GrowPlotApp:
     """Main application coordinator that manages all subsystems"""
     
-    def __init__(self, root: tk.Tk, assets_dir: Path) -> None:
+    def __init__(self, root: tk.Tk, assets_dir: Path, live_file: Path = DEFAULT_LIVE_FILE) -> None:
         self.root = root
         self.assets_dir = assets_dir
         
@@ -28,17 +28,25 @@ class GrowPlotApp:
         self.cfg = GameConfig()
         self.ui = UIConfig()
         
-        # Load game state
+        # Load game state (changes are written back in the background)
         self.state = load_state()
+        self.saver = StateSaver(
+            coalesce_sec=self.cfg.save_coalesce_ms / 1000.0,
+            fsync=self.cfg.save_fsync,
+            compact_bytes=self.cfg.save_compact_bytes,
+        )
         
-        # Initialize subsystems
-        self.game_engine = GameEngine(self.cfg)
+        # Initialize subsystems (game logic lives in the session, shared with headless runs)
+        self.session = GameSession(self.cfg, self.state, self.ui)
+        self.game_engine = self.session.game_engine
+        # One file per running instance (main.py --live-file), watched by python -m growpot.live_snapshot
+        self.live_snapshot = LiveSnapshotWriter(self.cfg, live_file)
         self.animation_manager = AnimationManager(self.cfg)
         self.ui_manager = UIManager(root, 140, 100, self.ui)  # Initial size, will be updated
-        self.warehouse_manager = WarehouseManager(self.cfg, self.ui)
-        self.pet_manager = PetManager(self.cfg, self.ui)
-        self.shop_manager = ShopManager(self.cfg, self.ui)
-        self.profile_manager = ProfileManager(self.ui)
+        self.warehouse_manager = self.session.warehouse_manager
+        self.pet_manager = self.session.pet_manager
+        self.shop_manager = self.session.shop_manager
+        self.profile_manager = self.session.profile_manager
         self.event_handler = EventHandler(root, assets_dir, self.ui)
         
         # Setup window
@@ -51,14 +59,11 @@ class GrowPlotApp:
         # Initialize UI with callbacks
         self._setup_ui_callbacks()
         
-        # Apply offline progress and initialize shop inventory
-        self.game_engine.apply_offline_progress(self.state)
-        self._initialize_shop_inventory()
-
-        # Check for daily quest reset
-        self.game_engine.check_daily_quest_reset(self.state)
+        # Apply offline progress, initialize shop inventory and check for daily quest reset
+        self._start_session()
         
         # Start game loop
+        self._tick_job: str | None = None
         self._last_tick_perf = time.perf_counter()
         self._last_save_perf = time.perf_counter()
         self._tick()
@@ -80,12 +85,17 @@ class GrowPlotApp:
     
     def _load_assets(self):
         """Load all game assets"""
+        # Decode everything the first screen needs in one parallel batch; the loads below hit the frame cache
+        self.animation_manager.preload_frames(
+            self.assets_dir, self.state.pot_type, self.state.plant_type, self.state.growth, self.state.active_pet
+        )
+        
         # Load pot frames
         if not self.animation_manager.load_pot_frames(self.assets_dir, self.state.pot_type):
             raise FileNotFoundError(f"Pot frames not found for type: {self.state.pot_type}")
         
         # Load plant frames
-        if not self.animation_manager.load_plant_frames(self.assets_dir, self.state.plant_type):
+        if not self.animation_manager.load_plant_frames(self.assets_dir, self.state.plant_type, self.state.growth):
             raise FileNotFoundError(f"Plant frames not found for type: {self.state.plant_type}")
         
         # Load pet frames
@@ -101,8 +111,9 @@ class GrowPlotApp:
         # Register callbacks with event handler
         self.event_handler.register_callback('get_state', lambda: self.state)
         self.event_handler.register_callback('get_game_config', lambda: self.cfg)
-        self.event_handler.register_callback('save_state', lambda: save_state(self.state))
-        self.event_handler.register_callback('update_last_time', lambda: setattr(self.state, 'last_update_ts', now_ts()))
+        self.event_handler.register_callback('save_state', lambda: self.saver.save(self.state))
+        self.event_handler.register_callback('flush_state', self._flush_state)
+        self.event_handler.register_callback('update_last_time', self._stamp_last_update)
         self.event_handler.register_callback('get_settings_button', lambda: self.ui_manager.btn_settings)
         
         # Game action callbacks
@@ -158,27 +169,42 @@ class GrowPlotApp:
         # Initialize money display
         self.ui_manager.update_money_display(self.state.money)
     
+    def _start_session(self):
+        """Catch up on offline time and start journaling player input"""
+        self.session.ledger = Ledger(DEFAULT_LEDGER_DIR)
+        journal_is_new = not DEFAULT_JOURNAL_FILE.exists()
+        if not journal_is_new:
+            self.session.journal = InputJournal(DEFAULT_JOURNAL_FILE)
+        
+        self.session.apply_offline_progress()
+        self._initialize_shop_inventory()
+        self.session.check_daily_quest_reset()
+        
+        if journal_is_new:
+            # A new journal replays on top of the state as it is right now
+            save_state(self.state, DEFAULT_SNAPSHOT_FILE)
+            self.session.journal = InputJournal(DEFAULT_JOURNAL_FILE)
+    
     def _initialize_shop_inventory(self):
         """Initialize seed inventory and pet food for new games"""
-        from growpot.game_config import ShopConfig
-        shop_cfg = ShopConfig()
-        
-        # Only initialize if inventories are empty (new game)
-        if not self.state.seed_inventory and self.state.pet_food == 0:
-            self.state.seed_inventory = shop_cfg.initial_seed_stock.copy()
-            self.state.pet_food = shop_cfg.initial_pet_food
-            save_state(self.state)
+        if self.session.initialize_shop_inventory():
+            self.saver.save(self.state)
+    
+    def _flush_state(self):
+        """Write everything out before the app closes"""
+        self.saver.close(self.state)
+        self.session.ledger.close()
+        self.live_snapshot.close()
     
     def _tick(self):
         """Main game loop tick"""
-        # Calculate delta time
-        now = time.perf_counter()
-        dt = max(0.0, now - self._last_tick_perf)
-        self._last_tick_perf = now
+        self._tick_job = None
         
         # Update game simulation
-        self.game_engine.advance_simulation(self.state, dt)
-        self.game_engine.check_pet_auto_watering(self.state)
+        now = time.perf_counter()
+        dt, now_game = self._catch_up()
+        self.session.check_daily_quest_reset(now_game)
+        self.live_snapshot.publish(self.state, now_game)
         
         # Update harvest menu state if changed
         if self.game_engine.get_harvest_menu_state_changed(self.state):
@@ -186,7 +212,9 @@ class GrowPlotApp:
                 self.game_engine.get_current_harvest_menu_state(self.state) == "normal"
             )
         
-        # Update animations
+        # Update animations (a plant stage loaded in the background may change the canvas size)
+        if self.animation_manager.poll_stage_frames(self.state.growth):
+            self._update_canvas_size()
         plant_image = self.animation_manager.update_plant_animation(
             dt, self.state.growth, 
             self.ui_manager.max_canvas_width, 
@@ -219,90 +247,105 @@ class GrowPlotApp:
         else:
             self.ui_manager.hide_bug()
 
-        # Save state periodically
+        # Save state periodically (skipped unless something besides the simulation changed)
         if (now - self._last_save_perf) * 1000.0 >= self.cfg.save_every_ms:
             self._last_save_perf = now
-            self.state.last_update_ts = now_ts()
-            save_state(self.state)
+            self.state.last_update_ts = now_game
+            self.saver.save(self.state)
+            self.session.ledger.flush_in_background()
         
-        # Schedule next tick
-        self.root.after(self.cfg.tick_ms, self._tick)
+        # Schedule next tick for the next game event or animation frame, whichever comes first
+        next_event = min(
+            self.game_engine.seconds_until_next_event(self.state, now_game),
+            self.animation_manager.seconds_until_next_frame(self.state.growth),
+        )
+        delay_ms = min(max(next_event * 1000.0, self.cfg.tick_ms), self.cfg.max_idle_ms)
+        self._schedule_tick(int(delay_ms))
+    
+    def _schedule_tick(self, delay_ms: int):
+        """(Re)schedule the next tick, replacing any pending one"""
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+        self._tick_job = self.root.after(delay_ms, self._tick)
+    
+    def _catch_up(self) -> tuple[float, float]:
+        """Advance the simulation to now; returns (seconds advanced, game time).
+
+        The tick may sleep for up to max_idle_ms, so player actions call this first: they must act
+        on the current state, not on one that is about to be integrated over the whole sleep.
+        """
+        now = time.perf_counter()
+        dt = max(0.0, now - self._last_tick_perf)
+        self._last_tick_perf = now
+        now_game = self.session.clock.now()
+        self.session.tick(dt, now_game)
+        return dt, now_game
+    
+    def _stamp_last_update(self):
+        """Bring the simulation up to now and record that time as the last update"""
+        _, now_game = self._catch_up()
+        self.state.last_update_ts = now_game
+    
+    def _wake(self):
+        """Tick right away after the player changed something the schedule depends on"""
+        self._schedule_tick(0)
     
     # Event handlers
     def _handle_water(self):
         """Handle water action"""
-        self.game_engine.water_plant(self.state)
+        self._catch_up()
+        self.session.water()
+        self.saver.save(self.state, force=True)
+        self._wake()
     
     def _handle_harvest(self):
         """Handle harvest action"""
-        yield_amount, quality = self.game_engine.harvest_plant(self.state)
+        self._catch_up()
+        yield_amount, quality = self.session.harvest()
         if yield_amount > 0:
-            # Add to inventory
-            if self.state.plant_type not in self.state.inventory:
-                self.state.inventory[self.state.plant_type] = 0
-            self.state.inventory[self.state.plant_type] += yield_amount
-
-            # Update harvested_count for backward compatibility
-            self.state.harvested_count += yield_amount
-
-            # Award EXP for harvesting
-            plant_stats = self.cfg.PLANT_STATS[self.state.plant_type]
-            self.profile_manager.add_exp(self.state, plant_stats.harvest_exp_reward)
-
             # Reset animation
             self.animation_manager.reset_animation_index()
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
     
     def _handle_reset(self):
         """Handle reset action"""
-        self.game_engine.reset_plant(self.state)
+        self._catch_up()
+        self.session.reset()
         self.animation_manager.reset_animation_index()
-        save_state(self.state)
+        self.saver.save(self.state, force=True)
+        self._wake()
     
     def _handle_plant_seed(self, plant_type: str):
         """Handle seed planting"""
-        # Check if planting is allowed (pot must be empty)
-        if not self.game_engine.can_plant_seed(self.state):
-            return  # Cannot plant on occupied pot
-
-        # Check if player has seeds in inventory
-        current_stock = self.state.seed_inventory.get(plant_type, 0)
-        if current_stock <= 0:
-            return  # No seeds available, cannot plant
-
-        # Check if player level meets unlock requirement
-        plant_stats = self.cfg.PLANT_STATS[plant_type]
-        if self.state.level < plant_stats.unlock_level:
-            return  # Player level too low, cannot plant
-
-        # Use existing seeds (these get consumed)
-        self.state.seed_inventory[plant_type] -= 1
-        if self.state.seed_inventory[plant_type] == 0:
-            del self.state.seed_inventory[plant_type]
-
-        # Plant the seed
-        if self.game_engine.plant_seed(self.state, plant_type):
+        self._catch_up()
+        # Plant the seed (checks empty pot, seed stock and unlock level)
+        if self.session.plant_seed(plant_type):
             # Load new plant frames
-            self.animation_manager.load_plant_frames(self.assets_dir, plant_type)
+            self.animation_manager.load_plant_frames(self.assets_dir, plant_type, self.state.growth)
             self._update_canvas_size()
             self.animation_manager.reset_animation_index()
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
     
     def _handle_change_pot(self, pot_type: str):
         """Handle pot change"""
-        if self.game_engine.change_pot(self.state, pot_type):
+        self._catch_up()
+        if self.session.change_pot(pot_type):
             # Load new pot frames
             if self.animation_manager.load_pot_frames(self.assets_dir, pot_type):
                 self._update_canvas_size()
-                save_state(self.state)
+                self.saver.save(self.state, force=True)
+                self._wake()
     
     def _handle_unlock_pot(self, pot_type: str, cost: int):
         """Handle pot unlock"""
-        if self.game_engine.unlock_pot(self.state, pot_type, cost):
+        self._catch_up()
+        if self.session.unlock_pot(pot_type, cost):
             self.ui_manager.update_money_display(self.state.money)
             # Switch to the newly unlocked pot
             self._handle_change_pot(pot_type)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
             
             # Rebuild pot menu
             self._handle_show_settings_menu()  # Refresh settings menu
@@ -321,12 +364,11 @@ class GrowPlotApp:
     
     def _handle_warehouse_sell(self, plant_type: str, quantity: int, price_per_item: int):
         """Handle warehouse selling"""
-        success = self.warehouse_manager.sell_items_transaction(
-            self.state, plant_type, quantity, price_per_item
-        )
+        self._catch_up()
+        success = self.session.sell(plant_type, quantity, price_per_item)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
             # Refresh warehouse to show updated inventory
             self._handle_show_warehouse()
         return success
@@ -348,44 +390,51 @@ class GrowPlotApp:
     
     def _handle_pet_feed(self):
         """Handle pet feeding"""
-        success = self.pet_manager.feed_pet_transaction(self.state)
+        self._catch_up()
+        success = self.session.feed_pet()
         if success:
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
             # Refresh pet status
             self._handle_show_pet_status()
         return success
     
     def _handle_pet_activate(self, pet_type: str):
         """Handle pet activation"""
-        success = self.pet_manager.activate_pet_transaction(self.state, pet_type)
+        self._catch_up()
+        success = self.session.activate_pet(pet_type)
         if success:
             # Load pet frames
             self.animation_manager.load_pet_frames(self.assets_dir, pet_type)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
             # Refresh pet status
             self._handle_show_pet_status()
         return success
     
     def _handle_pet_deactivate(self):
         """Handle pet deactivation"""
-        success = self.pet_manager.deactivate_pet_transaction(self.state)
+        self._catch_up()
+        success = self.session.deactivate_pet()
         if success:
             # Clear pet frames
             if self.animation_manager.pet_img_item:
                 self.ui_manager.delete_pet_image(self.animation_manager.pet_img_item)
                 self.animation_manager.pet_img_item = None
             self.animation_manager.load_pet_frames(self.assets_dir, None)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
             # Refresh pet status
             self._handle_show_pet_status()
         return success
     
     def _handle_pet_unlock(self, pet_type: str, cost: int):
         """Handle pet unlocking"""
-        success = self.pet_manager.unlock_pet_transaction(self.state, pet_type, cost)
+        self._catch_up()
+        success = self.session.unlock_pet(pet_type, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
             # Refresh pet status
             self._handle_show_pet_status()
         return success
@@ -406,42 +455,47 @@ class GrowPlotApp:
     
     def _handle_shop_buy_pet_food(self, quantity: int, cost: int):
         """Handle pet food purchase from shop"""
-        success = self.shop_manager.buy_pet_food_transaction(self.state, quantity, cost)
+        self._catch_up()
+        success = self.session.buy_pet_food(quantity, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
         return success
 
     def _handle_shop_buy_net(self, quantity: int, cost: int):
         """Handle net purchase from shop"""
-        success = self.shop_manager.buy_net_transaction(self.state, quantity, cost)
+        self._catch_up()
+        success = self.session.buy_net(quantity, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
         return success
     
     def _handle_shop_buy_seeds(self, plant_type: str, quantity: int, cost: int):
         """Handle seeds purchase from shop"""
-        success = self.shop_manager.buy_seeds_transaction(self.state, plant_type, quantity, cost)
+        self._catch_up()
+        success = self.session.buy_seeds(plant_type, quantity, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
         return success
     
     def _handle_shop_buy_pot(self, pot_type: str, cost: int):
         """Handle pot purchase from shop"""
-        success = self.shop_manager.buy_pot_transaction(self.state, pot_type, cost)
+        self._catch_up()
+        success = self.session.buy_pot(pot_type, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
         return success
     
     def _handle_shop_buy_pet(self, pet_type: str, cost: int):
         """Handle pet purchase from shop"""
-        success = self.shop_manager.buy_pet_transaction(self.state, pet_type, cost)
+        self._catch_up()
+        success = self.session.buy_pet(pet_type, cost)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
         return success
     
     def _handle_shop_switch_pot(self, pot_type: str):
@@ -463,10 +517,11 @@ class GrowPlotApp:
 
     def _handle_claim_quest(self, quest_id: str):
         """Handle quest reward claiming"""
-        success = self.game_engine.complete_quest(self.state, quest_id)
+        self._catch_up()
+        success = self.session.claim_quest(quest_id)
         if success:
             self.ui_manager.update_money_display(self.state.money)
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
 
     def _handle_close_quests(self):
         """Handle quests window closing"""
@@ -476,7 +531,7 @@ class GrowPlotApp:
     def _handle_show_profile(self):
         """Handle profile display"""
         self.profile_manager.show_profile(
-            self.root, self.state, lambda: save_state(self.state)
+            self.root, self.state, lambda: self.saver.save(self.state)
         )
 
     def _handle_show_seed_menu(self):
@@ -487,9 +542,11 @@ class GrowPlotApp:
 
     def _handle_bug_click(self, event):
         """Handle bug click for catching"""
-        success = self.game_engine.catch_bug(self.state)
+        self._catch_up()
+        success = self.session.catch_bug()
         if success:
-            save_state(self.state)
+            self.saver.save(self.state, force=True)
+            self._wake()
     
     def _place_initial_position(self):
         """Place window at initial position"""
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from PIL import Image, ImageDraw
@@ -63,37 +66,109 @@ def _draw_plant(plant_type: str, stage: str, frame_index: int, size: int = 96) -
     return img
 
 
+GENERATOR_VERSION = 1  # Bump when the drawing code changes, so generated frames are redrawn
+MANIFEST_NAME = "generated.json"
+POT_TYPES = ["earth", "flame"]
+PLANT_TYPES = ["leaf", "water"]
+STAGES = ["seed", "sprout", "plant"]
+
+
+def _frame_signature(folder: Path) -> list[list]:
+    """[name, mtime_ns, size] of the frames in folder"""
+    signature = []
+    for path in sorted(folder.glob("frame_*.png")):
+        stat = path.stat()
+        signature.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _has_frames(folder: Path) -> bool:
+    """Whether folder exists and holds at least one frame_*.png (stops at the first one)"""
+    try:
+        with os.scandir(folder) as entries:
+            return any(entry.name.startswith("frame_") and entry.name.endswith(".png") for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def _render_folder(folder: Path, kind: str, asset_type: str, stage: str | None, size: int,
+                   frames_per_stage: int) -> None:
+    """Draw and save every frame of one folder (runs in a worker process)"""
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(1, frames_per_stage + 1):
+        if kind == "pot":
+            img = _draw_pot(asset_type, i, size=size)
+        else:
+            img = _draw_plant(asset_type, stage, i, size=size)
+        img.save(folder / f"frame_{i:03d}.png")
+
+
 def generate_assets(assets_dir: Path, size: int = 96, frames_per_stage: int = 12) -> None:
-    stages = ["seed", "sprout", "plant"]
-
-    # Generate pot assets
-    pot_types = ["earth", "flame"]
-    for pot_type in pot_types:
-        pot_dir = assets_dir / "pots" / pot_type
-        pot_dir.mkdir(parents=True, exist_ok=True)
-        existing_pot = list(pot_dir.glob("frame_*.png"))
-        if not existing_pot:
-            for i in range(1, frames_per_stage + 1):
-                img = _draw_pot(pot_type, i, size=size)
-                img.save(pot_dir / f"frame_{i:03d}.png")
-
-    # Generate plant assets for each type and stage
-    plant_types = ["leaf", "water"]
-    for plant_type in plant_types:
-        for stage in stages:
-            plant_stage_dir = assets_dir / "plants" / plant_type / stage
-            plant_stage_dir.mkdir(parents=True, exist_ok=True)
-
-            existing = list(plant_stage_dir.glob("frame_*.png"))
-            if existing:
-                # Don't overwrite user assets.
-                continue
-
-            for i in range(1, frames_per_stage + 1):
-                img = _draw_plant(plant_type, stage, i, size=size)
-                img.save(plant_stage_dir / f"frame_{i:03d}.png")
+    """Draw placeholder frames for every pot and plant stage that has none.
+
+    What was generated, and with which parameters, is recorded in assets_dir/generated.json: while
+    it matches and every target folder still has frames, launching only reads that file and opens
+    each folder once. Frames this function drew earlier are redrawn when the parameters or
+    GENERATOR_VERSION change, unless they were edited since; folders holding frames from anywhere
+    else are never touched.
+    """
+    params = {
+        "version": GENERATOR_VERSION,
+        "size": size,
+        "frames_per_stage": frames_per_stage,
+        "pots": POT_TYPES,
+        "plants": PLANT_TYPES,
+        "stages": STAGES,
+    }
+    manifest_path = assets_dir / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    generated: dict[str, list] = manifest.get("folders", {})
+
+    targets = [("pot", pot_type, None, Path("pots") / pot_type) for pot_type in POT_TYPES]
+    targets += [
+        ("plant", plant_type, stage, Path("plants") / plant_type / stage)
+        for plant_type in PLANT_TYPES
+        for stage in STAGES
+    ]
+    # A folder deleted (or emptied) since the manifest was written still needs drawing. Catching
+    # that costs one directory open per folder on top of the manifest read (no sorting or stat).
+    same_params = manifest.get("params") == params
+    if same_params and all(_has_frames(assets_dir / rel_folder) for *_, rel_folder in targets):
+        return
+
+    jobs = []
+    for kind, asset_type, stage, rel_folder in targets:
+        folder = assets_dir / rel_folder
+        signature = _frame_signature(folder) if folder.is_dir() else []
+        key = rel_folder.as_posix()
+        if signature and generated.get(key) != signature:
+            # Don't overwrite user assets.
+            generated.pop(key, None)
+            continue
+        if signature and same_params:
+            continue  # Drawn with these parameters already
+        # Empty, or still exactly the frames drawn last time
+        for name, _, _ in signature:
+            (folder / name).unlink()
+        jobs.append((key, (folder, kind, asset_type, stage, size, frames_per_stage)))
+
+    if len(jobs) > 1 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count())) as pool:
+            for future in [pool.submit(_render_folder, *job) for _, job in jobs]:
+                future.result()
+    else:
+        for _, job in jobs:
+            _render_folder(*job)
+    for key, (folder, *_) in jobs:
+        generated[key] = _frame_signature(folder)
 
     (assets_dir / "sounds").mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+    tmp_path.write_text(json.dumps({"params": params, "folders": generated}, indent=2), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from growpot.rgba_cache import shared_rgba_cache
+
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+ATLAS_VERSION = 1
+FRAME_PATTERN = "frame_*.png"
+
+
+def _sources(folder: Path) -> list[list]:
+    """[name, mtime_ns, size] of every frame file, in frame order (stat only, nothing is opened)"""
+    sources = []
+    for path in sorted(folder.glob(FRAME_PATTERN)):
+        stat = path.stat()
+        sources.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return sources
+
+
+def build_atlas(folder: Path) -> bool:
+    """Pack the frame_*.png files of folder into atlas.png + atlas.json; False if there are none"""
+    sources = _sources(folder)
+    if not sources:
+        return False
+
+    frames = [Image.open(folder / name).convert("RGBA") for name, _, _ in sources]
+    w, h = frames[0].size
+    for frame in frames:
+        if frame.size != (w, h):
+            raise ValueError(f"Frame sizes differ in {folder}. Keep all frames same size.")
+
+    # Near-square grid, row by row
+    columns = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    sheet = Image.new("RGBA", (columns * w, rows * h), (0, 0, 0, 0))
+    rects = []
+    for i, frame in enumerate(frames):
+        x, y = (i % columns) * w, (i // columns) * h
+        sheet.paste(frame, (x, y))
+        rects.append([x, y, w, h])
+
+    # The index goes last: it only ever describes a complete image
+    tmp_image = folder / (ATLAS_IMAGE + ".tmp")
+    sheet.save(tmp_image, format="PNG")
+    os.replace(tmp_image, folder / ATLAS_IMAGE)
+    index = {"version": ATLAS_VERSION, "frames": rects, "sources": sources}
+    tmp_index = folder / (ATLAS_INDEX + ".tmp")
+    tmp_index.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_index, folder / ATLAS_INDEX)
+    return True
+
+
+def _current_index(folder: Path) -> dict | None:
+    """The atlas index of folder, or None if there is no atlas or it is stale.
+
+    An atlas is stale once any frame_*.png was added, removed or modified after it was built; a
+    folder holding only the atlas (frames shipped packed) is always up to date.
+    """
+    try:
+        index = json.loads((folder / ATLAS_INDEX).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if index.get("version") != ATLAS_VERSION:
+        return None
+    sources = _sources(folder)
+    if sources and sources != index["sources"]:
+        return None
+    return index
+
+
+def has_current_atlas(folder: Path) -> bool:
+    return _current_index(folder) is not None
+
+
+def load_atlas(folder: Path) -> list[Image.Image] | None:
+    """Frames of folder cut from its atlas (one open, one decode), or None without an up-to-date atlas"""
+    index = _current_index(folder)
+    if index is None:
+        return None
+    sheet = shared_rgba_cache.decode(folder / ATLAS_IMAGE)
+    return [sheet.crop((x, y, x + w, y + h)) for x, y, w, h in index["frames"]]
+
+
+def asset_folders(assets_dir: Path) -> list[Path]:
+    """Every frame folder the game loads: pots, plant stages and pets"""
+    folders = [*assets_dir.glob("pots/*"), *assets_dir.glob("plants/*/*"), *assets_dir.glob("pets/*")]
+    return sorted(folder for folder in folders if folder.is_dir())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pack growpot frame folders into sprite atlases")
+    parser.add_argument("assets", type=Path, nargs="?", default=Path("assets"))
+    parser.add_argument("--force", action="store_true", help="rebuild atlases that are up to date")
+    args = parser.parse_args(argv)
+
+    built = skipped = 0
+    for folder in asset_folders(args.assets):
+        if not args.force and has_current_atlas(folder):
+            skipped += 1
+        elif build_atlas(folder):
+            built += 1
+    print(f"Built {built} atlases in {args.assets} ({skipped} already up to date)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import itertools
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig
+from growpot.headless import POLICIES, HeadlessRunner, Policy
+from growpot.session import GameSession
+
+
+# Fixed start time so every lifetime sees the same calendar (daily quest resets)
+LIFETIME_START_TS = 1_700_000_000.0
+
+
+@dataclass(frozen=True)
+class ConfigVariant:
+    name: str
+    config: GameConfig
+
+
+@dataclass(frozen=True)
+class LifetimeJob:
+    variant: str
+    config: GameConfig
+    policy: str
+    seed: int
+    hours: float
+    checkpoint_hours: float
+    tick_sec: float
+
+
+@dataclass
+class LifetimeResult:
+    variant: str
+    # One (money, total_exp, level) sample per checkpoint
+    checkpoints: list[tuple[int, int, int]]
+    # Simulated seconds until the player reached each plant's unlock_level (None if never)
+    unlock_times: dict[str, float | None]
+
+
+class _UnlockTracker(Policy):
+    """Wraps a policy and notes when the player first reaches each plant's unlock level"""
+
+    def __init__(self, inner: Policy, config: GameConfig):
+        self.inner = inner
+        self.unlock_levels = {plant_type: stats.unlock_level for plant_type, stats in config.PLANT_STATS.items()}
+        self.unlock_times: dict[str, float | None] = {plant_type: None for plant_type in self.unlock_levels}
+
+    def act(self, session: GameSession, sim_time: float) -> int:
+        taken = self.inner.act(session, sim_time)
+        for plant_type, level in self.unlock_levels.items():
+            if self.unlock_times[plant_type] is None and session.state.level >= level:
+                self.unlock_times[plant_type] = sim_time
+        return taken
+
+
+def _total_exp(session: GameSession) -> int:
+    """EXP earned over the whole lifetime, including what was spent on level ups"""
+    profile = session.profile_manager
+    state = session.state
+    return sum(profile.get_exp_needed_for_level(level) for level in range(1, state.level)) + state.exp
+
+
+def simulate_lifetime(job: LifetimeJob) -> LifetimeResult:
+    """Play one lifetime headless and sample it at every checkpoint (runs in a worker process)"""
+    state = GameState(last_update_ts=LIFETIME_START_TS)
+    tracker = _UnlockTracker(POLICIES[job.policy](), job.config)
+    runner = HeadlessRunner(job.config, state, tracker, tick_sec=job.tick_sec, seed=job.seed)
+
+    checkpoints = []
+    steps = max(1, round(job.hours / job.checkpoint_hours))
+    for _ in range(steps):
+        runner.run(job.checkpoint_hours * 3600.0)
+        checkpoints.append((state.money, _total_exp(runner.session), state.level))
+    return LifetimeResult(job.variant, checkpoints, tracker.unlock_times)
+
+
+@dataclass
+class _RunningStats:
+    """Streaming mean and standard deviation (Welford)"""
+    count: int = 0
+    mean: float = 0.0
+    _m2: float = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+@dataclass
+class VariantSummary:
+    """Aggregated curves for one config variant, updated one lifetime at a time"""
+    name: str
+    lifetimes: int = 0
+    money: list[_RunningStats] = field(default_factory=list)
+    exp: list[_RunningStats] = field(default_factory=list)
+    level: list[_RunningStats] = field(default_factory=list)
+    unlock_time: dict[str, _RunningStats] = field(default_factory=dict)
+
+    def add(self, result: LifetimeResult):
+        self.lifetimes += 1
+        for i, (money, exp, level) in enumerate(result.checkpoints):
+            if i == len(self.money):
+                self.money.append(_RunningStats())
+                self.exp.append(_RunningStats())
+                self.level.append(_RunningStats())
+            self.money[i].add(money)
+            self.exp[i].add(exp)
+            self.level[i].add(level)
+        for plant_type, seconds in result.unlock_times.items():
+            stats = self.unlock_time.setdefault(plant_type, _RunningStats())
+            if seconds is not None:
+                stats.add(seconds)
+
+    def format(self, checkpoint_hours: float) -> str:
+        lines = [f"== {self.name} ({self.lifetimes} lifetimes)"]
+        lines.append("   hour        money (std)          exp     level")
+        for i, (money, exp, level) in enumerate(zip(self.money, self.exp, self.level)):
+            hour = (i + 1) * checkpoint_hours
+            lines.append(
+                f"  {hour:5.1f}  {money.mean:11.0f} ({money.std:8.0f})  {exp.mean:10.0f}  {level.mean:8.2f}"
+            )
+        for plant_type, stats in self.unlock_time.items():
+            reached = stats.count / self.lifetimes if self.lifetimes else 0.0
+            when = f"{stats.mean / 3600.0:6.2f}h" if stats.count else "     -"
+            lines.append(f"  unlock {plant_type:<8} {when}  (reached in {reached:.0%})")
+        return "\n".join(lines)
+
+
+def run_sweep(variants: list[ConfigVariant], lifetimes: int, hours: float, policy: str = "greedy",
+              checkpoint_hours: float = 1.0, tick_sec: float = 0.1, workers: int | None = None,
+              seed: int = 0) -> Iterator[tuple[LifetimeResult, dict[str, VariantSummary]]]:
+    """Run every variant for `lifetimes` seeds across a process pool.
+
+    Yields each result together with the running summaries as soon as it arrives; only a bounded
+    window of jobs is in flight, so memory does not grow with the size of the sweep.
+    """
+    summaries = {variant.name: VariantSummary(variant.name) for variant in variants}
+    jobs: Iterable[LifetimeJob] = (
+        LifetimeJob(variant.name, variant.config, policy, seed + i, hours, checkpoint_hours, tick_sec)
+        for variant in variants
+        for i in range(lifetimes)
+    )
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(simulate_lifetime, job) for job in itertools.islice(jobs, workers * 4)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                summaries[result.variant].add(result)
+                yield result, summaries
+            pending |= {pool.submit(simulate_lifetime, job) for job in itertools.islice(jobs, len(done))}
+
+
+def scale_plant_prices(config: GameConfig, factor: float) -> GameConfig:
+    """Config with every harvest sell price scaled by factor"""
+    plant_stats = {
+        plant_type: dataclasses.replace(stats, harvest_price_per_item=max(1, round(stats.harvest_price_per_item * factor)))
+        for plant_type, stats in config.PLANT_STATS.items()
+    }
+    return dataclasses.replace(config, PLANT_STATS=plant_stats)
+
+
+def scale_quest_rewards(config: GameConfig, factor: float) -> GameConfig:
+    """Config with every quest reward scaled by factor"""
+    templates = {
+        quest_id: dataclasses.replace(template, reward_money=round(template.reward_money * factor))
+        for quest_id, template in config.QUEST_TEMPLATES.items()
+    }
+    return dataclasses.replace(config, QUEST_TEMPLATES=templates)
+
+
+def scale_pot_stats(config: GameConfig, bonus_factor: float, price_factor: float) -> GameConfig:
+    """Config with every pot's growth and water bonuses scaled by bonus_factor (capped below 100%)
+    and every pot price scaled by price_factor"""
+    pot_stats = {
+        pot_type: dataclasses.replace(
+            stats,
+            growth_time_reduction_percent=min(0.99, stats.growth_time_reduction_percent * bonus_factor),
+            water_decay_reduction_percent=min(0.99, stats.water_decay_reduction_percent * bonus_factor),
+            price=round(stats.price * price_factor),
+        )
+        for pot_type, stats in config.POT_STATS.items()
+    }
+    return dataclasses.replace(config, POT_STATS=pot_stats)
+
+
+def build_variants(bug_chances: list[float], price_scales: list[float], quest_reward_scales: list[float],
+                   pot_bonus_scales: list[float] = (1.0,), pot_price_scales: list[float] = (1.0,)) -> list[ConfigVariant]:
+    """Cartesian product of the given knobs on top of the default GameConfig"""
+    variants = []
+    for bug_chance, price_scale, reward_scale, pot_bonus_scale, pot_price_scale in itertools.product(
+            bug_chances, price_scales, quest_reward_scales, pot_bonus_scales, pot_price_scales):
+        config = dataclasses.replace(GameConfig(), bug_appearance_chance=bug_chance)
+        config = scale_plant_prices(config, price_scale)
+        config = scale_quest_rewards(config, reward_scale)
+        config = scale_pot_stats(config, pot_bonus_scale, pot_price_scale)
+        name = (f"bug={bug_chance:g} price=x{price_scale:g} quest=x{reward_scale:g}"
+                f" pot-bonus=x{pot_bonus_scale:g} pot-price=x{pot_price_scale:g}")
+        variants.append(ConfigVariant(name, config))
+    return variants
+
+
+def main(argv: list[str] | None = None) -> None:
+    default_cfg = GameConfig()
+    parser = argparse.ArgumentParser(description="Monte Carlo economy balancing over GameConfig variants")
+    parser.add_argument("--lifetimes", type=int, default=100, help="simulated players per variant")
+    parser.add_argument("--hours", type=float, default=8.0, help="simulated hours per lifetime")
+    parser.add_argument("--checkpoint", type=float, default=1.0, help="hours between curve samples")
+    parser.add_argument("--tick", type=float, default=0.1, help="simulated seconds per tick")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bug-chance", type=float, nargs="+", default=[default_cfg.bug_appearance_chance])
+    parser.add_argument("--price-scale", type=float, nargs="+", default=[1.0], help="harvest sell price factors")
+    parser.add_argument("--quest-reward-scale", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--pot-bonus-scale", type=float, nargs="+", default=[1.0],
+                        help="pot growth and water bonus factors")
+    parser.add_argument("--pot-price-scale", type=float, nargs="+", default=[1.0], help="pot price factors")
+    args = parser.parse_args(argv)
+
+    variants = build_variants(args.bug_chance, args.price_scale, args.quest_reward_scale,
+                              args.pot_bonus_scale, args.pot_price_scale)
+    total = len(variants) * args.lifetimes
+    summaries: dict[str, VariantSummary] = {}
+    for done, (_, summaries) in enumerate(
+        run_sweep(variants, args.lifetimes, args.hours, args.policy, args.checkpoint, args.tick,
+                  args.workers, args.seed),
+        start=1,
+    ):
+        print(f"\r{done}/{total} lifetimes", end="", flush=True)
+    print()
+
+    for summary in summaries.values():
+        print(summary.format(args.checkpoint))
+
+
+if __name__ == "__main__":
+    main()
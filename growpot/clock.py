@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """Source of unix epoch seconds for the game core"""
+
+    @abstractmethod
+    def now(self) -> float:
+        ...
+
+
+class SystemClock(Clock):
+    """Wall clock time"""
+
+    def now(self) -> float:
+        return time.time()
+
+
+class ManualClock(Clock):
+    """Clock that only moves when told to (headless runs, replays)"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = float(start)
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, dt: float):
+        """Move time forward by dt seconds"""
+        self._now += dt
+
+    def set(self, ts: float):
+        """Jump to an absolute timestamp"""
+        self._now = float(ts)
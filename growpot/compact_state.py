@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import tracemalloc
+from array import array
+from collections.abc import MutableMapping, MutableSet
+from typing import Iterator
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig
+
+
+class Catalog:
+    """Interns the item, pot and pet ids of a GameConfig into small integers"""
+
+    def __init__(self, items: list[str], pots: list[str], pets: list[str]):
+        self.items = tuple(items)
+        self.pots = tuple(pots)
+        self.pets = tuple(pets)
+        self.item_ids = {name: i for i, name in enumerate(self.items)}
+        self.pot_ids = {name: i for i, name in enumerate(self.pots)}
+        self.pet_ids = {name: i for i, name in enumerate(self.pets)}
+
+    @classmethod
+    def from_config(cls, config: GameConfig) -> Catalog:
+        # Inventories also hold caught bugs and "basic" plants migrated from old saves
+        items = [*config.PLANT_STATS, "bug", "basic"]
+        return cls(list(dict.fromkeys(items)), list(config.POT_STATS), list(config.PET_STATS))
+
+
+# Counter fields share one int64 array, one catalog-sized block each; set fields are bit masks
+_COUNTER_FIELDS = ("inventory", "seed_inventory")
+_FLAG_FIELDS = {"unlocked_pots": "pots", "unlocked_pets": "pets"}
+_FLOAT_FIELDS = tuple(field.name for field in dataclasses.fields(GameState) if field.type == "float")
+_INT_FIELDS = tuple(field.name for field in dataclasses.fields(GameState) if field.type == "int")
+_PLAIN_FIELDS = tuple(
+    field.name for field in dataclasses.fields(GameState)
+    if field.name not in _COUNTER_FIELDS and field.name not in _FLAG_FIELDS
+    and field.name not in _FLOAT_FIELDS and field.name not in _INT_FIELDS
+)
+
+
+class _CounterView(MutableMapping):
+    """dict[str, int] interface over one counter block of a CompactGameState"""
+    __slots__ = ("_state", "_field", "_offset")
+
+    def __init__(self, state: CompactGameState, field: str, offset: int):
+        self._state = state
+        self._field = field
+        self._offset = offset
+
+    def _slot(self, key) -> int | None:
+        item_id = self._state._catalog.item_ids.get(key)
+        return None if item_id is None else self._offset + item_id
+
+    def _extra(self, create: bool = False) -> dict | None:
+        return self._state._extra_for(self._field, dict, create)
+
+    def __getitem__(self, key) -> int:
+        slot = self._slot(key)
+        if slot is None:
+            extra = self._extra()
+            if extra is None:
+                raise KeyError(key)
+            return extra[key]
+        if not (self._state._present >> slot) & 1:
+            raise KeyError(key)
+        return self._state._counts[slot]
+
+    def __setitem__(self, key, value: int):
+        slot = self._slot(key)
+        if slot is None:
+            self._extra(create=True)[key] = value
+            return
+        self._state._counts[slot] = value
+        self._state._present |= 1 << slot
+
+    def __delitem__(self, key):
+        slot = self._slot(key)
+        if slot is None:
+            extra = self._extra()
+            if extra is None:
+                raise KeyError(key)
+            del extra[key]
+            return
+        if not (self._state._present >> slot) & 1:
+            raise KeyError(key)
+        self._state._counts[slot] = 0
+        self._state._present &= ~(1 << slot)
+
+    def __iter__(self) -> Iterator[str]:
+        present = self._state._present >> self._offset
+        for item_id, name in enumerate(self._state._catalog.items):
+            if (present >> item_id) & 1:
+                yield name
+        extra = self._extra()
+        if extra:
+            yield from list(extra)
+
+    def __len__(self) -> int:
+        mask = (1 << len(self._state._catalog.items)) - 1
+        extra = self._extra()
+        return ((self._state._present >> self._offset) & mask).bit_count() + (len(extra) if extra else 0)
+
+    # The dict union operators, so `state.inventory |= {...}` works as it does on GameState
+    def __or__(self, other) -> dict:
+        return {**self, **other}
+
+    def __ror__(self, other) -> dict:
+        return {**other, **self}
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _FlagView(MutableSet):
+    """set[str] interface over a bit mask of catalog ids"""
+    __slots__ = ("_state", "_field", "_names", "_ids")
+
+    def __init__(self, state: CompactGameState, field: str):
+        catalog = state._catalog
+        self._state = state
+        self._field = field
+        self._names = getattr(catalog, _FLAG_FIELDS[field])
+        self._ids = getattr(catalog, _FLAG_FIELDS[field][:-1] + "_ids")
+
+    @property
+    def _mask(self) -> int:
+        return getattr(self._state, "_" + self._field)
+
+    def __contains__(self, name) -> bool:
+        bit = self._ids.get(name)
+        if bit is None:
+            extra = self._state._extra_for(self._field, set)
+            return extra is not None and name in extra
+        return bool((self._mask >> bit) & 1)
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> set:
+        # Results of |, & and - are plain sets, as on GameState
+        return set(iterable)
+
+    def __iter__(self) -> Iterator[str]:
+        mask = self._mask
+        for bit, name in enumerate(self._names):
+            if (mask >> bit) & 1:
+                yield name
+        extra = self._state._extra_for(self._field, set)
+        if extra:
+            yield from list(extra)
+
+    def __len__(self) -> int:
+        extra = self._state._extra_for(self._field, set)
+        return self._mask.bit_count() + (len(extra) if extra else 0)
+
+    def add(self, name):
+        bit = self._ids.get(name)
+        if bit is None:
+            self._state._extra_for(self._field, set, create=True).add(name)
+        else:
+            setattr(self._state, "_" + self._field, self._mask | (1 << bit))
+
+    def discard(self, name):
+        bit = self._ids.get(name)
+        if bit is None:
+            extra = self._state._extra_for(self._field, set)
+            if extra is not None:
+                extra.discard(name)
+        else:
+            setattr(self._state, "_" + self._field, self._mask & ~(1 << bit))
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+
+class CompactGameState:
+    """Memory-lean stand-in for GameState, with the same attributes.
+
+    Floats and ints are packed into two typed arrays, inventories are int64 counters indexed by the
+    catalog's interned item ids (plus a presence mask), and unlocked pots/pets are bit masks. Ids the
+    catalog does not know spill into a small per-instance dict, created only when needed.
+    """
+
+    __slots__ = (
+        "_catalog", "_floats", "_ints", "_counts", "_present", "_extra",
+        *("_" + name for name in _FLAG_FIELDS),
+        *_PLAIN_FIELDS,
+    )
+
+    def __init__(self, catalog: Catalog, **fields):
+        self._catalog = catalog
+        self._floats = array("d", bytes(8 * len(_FLOAT_FIELDS)))
+        self._ints = array("q", bytes(8 * len(_INT_FIELDS)))
+        self._counts = array("q", bytes(8 * len(_COUNTER_FIELDS) * len(catalog.items)))
+        self._present = 0
+        self._extra = None
+        for name in _FLAG_FIELDS:
+            setattr(self, "_" + name, 0)
+
+        defaults = GameState()
+        for field in dataclasses.fields(GameState):
+            setattr(self, field.name, fields.get(field.name, getattr(defaults, field.name)))
+
+    @classmethod
+    def from_state(cls, state: GameState, catalog: Catalog) -> CompactGameState:
+        return cls(catalog, **{field.name: getattr(state, field.name) for field in dataclasses.fields(GameState)})
+
+    def to_state(self) -> GameState:
+        """Plain GameState copy (for saving, deepcopy, asdict)"""
+        values = {}
+        for field in dataclasses.fields(GameState):
+            value = getattr(self, field.name)
+            if field.name in _FLAG_FIELDS:
+                value = set(value)
+            elif field.name in _COUNTER_FIELDS:
+                value = dict(value)
+            values[field.name] = value
+        return GameState(**values)
+
+    def _extra_for(self, field: str, kind: type, create: bool = False):
+        """Overflow container for ids the catalog does not know"""
+        if self._extra is None:
+            if not create:
+                return None
+            self._extra = {}
+        if create:
+            return self._extra.setdefault(field, kind())
+        return self._extra.get(field)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CompactGameState, GameState)):
+            return all(getattr(self, field.name) == getattr(other, field.name) for field in dataclasses.fields(GameState))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompactGameState({self.to_state()!r})"
+
+
+def _array_property(array_name: str, index: int) -> property:
+    def getter(self):
+        return getattr(self, array_name)[index]
+
+    def setter(self, value):
+        getattr(self, array_name)[index] = value
+
+    return property(getter, setter)
+
+
+def _counter_property(field: str, block: int) -> property:
+    def getter(self):
+        return _CounterView(self, field, block * len(self._catalog.items))
+
+    def setter(self, value):
+        # Copied first: value may be this very view (`state.inventory |= ...` assigns it back)
+        value = dict(value or {})
+        view = _CounterView(self, field, block * len(self._catalog.items))
+        view.clear()
+        view.update(value)
+
+    return property(getter, setter)
+
+
+def _flag_property(field: str) -> property:
+    def getter(self):
+        return _FlagView(self, field)
+
+    def setter(self, value):
+        # Copied first: value may be this very view (`state.unlocked_pots |= ...` assigns it back)
+        value = set(value or ())
+        view = _FlagView(self, field)
+        view.clear()
+        view |= value
+
+    return property(getter, setter)
+
+
+for _index, _name in enumerate(_FLOAT_FIELDS):
+    setattr(CompactGameState, _name, _array_property("_floats", _index))
+for _index, _name in enumerate(_INT_FIELDS):
+    setattr(CompactGameState, _name, _array_property("_ints", _index))
+for _block, _name in enumerate(_COUNTER_FIELDS):
+    setattr(CompactGameState, _name, _counter_property(_name, _block))
+for _name in _FLAG_FIELDS:
+    setattr(CompactGameState, _name, _flag_property(_name))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare memory per profile of GameState and CompactGameState")
+    parser.add_argument("--profiles", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    config = GameConfig()
+    catalog = Catalog.from_config(config)
+
+    def make_state(i: int) -> GameState:
+        # Values computed per profile, as they would be after loading a save
+        state = GameState(
+            growth=i * 0.37, water=i * 0.11, last_update_ts=1.7e9 + i, money=1000 + i, level=1 + i % 20,
+            exp=i % 500, pet_food=i % 7, net_quantity=i % 3, harvested_count=i,
+            last_harvest_ts=1.7e9 + i / 2, pet_last_fed_ts=1.7e9 + i / 3, pet_last_worked_ts=1.7e9 + i / 4,
+        )
+        state.inventory = {plant_type: 1000 + i + n for n, plant_type in enumerate(config.PLANT_STATS)}
+        state.inventory["bug"] = 300 + i
+        state.seed_inventory = {plant_type: 500 + i + n for n, plant_type in enumerate(config.PLANT_STATS)}
+        state.unlocked_pots = set(config.POT_STATS)
+        state.unlocked_pets = set(config.PET_STATS)
+        return state
+
+    for label, build in (
+        ("GameState", make_state),
+        ("CompactGameState", lambda i: CompactGameState.from_state(make_state(i), catalog)),
+    ):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        profiles = [build(i) for i in range(args.profiles)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        print(f"{label:<17} {allocated / args.profiles:8.0f} bytes/profile (tracemalloc)")
+        del profiles
+
+
+if __name__ == "__main__":
+    main()
@@ -60,8 +60,8 @@ class EventHandler:
         self._store_window_pos()
         if 'update_last_time' in self._callbacks:
             self._callbacks['update_last_time']()
-        if 'save_state' in self._callbacks:
-            self._callbacks['save_state']()
+        if 'flush_state' in self._callbacks:
+            self._callbacks['flush_state']()
         self.root.destroy()
     
     def on_settings_click(self):
@@ -40,8 +40,8 @@ class QuestTemplate:
     id: str  # Unique identifier
     name: str  # Display name
     description: str  # Quest description
-    requirement_type: str  # Type of requirement (e.g., "harvest")
-    plant_type: str  # Specific plant type required (for harvest quests)
+    requirement_type: str  # Type of requirement: "harvest", "sell", "water", "catch_bug" or "earn_money"
+    plant_type: str  # Specific plant type required (harvest and sell quests), "" for any
     requirement_count: int  # How many to complete
     reward_money: int  # Money reward
 
@@ -100,7 +100,13 @@ class ShopConfig:
 class GameConfig:
     tick_ms: int = 100
     anim_fps: int = 10
-    save_every_ms: int = 1500
+    composite_cache_bytes: int = 8 * 1024 * 1024  # Finished pot+plant frames kept for reuse
+    frame_cache_bytes: int = 32 * 1024 * 1024  # Decoded pot, plant and pet frames kept across switches
+    save_every_ms: int = 1500  # How often the tick checks for unsaved changes
+    save_coalesce_ms: int = 500  # Saves requested within this window are written once
+    save_fsync: str = "interval"  # When the state log is fsynced: "always", "interval" or "never"
+    save_compact_bytes: int = 64 * 1024  # Fold the state log into a new snapshot past this size
+    max_idle_ms: int = 60000  # Longest sleep between ticks when nothing is scheduled
 
     # growth values
     base_growth_per_sec: float = 0.3  # Adjusted for 10s growth time
@@ -110,6 +116,7 @@ class GameConfig:
     # Growth thresholds for stage changes
     sprout_at: float = 1.0
     plant_at: float = 3.0
+    stage_prefetch_ahead: float = 0.5  # Growth before a stage change at which its frames start loading
 
     # Watering
     water_per_click: float = 5.0  # Fill to 100% per click
@@ -253,6 +260,42 @@ class GameConfig:
             requirement_count=3,
             reward_money=120
         ),
+        "water_bronze": QuestTemplate(
+            id="water_bronze",
+            name="Chăm sóc cây",
+            description="Tưới cây 10 lần",
+            requirement_type="water",
+            plant_type="",
+            requirement_count=10,
+            reward_money=40
+        ),
+        "catch_bug_bronze": QuestTemplate(
+            id="catch_bug_bronze",
+            name="Diệt sâu bọ",
+            description="Bắt 1 con bọ",
+            requirement_type="catch_bug",
+            plant_type="",
+            requirement_count=1,
+            reward_money=60
+        ),
+        "sell_bronze": QuestTemplate(
+            id="sell_bronze",
+            name="Buôn bán",
+            description="Bán 5 vật phẩm bất kỳ",
+            requirement_type="sell",
+            plant_type="",
+            requirement_count=5,
+            reward_money=50
+        ),
+        "earn_money_silver": QuestTemplate(
+            id="earn_money_silver",
+            name="Làm giàu",
+            description="Kiếm 300 tiền từ bán hàng",
+            requirement_type="earn_money",
+            plant_type="",
+            requirement_count=300,
+            reward_money=80
+        ),
     })
 
     # Daily quest settings
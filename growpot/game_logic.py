@@ -1,28 +1,35 @@
 from __future__ import annotations
 
+import argparse
 import math
 import random
 import time
-from growpot.state import GameState, now_ts
+from growpot.state import GameState
 from growpot.game_config import GameConfig
+from growpot.clock import Clock, SystemClock
+from growpot.quest_system import GameEvents, QuestEngine
 
 
 class GameEngine:
     """Handles core game simulation and logic"""
     
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: GameConfig, clock: Clock | None = None, rng: random.Random | None = None):
         self.cfg = config
+        # Time and randomness are injected so headless runs and replays are fast and reproducible
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
+        self.events = GameEvents()
+        self.quests = QuestEngine(config, self.events)
         self._last_harvest_state = "disabled"
     
-    def advance_simulation(self, state: GameState, dt: float):
-        """Advance game simulation by dt seconds"""
+    def advance_simulation(self, state: GameState, dt: float, now: float | None = None):
+        """Advance game simulation by dt seconds (now is only read if a bug appears)"""
         # Don't simulate if pot is empty
         if state.growth < 0:
             return
         
         # Get pot stats for water decay reduction
-        pot_stats = self.cfg.POT_STATS[state.pot_type]
-        effective_water_decay = self.cfg.water_decay_per_sec * (1.0 - pot_stats.water_decay_reduction_percent)
+        effective_water_decay = self._effective_water_decay(state)
         
         # Water decays
         if state.water > 0:
@@ -33,11 +40,7 @@ class GameEngine:
             state.water_ever_depleted = True
         
         # Calculate effective growth rate based on plant and pot
-        plant_stats = self.cfg.PLANT_STATS[state.plant_type]
-        
-        base_growth_rate = self.cfg.plant_at / plant_stats.growth_time_sec  # e.g., 3.0 / 10.0 = 0.3
-        pot_multiplier = 1 + pot_stats.growth_time_reduction_percent  # e.g., 1.1 for 10% reduction
-        effective_growth_rate = base_growth_rate * pot_multiplier
+        effective_growth_rate = self._effective_growth_rate(state)
         
         water_factor = 1.0 - math.exp(-state.water)
         growth_rate = effective_growth_rate + water_factor * self.cfg.water_boost_growth_per_sec
@@ -51,25 +54,238 @@ class GameEngine:
             if growth_in_range > 0:
                 # Calculate spawn probability based on growth traversed in spawn range
                 spawn_chance = self.cfg.bug_appearance_chance * (growth_in_range / (self.cfg.bug_growth_end - self.cfg.bug_growth_start))
-                if random.random() < spawn_chance:
+                if self.rng.random() < spawn_chance:
                     state.bug_active = True
-                    state.bug_appearance_time = now_ts()
+                    state.bug_appearance_time = self.clock.now() if now is None else now
     
+    def _effective_water_decay(self, state: GameState) -> float:
+        """Water lost per second for the current pot"""
+        pot_stats = self.cfg.POT_STATS[state.pot_type]
+        return self.cfg.water_decay_per_sec * (1.0 - pot_stats.water_decay_reduction_percent)
+
+    def _effective_growth_rate(self, state: GameState) -> float:
+        """Growth per second without any water boost for the current plant and pot"""
+        plant_stats = self.cfg.PLANT_STATS[state.plant_type]
+        pot_stats = self.cfg.POT_STATS[state.pot_type]
+
+        base_growth_rate = self.cfg.plant_at / plant_stats.growth_time_sec  # e.g., 3.0 / 10.0 = 0.3
+        pot_multiplier = 1 + pot_stats.growth_time_reduction_percent  # e.g., 1.1 for 10% reduction
+        return base_growth_rate * pot_multiplier
+
+    def _water_segments(self, state: GameState, dt: float,
+                        start_ts: float | None = None) -> tuple[list[tuple[float, float, int]], float | None]:
+        """Split dt into (duration, start_water, repeats) pieces with linear water decay in each piece.
+
+        When start_ts is given, an active pet refills the pot every time water falls to its threshold
+        until it gets hungry. That sawtooth is one piece repeated, so the cost does not depend on the
+        number of refills. Also returns the offset of the last refill (None if the pet never watered).
+        """
+        decay = self._effective_water_decay(state)
+        water = max(0.0, state.water)
+        segments: list[tuple[float, float, int]] = []
+        elapsed = 0.0
+        last_refill = None
+
+        pet_stats = self.cfg.PET_STATS[state.active_pet] if state.active_pet and start_ts is not None else None
+        if pet_stats and pet_stats.auto_water_amount > 0:
+            works_for = state.pet_last_fed_ts + pet_stats.work_duration_sec - start_ts
+            threshold = pet_stats.auto_water_threshold * 5.0  # Same max water as in check_pet_auto_watering
+            amount = pet_stats.auto_water_amount
+
+            if works_for > 0:
+                # Already at or below the threshold: the pet tops up right away
+                if water <= threshold:
+                    water += (math.floor((threshold - water) / amount) + 1) * amount
+                    last_refill = 0.0
+
+                # Later refills happen at first_refill + j * period while the pet works
+                first_refill = (water - threshold) / decay if decay > 0 else math.inf
+                if first_refill <= dt and first_refill < works_for:
+                    period = amount / decay
+                    refills = 1 + min(
+                        math.floor((dt - first_refill) / period),
+                        math.ceil((works_for - first_refill) / period) - 1,
+                    )
+                    segments.append((first_refill, water, 1))
+                    if refills > 1:
+                        segments.append((period, threshold + amount, refills - 1))
+                    elapsed = first_refill + (refills - 1) * period
+                    water = threshold + amount
+                    last_refill = elapsed
+
+        # Without (further) refills water decays linearly until it runs dry
+        remaining = dt - elapsed
+        if water <= 0 or decay <= 0:
+            segments.append((remaining, water, 1))
+        else:
+            time_to_dry = water / decay
+            if remaining <= time_to_dry:
+                segments.append((remaining, water, 1))
+            else:
+                segments += [(time_to_dry, water, 1), (remaining - time_to_dry, 0.0, 1)]
+        return segments, last_refill
+
+    def _growth_to_time(self, segments: list[tuple[float, float, int]], rate: float, decay: float,
+                        target: float) -> float:
+        """Time at which `target` growth has been added along the given pieces (inf if never)"""
+        remaining = target
+        elapsed = 0.0
+        for duration, water, repeats in segments:
+            gained = self._segment_growth(rate, decay, water, duration)
+            if remaining <= gained * repeats:
+                # Skip whole repeats, then solve inside the piece that contains the target
+                skipped = min(repeats - 1, math.floor(remaining / gained)) if gained > 0 else 0
+                remaining -= skipped * gained
+                elapsed += skipped * duration
+                return elapsed + self._segment_time_to_growth(rate, decay, water, duration, remaining)
+            remaining -= gained * repeats
+            elapsed += duration * repeats
+        return math.inf
+
+    def _segment_growth(self, rate: float, decay: float, water: float, duration: float) -> float:
+        """Exact growth over a piece where water decays linearly from `water` and never goes below zero"""
+        boost = self.cfg.water_boost_growth_per_sec
+        if water <= 0 or duration <= 0:
+            return rate * duration
+        if decay <= 0:
+            return (rate + boost * (1.0 - math.exp(-water))) * duration
+
+        # integral of 1 - exp(-(water - decay * t)) dt over [0, duration]
+        end_water = max(0.0, water - decay * duration)
+        boost_time = duration - (math.exp(-end_water) - math.exp(-water)) / decay
+        return rate * duration + boost * boost_time
+
+    def _segment_time_to_growth(self, rate: float, decay: float, water: float, duration: float,
+                                target: float) -> float:
+        """Time inside a piece at which `target` growth has been added (Newton, converges from below)"""
+        if water <= 0 or decay <= 0:
+            speed = rate + self.cfg.water_boost_growth_per_sec * (1.0 - math.exp(-max(0.0, water)))
+            return min(duration, target / speed)
+
+        # Growth is concave in time here, so Newton started at 0 never overshoots the root
+        t = 0.0
+        for _ in range(50):
+            error = self._segment_growth(rate, decay, water, t) - target
+            speed = rate + self.cfg.water_boost_growth_per_sec * (1.0 - math.exp(-(water - decay * t)))
+            step = error / speed
+            t = min(duration, t - step)
+            if abs(step) < 1e-9:
+                break
+        return t
+
+    def _sample_bug_growth(self, state: GameState, final_growth: float) -> float | None:
+        """Growth value at which a bug appears between current and final growth, if any.
+
+        Ticking spawns with probability chance * dg / window per step, so in the limit of small steps
+        the spawn point is exponentially distributed over the growth traversed inside the bug window.
+        """
+        if state.bug_active or self.cfg.bug_appearance_chance <= 0:
+            return None
+        window_start = max(state.growth, self.cfg.bug_growth_start)
+        window_end = min(final_growth, self.cfg.bug_growth_end)
+        if window_end <= window_start:
+            return None
+
+        hazard = self.cfg.bug_appearance_chance / (self.cfg.bug_growth_end - self.cfg.bug_growth_start)
+        spawn_at = window_start - math.log(1.0 - self.rng.random()) / hazard
+        return spawn_at if spawn_at <= window_end else None
+
+    def advance_offline(self, state: GameState, dt: float, start_ts: float):
+        """Advance simulation by a long gap in closed form, as if ticking continuously from start_ts"""
+        if state.growth < 0 or dt <= 0:
+            return
+
+        decay = self._effective_water_decay(state)
+        rate = self._effective_growth_rate(state)
+        segments, last_refill = self._water_segments(state, dt, start_ts)
+
+        # Grow through every piece exactly
+        final_growth = state.growth
+        for duration, water, repeats in segments:
+            final_growth += self._segment_growth(rate, decay, water, duration) * repeats
+
+        # Place the bug (if one appears) at the moment growth passed its spawn point
+        bug_growth = self._sample_bug_growth(state, final_growth)
+        if bug_growth is not None:
+            state.bug_active = True
+            state.bug_appearance_time = start_ts + self._growth_to_time(segments, rate, decay, bug_growth - state.growth)
+
+        # The quality flag trips if water ever ran (almost) dry, which can only happen at the end of a piece
+        lowest_water = min([state.water] + [max(0.0, water - decay * duration) for duration, water, _ in segments])
+        if lowest_water <= 0.01:
+            state.water_ever_depleted = True
+
+        duration, water, _ = segments[-1]
+        state.water = max(0.0, water - decay * duration)
+        state.growth = final_growth
+        if last_refill is not None:
+            state.pet_last_worked_ts = start_ts + last_refill
+
+    def _time_until_growth(self, state: GameState, target: float) -> float:
+        """Seconds until growth reaches target if nothing else changes"""
+        remaining = target - state.growth
+        if remaining <= 0:
+            return 0.0
+
+        decay = self._effective_water_decay(state)
+        rate = self._effective_growth_rate(state)
+        segments, _ = self._water_segments(state, math.inf)
+        return self._growth_to_time(segments, rate, decay, remaining)
+
+    def seconds_until_next_event(self, state: GameState, now: float) -> float:
+        """Seconds until something observable happens without player input (inf if nothing will)"""
+        events = [self._seconds_until_daily_reset(now)]
+
+        if state.growth >= 0:
+            decay = self._effective_water_decay(state)
+
+            # Stage changes and the start of the bug window
+            for threshold in (self.cfg.sprout_at, self.cfg.bug_growth_start, self.cfg.plant_at):
+                if state.growth < threshold:
+                    events.append(self._time_until_growth(state, threshold))
+
+            # A bug may appear at any moment inside the window, so keep ticking there
+            if not state.bug_active and self.cfg.bug_growth_start <= state.growth < self.cfg.bug_growth_end:
+                events.append(self.cfg.tick_ms / 1000.0)
+
+            # Water running dry flips the quality flag
+            if not state.water_ever_depleted and decay > 0:
+                events.append(max(0.0, state.water - 0.01) / decay)
+
+            # Pet auto-watering and pet hunger
+            if state.active_pet:
+                pet_stats = self.cfg.PET_STATS[state.active_pet]
+                hungry_in = state.pet_last_fed_ts + pet_stats.work_duration_sec - now
+                if hungry_in > 0:
+                    events.append(hungry_in)
+                    water_threshold = pet_stats.auto_water_threshold * 5.0
+                    if decay > 0:
+                        events.append(max(0.0, state.water - water_threshold) / decay)
+
+        return max(0.0, min(events))
+
+    def _seconds_until_daily_reset(self, now: float) -> float:
+        """Seconds until the next local midnight"""
+        today = time.localtime(now)
+        midnight = time.mktime((today.tm_year, today.tm_mon, today.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        return max(0.0, midnight - now)
+
     def can_harvest(self, state: GameState) -> bool:
         """Check if plant is ready for harvest"""
         return state.growth >= self.cfg.plant_at
     
-    def harvest_plant(self, state: GameState) -> tuple[int, str]:
+    def harvest_plant(self, state: GameState, now: float | None = None) -> tuple[int, str]:
         """Harvest the plant and return the yield amount and quality"""
         if state.growth < self.cfg.plant_at:
             return 0, "normal"  # Not ready to harvest
+        now = self.clock.now() if now is None else now
 
         # Calculate base yield
         plant_stats = self.cfg.PLANT_STATS[state.plant_type]
         base_yield = plant_stats.yield_amount
 
         # Determine quality based on water and harvest timing
-        quality = self._calculate_harvest_quality(state, plant_stats)
+        quality = self._calculate_harvest_quality(state, plant_stats, now)
 
         # Apply quality modifiers (simple system)
         if quality == "poor":
@@ -92,7 +308,7 @@ class GameEngine:
         state.growth = -1.0  # Empty pot
         state.growth_water_deficit = 0.0  # Reset deficit
         state.water_ever_depleted = False  # Reset depletion flag
-        state.last_harvest_ts = now_ts()
+        state.last_harvest_ts = now
 
         # Update quest progress for harvesting specific plant type
         self.update_quest_progress(state, "harvest", 1, state.plant_type)
@@ -102,6 +318,7 @@ class GameEngine:
     def water_plant(self, state: GameState):
         """Add water to the plant"""
         state.water += self.cfg.water_per_click
+        self.events.publish(state, "water")
     
     def reset_plant(self, state: GameState):
         """Reset the plant to initial state"""
@@ -129,16 +346,17 @@ class GameEngine:
         state.water_ever_depleted = False  # Reset depletion flag
         return True
     
-    def check_pet_auto_watering(self, state: GameState):
+    def check_pet_auto_watering(self, state: GameState, now: float | None = None):
         """Check and perform pet auto-watering if needed"""
         # Don't auto-water if no active pet or pot is empty
         if not state.active_pet or state.growth < 0:
             return
         
         pet_stats = self.cfg.PET_STATS[state.active_pet]
+        now = self.clock.now() if now is None else now
         
         # Check if pet is still working (not hungry)
-        time_since_fed = now_ts() - state.pet_last_fed_ts
+        time_since_fed = now - state.pet_last_fed_ts
         if time_since_fed >= pet_stats.work_duration_sec:
             return  # Pet is hungry, won't work
         
@@ -149,7 +367,7 @@ class GameEngine:
         if state.water <= water_threshold:
             # Auto-water the plant
             state.water += pet_stats.auto_water_amount
-            state.pet_last_worked_ts = now_ts()
+            state.pet_last_worked_ts = now
     
     def get_harvest_menu_state_changed(self, state: GameState) -> bool:
         """Check if harvest menu state needs to be updated"""
@@ -163,11 +381,12 @@ class GameEngine:
         """Get current harvest menu state ('normal' or 'disabled')"""
         return "normal" if self.can_harvest(state) else "disabled"
     
-    def apply_offline_progress(self, state: GameState):
+    def apply_offline_progress(self, state: GameState, now: float | None = None):
         """Apply offline progress when app starts"""
-        now = now_ts()
-        dt = max(0.0, now - float(state.last_update_ts or now))
-        self.advance_simulation(state, dt)
+        now = self.clock.now() if now is None else now
+        start = float(state.last_update_ts or now)
+        dt = max(0.0, now - start)
+        self.advance_offline(state, dt, start)
         state.last_update_ts = now
     
     def change_pot(self, state: GameState, pot_type: str) -> bool:
@@ -197,14 +416,14 @@ class GameEngine:
         state.unlocked_pots.add(pot_type)
         return True
 
-    def _calculate_harvest_quality(self, state: GameState, plant_stats) -> str:
+    def _calculate_harvest_quality(self, state: GameState, plant_stats, now: float) -> str:
         """Calculate harvest quality based on water and timing"""
         # Check if water ever depleted (simple system: never ran out of water)
         water_sufficient = not state.water_ever_depleted
 
         # Check harvest timing for excellent quality
         # Excellent: harvest within 20% growth time after ripening
-        time_since_ripening = now_ts() - state.last_harvest_ts if state.last_harvest_ts > 0 else 0
+        time_since_ripening = now - state.last_harvest_ts if state.last_harvest_ts > 0 else 0
         max_bonus_time = plant_stats.growth_time_sec * self.cfg.bug_harvest_bonus_time_percent
         timely_harvest = time_since_ripening <= max_bonus_time
 
@@ -241,15 +460,16 @@ class GameEngine:
         state.bug_active = False
         state.bug_appearance_time = 0.0
 
+        self.events.publish(state, "catch_bug")
         return True
 
     def can_catch_bug(self, state: GameState) -> bool:
         """Check if bug can be caught"""
         return state.bug_active and state.net_quantity > 0
 
-    def check_daily_quest_reset(self, state: GameState):
-        """Check if daily quests need to be reset (midnight)"""
-        now = now_ts()
+    def check_daily_quest_reset(self, state: GameState, now: float | None = None) -> bool:
+        """Check if daily quests need to be reset (midnight). Returns True if they were reset."""
+        now = self.clock.now() if now is None else now
         last_reset = state.quest_last_reset_ts
 
         # Check if it's a new day (past midnight)
@@ -267,68 +487,77 @@ class GameEngine:
             self.generate_daily_quests(state)
             state.quest_last_reset_ts = now
             state.completed_quests_today = 0
+        return needs_reset
 
     def generate_daily_quests(self, state: GameState):
         """Generate new daily quests for the player"""
-        # Clear existing quests
-        state.daily_quests = []
-
         # Determine how many quests to generate
-        quest_count = random.randint(self.cfg.daily_quest_count_min, self.cfg.daily_quest_count_max)
+        quest_count = self.rng.randint(self.cfg.daily_quest_count_min, self.cfg.daily_quest_count_max)
 
         # Get all available quest templates
         available_templates = list(self.cfg.QUEST_TEMPLATES.values())
 
         # Randomly select quests (ensure no duplicates)
-        selected_templates = random.sample(available_templates, min(quest_count, len(available_templates)))
-
-        # Create quest instances
-        for template in selected_templates:
-            quest = {
-                "id": template.id,
-                "name": template.name,
-                "description": template.description,
-                "requirement_type": template.requirement_type,
-                "plant_type": template.plant_type,
-                "requirement_count": template.requirement_count,
-                "current_progress": 0,
-                "reward_money": template.reward_money,
-                "completed": False
-            }
-            state.daily_quests.append(quest)
+        selected_templates = self.rng.sample(available_templates, min(quest_count, len(available_templates)))
 
-    def update_quest_progress(self, state: GameState, action_type: str, amount: int = 1, plant_type: str = None):
-        """Update quest progress based on player actions"""
-        for quest in state.daily_quests:
-            if quest["completed"]:
-                continue
+        self.set_daily_quests(state, [template.id for template in selected_templates])
 
-            # Check if this quest matches the action
-            matches = quest["requirement_type"] == action_type
+    def set_daily_quests(self, state: GameState, template_ids: list[str]):
+        """Replace the daily quests with fresh instances of the given templates"""
+        self.quests.assign(state, template_ids)
 
-            # For harvest quests, also check plant type
-            if action_type == "harvest" and "plant_type" in quest:
-                matches = matches and quest["plant_type"] == plant_type
-
-            if matches:
-                quest["current_progress"] = min(quest["requirement_count"],
-                                              quest["current_progress"] + amount)
-
-                # Check if quest is completed
-                if quest["current_progress"] >= quest["requirement_count"] and not quest["completed"]:
-                    quest["completed"] = True
-                    state.completed_quests_today += 1
+    def update_quest_progress(self, state: GameState, action_type: str, amount: int = 1, plant_type: str = None):
+        """Update quest progress based on player actions"""
+        self.events.publish(state, action_type, amount, plant_type)
 
     def complete_quest(self, state: GameState, quest_id: str) -> bool:
         """Complete a quest and give rewards"""
-        for quest in state.daily_quests:
-            if quest["id"] == quest_id and quest["completed"] and not quest.get("claimed", False):
-                # Give reward
-                state.money += quest["reward_money"]
-                quest["claimed"] = True
-                return True
-        return False
+        quest = self.quests.find(state, quest_id)
+        if quest is None or not quest.completed or quest.record.get("claimed", False):
+            return False
+
+        # Give reward
+        state.money += quest.record["reward_money"]
+        quest.record["claimed"] = True
+        return True
 
     def get_active_quests(self, state: GameState) -> list[dict]:
         """Get list of active (unclaimed) quests"""
         return [quest for quest in state.daily_quests if not quest.get("claimed", False)]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time advance_offline against 100 ms ticking over the same gap")
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.1, 1.0, 8.0])
+    parser.add_argument("--tick-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    config = GameConfig()
+    step = args.tick_ms / 1000.0
+
+    def make_state() -> GameState:
+        # A dark plant under a working cat, so the pet refills water all along the gap
+        return GameState(growth=0.0, water=2.0, plant_type="dark", active_pet="cat", pet_last_fed_ts=0.0)
+
+    print(f"{'hours':>6} {'ticking':>10} {'offline':>10} {'growth diff':>12}")
+    for hours in args.hours:
+        seconds = hours * 3600
+        ticked = make_state()
+        engine = GameEngine(config, rng=random.Random(0))
+        started = time.perf_counter()
+        now = 0.0
+        for _ in range(round(seconds / step)):
+            now += step
+            engine.advance_simulation(ticked, step, now)
+            engine.check_pet_auto_watering(ticked, now)
+        tick_sec = time.perf_counter() - started
+
+        offline = make_state()
+        started = time.perf_counter()
+        GameEngine(config, rng=random.Random(0)).advance_offline(offline, seconds, 0.0)
+        offline_sec = time.perf_counter() - started
+        print(f"{hours:>6g} {tick_sec * 1000:8.1f}ms {offline_sec * 1e6:8.1f}us {offline.growth - ticked.growth:12.2e}")
+
+
+if __name__ == "__main__":
+    main()
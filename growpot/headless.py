@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from growpot.state import GameState, load_state, save_state
+from growpot.game_config import GameConfig
+from growpot.session import GameSession
+from growpot.clock import ManualClock
+
+
+class Policy(ABC):
+    """Decides which player actions to take; called every decision interval of simulated time"""
+
+    @abstractmethod
+    def act(self, session: GameSession, sim_time: float) -> int:
+        """Perform actions on the session and return how many were taken"""
+
+
+class ScriptedPolicy(Policy):
+    """Replays a fixed list of (sim_time, action, *args) steps, e.g. (12.0, "plant_seed", "leaf")"""
+
+    def __init__(self, script: list[tuple]):
+        self.script = sorted(script, key=lambda step: step[0])
+        self._next = 0
+
+    def act(self, session: GameSession, sim_time: float) -> int:
+        taken = 0
+        while self._next < len(self.script) and self.script[self._next][0] <= sim_time:
+            _, action, *args = self.script[self._next]
+            getattr(session, action)(*args)
+            self._next += 1
+            taken += 1
+        return taken
+
+
+class GreedyPolicy(Policy):
+    """Keeps the pot busy with the best unlocked seed, waters when low and sells everything"""
+
+    def __init__(self, water_below: float = 1.0, sell: bool = True, upgrade_pots: bool = True):
+        self.water_below = water_below
+        self.sell = sell
+        self.upgrade_pots = upgrade_pots
+
+    def act(self, session: GameSession, sim_time: float) -> int:
+        state = session.state
+        engine = session.game_engine
+        taken = 0
+
+        if engine.can_harvest(state):
+            session.harvest()
+            taken += 1
+
+        if state.growth < 0 and self.upgrade_pots:
+            taken += self._upgrade_pot(session)
+
+        if state.growth < 0:
+            plant_type = self._best_plant(session)
+            if plant_type and session.plant_seed(plant_type):
+                taken += 1
+
+        if state.growth >= 0 and state.water <= self.water_below:
+            session.water()
+            taken += 1
+
+        if engine.can_catch_bug(state):
+            session.catch_bug()
+            taken += 1
+
+        if self.sell:
+            for item, quantity in list(state.inventory.items()):
+                price = self._sell_price(session.cfg, item)
+                if price is not None and quantity > 0 and session.sell(item, quantity, price):
+                    taken += 1
+
+        for quest in engine.get_active_quests(state):
+            if quest["completed"] and session.claim_quest(quest["id"]):
+                taken += 1
+
+        return taken
+
+    def _best_plant(self, session: GameSession) -> str | None:
+        """Highest unlocked plant we have (or can buy) a seed for"""
+        state = session.state
+        unlocked = [
+            (stats.unlock_level, plant_type, stats)
+            for plant_type, stats in session.cfg.PLANT_STATS.items()
+            if state.level >= stats.unlock_level
+        ]
+        for _, plant_type, stats in sorted(unlocked, key=lambda item: item[0], reverse=True):
+            if state.seed_inventory.get(plant_type, 0) > 0:
+                return plant_type
+            if session.buy_seeds(plant_type, 1, stats.seed_price):
+                return plant_type
+        return None
+
+    @staticmethod
+    def _upgrade_pot(session: GameSession) -> int:
+        """Buy the fastest pot we can afford and move the (empty) pot into the fastest one we own"""
+        state = session.state
+        by_speed = sorted(session.cfg.POT_STATS.items(), key=lambda item: item[1].growth_time_reduction_percent,
+                          reverse=True)
+        taken = 0
+        for pot_type, stats in by_speed:
+            if pot_type in state.unlocked_pots:
+                break
+            if state.money >= stats.price and session.buy_pot(pot_type, stats.price):
+                taken += 1
+                break
+        # Old saves may only hold pots this config no longer has
+        best = next((pot_type for pot_type, _ in by_speed if pot_type in state.unlocked_pots), state.pot_type)
+        if best != state.pot_type and session.change_pot(best):
+            taken += 1
+        return taken
+
+    @staticmethod
+    def _sell_price(cfg: GameConfig, item: str) -> int | None:
+        if item == "bug":
+            return cfg.bug_sell_price
+        plant_stats = cfg.PLANT_STATS.get(item)
+        return plant_stats.harvest_price_per_item if plant_stats else None
+
+
+POLICIES = {
+    "greedy": lambda: GreedyPolicy(),
+    "hoard": lambda: GreedyPolicy(sell=False),
+    "idle": lambda: ScriptedPolicy([]),
+}
+
+
+@dataclass
+class RunReport:
+    sim_seconds: float
+    wall_seconds: float
+    ticks: int
+    actions: int
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Simulated seconds per wall second"""
+        return self.sim_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    def format(self) -> str:
+        lines = [
+            f"simulated: {self.sim_seconds:.0f}s in {self.wall_seconds:.3f}s wall "
+            f"({self.throughput:,.0f}x real time)",
+            f"ticks: {self.ticks}, actions: {self.actions}",
+        ]
+        for phase, seconds in self.phase_seconds.items():
+            per_tick_us = seconds / self.ticks * 1e6 if self.ticks else 0.0
+            lines.append(f"  {phase:<9} {seconds:8.3f}s  ({per_tick_us:.2f} us/tick)")
+        return "\n".join(lines)
+
+
+class HeadlessRunner:
+    """Drives a GameSession with simulated time, as fast as the CPU allows.
+
+    Game time starts at the state's last_update_ts and only moves when the runner ticks, so a run
+    with the same state, policy and seed is fully reproducible.
+    """
+
+    def __init__(self, config: GameConfig, state: GameState, policy: Policy,
+                 tick_sec: float = 0.1, decision_sec: float = 1.0, seed: int | None = None):
+        self.clock = ManualClock(state.last_update_ts)
+        self.session = GameSession(config, state, clock=self.clock, rng=random.Random(seed))
+        self.policy = policy
+        self.tick_sec = tick_sec
+        self.decision_sec = decision_sec
+        self.sim_time = 0.0
+
+    def run(self, sim_seconds: float) -> RunReport:
+        """Simulate sim_seconds of play and report throughput and per-phase timings"""
+        session = self.session
+        engine = session.game_engine
+        state = session.state
+        perf = time.perf_counter
+        phases = {"simulate": 0.0, "pet": 0.0, "policy": 0.0, "quests": 0.0}
+
+        session.initialize_shop_inventory()
+        ticks = 0
+        actions = 0
+        next_decision = self.sim_time
+        end_time = self.sim_time + sim_seconds
+        started = perf()
+
+        while self.sim_time < end_time:
+            dt = min(self.tick_sec, end_time - self.sim_time)
+
+            self.clock.advance(dt)
+            now = self.clock.now()
+
+            t0 = perf()
+            engine.advance_simulation(state, dt, now)
+            t1 = perf()
+            engine.check_pet_auto_watering(state, now)
+            t2 = perf()
+            phases["simulate"] += t1 - t0
+            phases["pet"] += t2 - t1
+
+            self.sim_time += dt
+            ticks += 1
+
+            if self.sim_time >= next_decision:
+                next_decision += self.decision_sec
+                t0 = perf()
+                engine.check_daily_quest_reset(state, now)
+                t1 = perf()
+                actions += self.policy.act(session, self.sim_time)
+                t2 = perf()
+                phases["quests"] += t1 - t0
+                phases["policy"] += t2 - t1
+
+        state.last_update_ts = self.clock.now()
+        return RunReport(
+            sim_seconds=sim_seconds,
+            wall_seconds=perf() - started,
+            ticks=ticks,
+            actions=actions,
+            phase_seconds=phases,
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run GrowPot game logic headless with simulated time")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated hours to run")
+    parser.add_argument("--tick", type=float, default=0.1, help="simulated seconds per tick")
+    parser.add_argument("--decision", type=float, default=1.0, help="simulated seconds between policy decisions")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible run")
+    parser.add_argument("--state", type=Path, help="start from this state file instead of a new game")
+    parser.add_argument("--save", type=Path, help="write the final state to this file")
+    args = parser.parse_args(argv)
+
+    state = load_state(args.state) if args.state else GameState(last_update_ts=time.time())
+    runner = HeadlessRunner(GameConfig(), state, POLICIES[args.policy](),
+                            tick_sec=args.tick, decision_sec=args.decision, seed=args.seed)
+    report = runner.run(args.hours * 3600.0)
+
+    print(report.format())
+    print(f"money: {state.money}, level: {state.level}, exp: {state.exp}, inventory: {state.inventory}")
+    if args.save:
+        save_state(state, args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import dataclasses
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from growpot.state import GameState, load_state, save_state
+from growpot.game_config import GameConfig
+from growpot.clock import ManualClock
+
+
+DEFAULT_JOURNAL_FILE = Path("journal.bin")
+DEFAULT_SNAPSHOT_FILE = Path("journal_snapshot.json")
+
+# Record kinds. Codes are positions in this tuple, so only ever append to it.
+ACTIONS = (
+    # Player actions (GameSession method names)
+    "water",
+    "harvest",
+    "reset",
+    "plant_seed",
+    "change_pot",
+    "unlock_pot",
+    "sell",
+    "buy_pet_food",
+    "buy_net",
+    "buy_seeds",
+    "buy_pot",
+    "buy_pet",
+    "feed_pet",
+    "activate_pet",
+    "deactivate_pet",
+    "unlock_pet",
+    "catch_bug",
+    "claim_quest",
+    # Random outcomes and app lifecycle, recorded so replay does not depend on the RNG
+    "bug_spawn",  # a bug appeared at this timestamp
+    "daily_quests",  # quests were rerolled; args are the template ids
+    "resume",  # app started; arg is the last_update_ts offline progress was applied from
+)
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+_MAGIC = b"GPJ"
+_VERSION = 1
+_HEADER = struct.Struct("<3sB")  # magic, version
+_RECORD = struct.Struct("<dBB")  # timestamp, action code, argument count
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_STR_LEN = struct.Struct("<H")
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    timestamp: float
+    action: str
+    args: tuple
+
+
+class InputJournal:
+    """Append-only binary log of player actions and random outcomes"""
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL_FILE):
+        self.path = path
+        is_new = not path.exists() or path.stat().st_size == 0
+        self._file: BinaryIO = path.open("ab")
+        if is_new:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+            self._file.flush()
+
+    def record(self, timestamp: float, action: str, *args):
+        """Append one entry (args may be int, float or str)"""
+        parts = [_RECORD.pack(timestamp, ACTION_CODES[action], len(args))]
+        for arg in args:
+            if isinstance(arg, bool) or isinstance(arg, int):
+                parts.append(b"i" + _INT.pack(int(arg)))
+            elif isinstance(arg, float):
+                parts.append(b"f" + _FLOAT.pack(arg))
+            else:
+                data = str(arg).encode("utf-8")
+                parts.append(b"s" + _STR_LEN.pack(len(data)) + data)
+        self._file.write(b"".join(parts))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes | None:
+    """size bytes from f, or None if the file ends first"""
+    data = f.read(size)
+    return data if len(data) == size else None
+
+
+def read_journal(path: Path = DEFAULT_JOURNAL_FILE) -> Iterator[JournalEntry]:
+    """Stream entries from a journal file one at a time (constant memory).
+
+    A record cut short by a crash, anywhere inside it, ends the stream before that record.
+    """
+    with path.open("rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        magic, version = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a growpot journal (version {_VERSION})")
+
+        while True:
+            raw = _read_exact(f, _RECORD.size)
+            if raw is None:
+                return  # End of file (or a record cut short by a crash)
+            timestamp, code, argc = _RECORD.unpack(raw)
+            args = []
+            for _ in range(argc):
+                tag = f.read(1)
+                if tag == b"i":
+                    raw = _read_exact(f, _INT.size)
+                    value = None if raw is None else _INT.unpack(raw)[0]
+                elif tag == b"f":
+                    raw = _read_exact(f, _FLOAT.size)
+                    value = None if raw is None else _FLOAT.unpack(raw)[0]
+                elif tag == b"s":
+                    raw = _read_exact(f, _STR_LEN.size)
+                    raw = None if raw is None else _read_exact(f, _STR_LEN.unpack(raw)[0])
+                    value = None if raw is None else raw.decode("utf-8")
+                else:
+                    value = None
+                if value is None:
+                    return  # Truncated record
+                args.append(value)
+            yield JournalEntry(timestamp, ACTIONS[code], tuple(args))
+
+
+class Replayer:
+    """Rebuilds a GameState from a snapshot plus a journal, running the engine as fast as possible.
+
+    Time only advances between entries, in jumps from one engine event to the next, and random
+    outcomes (bugs, quest rolls) come from the journal instead of the RNG. Like the app, which
+    catches the simulation up to the present before applying a player action, each entry is applied
+    to the state as simulated up to its timestamp.
+    """
+
+    def __init__(self, config: GameConfig | None = None):
+        # Bugs are replayed from the journal, never rolled
+        self.cfg = dataclasses.replace(config or GameConfig(), bug_appearance_chance=0.0)
+
+    def replay(self, snapshot: GameState, entries: Iterable[JournalEntry], until: float | None = None) -> GameState:
+        """Apply entries to a copy of snapshot; simulate on to `until` (unix time) if given"""
+        from growpot.session import GameSession
+
+        state = copy.deepcopy(snapshot)
+        clock = ManualClock(state.last_update_ts)
+        session = GameSession(self.cfg, state, clock=clock)
+        engine = session.game_engine
+
+        for entry in entries:
+            if entry.action == "resume":
+                # The app was closed: jump over the gap the same way startup did
+                (offline_from,) = entry.args
+                self._advance_to(session, clock, offline_from)
+                clock.set(entry.timestamp)
+                engine.advance_offline(state, entry.timestamp - offline_from, offline_from)
+                continue
+
+            self._advance_to(session, clock, entry.timestamp)
+            if entry.action == "bug_spawn":
+                state.bug_active = True
+                state.bug_appearance_time = entry.timestamp
+            elif entry.action == "daily_quests":
+                engine.set_daily_quests(state, list(entry.args))
+                state.quest_last_reset_ts = entry.timestamp
+                state.completed_quests_today = 0
+            else:
+                getattr(session, entry.action)(*entry.args)
+
+        if until is not None:
+            self._advance_to(session, clock, until)
+        state.last_update_ts = clock.now()
+        return state
+
+    def _advance_to(self, session, clock: ManualClock, target: float):
+        """Simulate up to target, stepping from one engine event to the next"""
+        min_step = self.cfg.tick_ms / 1000.0
+        while clock.now() < target:
+            next_event = session.game_engine.seconds_until_next_event(session.state, clock.now())
+            step = min(target - clock.now(), max(next_event, min_step))
+            clock.advance(step)
+            session.tick(step, clock.now())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a growpot input journal onto a state snapshot")
+    parser.add_argument("--snapshot", type=Path, default=DEFAULT_SNAPSHOT_FILE)
+    parser.add_argument("--journal", type=Path, default=DEFAULT_JOURNAL_FILE)
+    parser.add_argument("--until", type=float, help="keep simulating up to this unix time after the last entry")
+    parser.add_argument("--out", type=Path, help="write the rebuilt state to this file")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = 0
+
+    def counted(entries: Iterable[JournalEntry]) -> Iterator[JournalEntry]:
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    state = Replayer().replay(load_state(args.snapshot), counted(read_journal(args.journal)), args.until)
+    elapsed = time.perf_counter() - started
+    print(f"replayed {count} entries in {elapsed:.3f}s")
+    print(f"money: {state.money}, level: {state.level}, growth: {state.growth:.3f}, water: {state.water:.3f}")
+    if args.out:
+        save_state(state, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+DEFAULT_LEDGER_DIR = Path("ledger")
+
+# Event kinds. Codes are positions in this tuple, so only ever append to it.
+KINDS = (
+    "harvest",
+    "sell",
+    "buy_pet_food",
+    "buy_net",
+    "buy_seeds",
+    "buy_pot",
+    "buy_pet",
+    "unlock_pot",
+    "unlock_pet",
+    "catch_bug",
+    "quest_reward",
+)
+KIND_CODES = {name: code for code, name in enumerate(KINDS)}
+
+# Harvest quality codes (0 for events without a quality)
+QUALITIES = ("", "poor", "normal", "excellent")
+QUALITY_CODES = {name: code for code, name in enumerate(QUALITIES)}
+
+# One file per column, each a flat array of this typecode
+COLUMNS = (
+    ("timestamp", "d"),
+    ("kind", "B"),
+    ("item", "H"),
+    ("quantity", "q"),
+    ("money", "q"),  # Money delta: positive for income, negative for spending
+    ("quality", "B"),
+)
+
+HOUR = 3600
+DAY = 86400
+# Default age (before the newest hour) past which hourly rollups are dropped; daily ones are kept forever
+HOURLY_RETENTION_SEC = 30 * DAY
+
+
+@dataclass(frozen=True)
+class LedgerEvent:
+    timestamp: float
+    kind: str
+    item: str
+    quantity: int
+    money: int
+    quality: str
+
+
+class Ledger:
+    """Append-only history of harvests and money movements, stored column-wise.
+
+    New events go into in-memory typed arrays; flush() appends them to one file per column under
+    path, and history already on disk is read through read-only memory maps. Hourly and daily
+    rollups (UTC buckets) are kept up to date on every append, so per-period and per-plant queries
+    never scan raw rows; hourly ones are kept for hourly_retention_sec. flush_in_background() does
+    the file writes on a writer thread; every other method may be called from any thread.
+    """
+
+    def __init__(self, path: Path | None = DEFAULT_LEDGER_DIR, hourly_retention_sec: float = HOURLY_RETENTION_SEC):
+        self.path = path
+        self.hourly_retention_sec = hourly_retention_sec
+        self.items: list[str] = []
+        self._item_ids: dict[str, int] = {}
+        self._flushed_items = 0
+        self._tail = {name: array(code) for name, code in COLUMNS}
+        self._maps: list[mmap.mmap] = []
+        self._readers = 0  # events() generators running; old mappings stay open until they finish
+        self._retired: list[tuple[dict, list[mmap.mmap]]] = []
+        self._mapped: dict[str, memoryview] = {}
+        self._mapped_rows = 0
+
+        # bucket -> (kind, item) -> [events, quantity, money]
+        self.hourly: dict[int, dict[tuple[int, int], list[int]]] = {}
+        self.daily: dict[int, dict[tuple[int, int], list[int]]] = {}
+        # (day, item) -> harvest count per quality code
+        self.daily_quality: dict[tuple[int, int], list[int]] = {}
+
+        self.last_error: Exception | None = None
+        self._lock = threading.Lock()  # Guards everything above
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer: threading.Thread | None = None
+
+        if path is not None:
+            path.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    # Writing
+    def record(self, timestamp: float, kind: str, item: str = "", quantity: int = 0, money: int = 0,
+               quality: str = ""):
+        kind_code = KIND_CODES[kind]
+        quality_code = QUALITY_CODES[quality]
+        with self._lock:
+            item_id = self._item_id(item)
+            tail = self._tail
+            tail["timestamp"].append(timestamp)
+            tail["kind"].append(kind_code)
+            tail["item"].append(item_id)
+            tail["quantity"].append(quantity)
+            tail["money"].append(money)
+            tail["quality"].append(quality_code)
+            self._roll_up(timestamp, kind_code, item_id, quantity, money, quality_code)
+
+    def flush(self):
+        """Append pending events to the column files and save the rollups"""
+        if self.path is None:
+            return
+        with self._flush_lock:
+            # Copy what to write, so record() can go on while the files are written
+            with self._lock:
+                rows = len(self._tail["timestamp"])
+                new_items = self.items[self._flushed_items:]
+                if not rows and not new_items:
+                    return
+                pending = {name: self._tail[name][:rows] for name, _ in COLUMNS}
+                self._prune_hourly()
+                rollups = {
+                    "rows": self._mapped_rows + rows,
+                    "hourly": _rollup_rows(self.hourly),
+                    "daily": _rollup_rows(self.daily),
+                    "daily_quality": [[*key, *value] for key, value in self.daily_quality.items()],
+                }
+
+            if new_items:
+                with (self.path / "items.txt").open("a", encoding="utf-8") as f:
+                    f.writelines(item + "\n" for item in new_items)
+                with self._lock:
+                    self._flushed_items += len(new_items)
+            try:
+                for name, code in COLUMNS:
+                    with (self.path / f"{name}.{code}").open("ab") as f:
+                        pending[name].tofile(f)
+            except BaseException:
+                # Leave the files as they were, so the retry does not misalign the columns
+                self._truncate_columns(self._mapped_rows)
+                raise
+            tmp_path = self.path / "rollups.json.tmp"
+            tmp_path.write_text(json.dumps(rollups, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.path / "rollups.json")
+
+            with self._lock:
+                for name, _ in COLUMNS:
+                    del self._tail[name][:rows]
+                self._remap()
+
+    def flush_in_background(self):
+        """Ask the writer thread to flush(), without waiting for it"""
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+            self._writer.start()
+        self._wake.set()
+
+    def close(self):
+        if self._writer is not None:
+            self._stopping = True
+            self._wake.set()
+            self._writer.join(timeout=5.0)
+            self._writer = None
+        self.flush()
+        with self._lock:
+            self._unmap()
+
+    # Queries (answered from the rollups)
+    def income(self, since: float, until: float | None = None, period: int = HOUR) -> list[tuple[int, int]]:
+        """(bucket start, money earned) for every hour or day in [since, until).
+
+        Hours older than hourly_retention_sec have been pruned and report 0; ask for days instead.
+        """
+        until = time.time() if until is None else until
+        rollup = self.hourly if period == HOUR else self.daily
+        first, last = int(since // period), int((until - 1e-9) // period)
+        result = []
+        with self._lock:
+            for bucket in range(first, last + 1):
+                sums = rollup.get(bucket)
+                earned = sum(money for _, _, money in sums.values() if money > 0) if sums else 0
+                result.append((bucket * period, earned))
+        return result
+
+    def totals(self, kind: str, since: float = 0.0, until: float | None = None) -> dict[str, tuple[int, int, int]]:
+        """Per item (events, quantity, money) of one kind, from whole days in [since, until)"""
+        until = time.time() if until is None else until
+        kind_code = KIND_CODES[kind]
+        result: dict[str, list[int]] = {}
+        with self._lock:
+            for day, buckets in self.daily.items():
+                if not since <= day * DAY < until:
+                    continue
+                for (code, item_id), values in buckets.items():
+                    if code == kind_code:
+                        sums = result.setdefault(self.items[item_id], [0, 0, 0])
+                        for i, value in enumerate(values):
+                            sums[i] += value
+        return {item: tuple(sums) for item, sums in result.items()}
+
+    def quality_rates(self, since: float = 0.0, until: float | None = None) -> dict[str, dict[str, float]]:
+        """Share of harvests per quality, per plant type"""
+        until = time.time() if until is None else until
+        counts: dict[int, list[int]] = {}
+        with self._lock:
+            for (day, item_id), values in self.daily_quality.items():
+                if since <= day * DAY < until:
+                    sums = counts.setdefault(item_id, [0] * len(QUALITIES))
+                    for i, value in enumerate(values):
+                        sums[i] += value
+        rates = {}
+        for item_id, sums in counts.items():
+            total = sum(sums)
+            rates[self.items[item_id]] = {
+                quality: sums[code] / total for code, quality in enumerate(QUALITIES) if quality and total
+            }
+        return rates
+
+    # Raw rows
+    def __len__(self) -> int:
+        with self._lock:
+            return self._mapped_rows + len(self._tail["timestamp"])
+
+    def events(self, since: float = 0.0) -> Iterator[LedgerEvent]:
+        """Every event at or after since, oldest first (scans the columns).
+
+        Iterates over the events there were when it started; flushes meanwhile do not disturb it.
+        """
+        with self._lock:
+            self._readers += 1
+            mapped, mapped_rows = self._mapped, self._mapped_rows
+            tail = {name: self._tail[name][:] for name, _ in COLUMNS}
+        try:
+            for columns, rows in ((mapped, mapped_rows), (tail, len(tail["timestamp"]))):
+                if not rows:
+                    continue
+                timestamps = columns["timestamp"]
+                for row in range(rows):
+                    if timestamps[row] < since:
+                        continue
+                    yield LedgerEvent(
+                        timestamps[row],
+                        KINDS[columns["kind"][row]],
+                        self.items[columns["item"][row]],
+                        columns["quantity"][row],
+                        columns["money"][row],
+                        QUALITIES[columns["quality"][row]],
+                    )
+        finally:
+            with self._lock:
+                self._readers -= 1
+                if not self._readers:
+                    for views, maps in self._retired:
+                        _release(views, maps)
+                    self._retired = []
+
+    # Internals
+    def _item_id(self, item: str) -> int:
+        item_id = self._item_ids.get(item)
+        if item_id is None:
+            item_id = self._item_ids[item] = len(self.items)
+            self.items.append(item)
+        return item_id
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                self.last_error = e
+
+    def _roll_up(self, timestamp: float, kind: int, item: int, quantity: int, money: int, quality: int):
+        for rollup, period in ((self.hourly, HOUR), (self.daily, DAY)):
+            buckets = rollup.setdefault(int(timestamp // period), {})
+            sums = buckets.get((kind, item))
+            if sums is None:
+                buckets[(kind, item)] = [1, quantity, money]
+            else:
+                sums[0] += 1
+                sums[1] += quantity
+                sums[2] += money
+        if quality:
+            counts = self.daily_quality.setdefault((int(timestamp // DAY), item), [0] * len(QUALITIES))
+            counts[quality] += 1
+
+    def _prune_hourly(self):
+        if self.hourly:
+            cutoff = max(self.hourly) - int(self.hourly_retention_sec // HOUR)
+            for bucket in [bucket for bucket in self.hourly if bucket < cutoff]:
+                del self.hourly[bucket]
+
+    def _load(self):
+        items_path = self.path / "items.txt"
+        if items_path.exists():
+            data = items_path.read_bytes()
+            # Drop a line cut short by a crash, so the next append starts on a fresh line
+            complete = data[:data.rfind(b"\n") + 1]
+            if len(complete) != len(data):
+                os.truncate(items_path, len(complete))
+            for item in complete.decode("utf-8").split("\n")[:-1]:
+                self._item_id(item)
+        self._flushed_items = len(self.items)
+        self._truncate_columns()
+        self._remap()
+
+        rolled_rows = 0
+        rollups_path = self.path / "rollups.json"
+        if rollups_path.exists():
+            rollups = json.loads(rollups_path.read_text(encoding="utf-8"))
+            if rollups["rows"] <= self._mapped_rows:
+                rolled_rows = rollups["rows"]
+                self.hourly = _rollup_from_rows(rollups["hourly"])
+                self.daily = _rollup_from_rows(rollups["daily"])
+                self.daily_quality = {tuple(row[:2]): row[2:] for row in rollups["daily_quality"]}
+
+        # Rows flushed after the rollups were last saved (e.g. a crash in between)
+        columns = self._mapped
+        for row in range(rolled_rows, self._mapped_rows):
+            self._roll_up(columns["timestamp"][row], columns["kind"][row], columns["item"][row],
+                          columns["quantity"][row], columns["money"][row], columns["quality"][row])
+        self._prune_hourly()
+
+    def _truncate_columns(self, rows: int | None = None):
+        """Cut every column file back to rows (default: the rows all of them hold in full).
+
+        A crash during flush() can leave some columns a few rows (or part of a row) longer than
+        others; appending after that would pair values from different events.
+        """
+        files = {name: self.path / f"{name}.{code}" for name, code in COLUMNS}
+        sizes = {name: (path.stat().st_size if path.exists() else 0) for name, path in files.items()}
+        if rows is None:
+            rows = min(sizes[name] // array(code).itemsize for name, code in COLUMNS)
+        for name, code in COLUMNS:
+            if sizes[name] > rows * array(code).itemsize:
+                os.truncate(files[name], rows * array(code).itemsize)
+
+    def _remap(self):
+        """Map the column files read-only, up to the last row every column has in full"""
+        self._unmap()
+        files = {name: self.path / f"{name}.{code}" for name, code in COLUMNS}
+        sizes = {name: (path.stat().st_size if path.exists() else 0) for name, path in files.items()}
+        rows = min(sizes[name] // array(code).itemsize for name, code in COLUMNS)
+        if rows == 0:
+            self._mapped = {name: array(code) for name, code in COLUMNS}
+            self._mapped_rows = 0
+            return
+
+        for name, code in COLUMNS:
+            with files[name].open("rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self._mapped[name] = memoryview(mapped)[:rows * array(code).itemsize].cast(code)
+        self._mapped_rows = rows
+
+    def _unmap(self):
+        if self._readers:
+            self._retired.append((self._mapped, self._maps))
+        else:
+            _release(self._mapped, self._maps)
+        self._mapped = {}
+        self._maps = []
+
+
+def _release(views: dict, maps: list[mmap.mmap]):
+    for view in views.values():
+        if isinstance(view, memoryview):
+            view.release()
+    for mapped in maps:
+        mapped.close()
+
+
+def _rollup_rows(rollup: dict[int, dict[tuple[int, int], list[int]]]) -> list[list[int]]:
+    """Flat [bucket, kind, item, events, quantity, money] rows, as stored in rollups.json"""
+    return [[bucket, *key, *values] for bucket, buckets in rollup.items() for key, values in buckets.items()]
+
+
+def _rollup_from_rows(rows: list[list[int]]) -> dict[int, dict[tuple[int, int], list[int]]]:
+    rollup: dict[int, dict[tuple[int, int], list[int]]] = {}
+    for bucket, kind, item, *values in rows:
+        rollup.setdefault(bucket, {})[(kind, item)] = values
+    return rollup
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize a growpot ledger")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_LEDGER_DIR)
+    parser.add_argument("--days", type=float, default=30.0, help="how far back to look")
+    args = parser.parse_args(argv)
+
+    ledger = Ledger(args.ledger)
+    now = time.time()
+    since = now - args.days * DAY
+    # Whole days: they reach back any --days, while hourly rollups stop at the retention
+    earned = sum(money for _, money in ledger.income(since, now, DAY))
+    print(f"{len(ledger)} events, income over the last {args.days:g} days: {earned} "
+          f"({earned / (args.days * 24):.1f} per hour)")
+    for plant_type, rates in sorted(ledger.quality_rates(since, now).items()):
+        shares = ", ".join(f"{quality} {share:.0%}" for quality, share in rates.items())
+        print(f"  {plant_type:<8} {shares}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig
+
+
+DEFAULT_LIVE_FILE = Path("live_state.bin")
+
+_MAGIC = b"GPLV"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxQ")  # magic, version, pid
+_SEQ = struct.Struct("<Q")  # Sequence counter: odd while a write is in progress
+_SEQ_OFFSET = _HEADER.size
+_PAYLOAD_OFFSET = _SEQ_OFFSET + _SEQ.size
+# published_ts, growth, water, money, level, exp, pet seconds left (-1 without pet), flags
+_PAYLOAD = struct.Struct("<dddqqqdQ")
+SIZE = _PAYLOAD_OFFSET + _PAYLOAD.size
+
+_FLAG_BUG = 1 << 0
+_FLAG_PET_HUNGRY = 1 << 1
+_FLAG_WATER_DEPLETED = 1 << 2
+
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    pid: int
+    published_ts: float
+    growth: float
+    water: float
+    money: int
+    level: int
+    exp: int
+    pet_seconds_left: float | None  # None when no pet is active
+    pet_hungry: bool
+    bug_active: bool
+    water_ever_depleted: bool
+
+
+class LiveSnapshotWriter:
+    """Publishes the hot GameState fields into a fixed-layout memory-mapped file.
+
+    Every publish() bumps a sequence counter to odd, writes the payload in place and bumps it back
+    to even (a seqlock), so readers in other processes can copy it without locks and detect a
+    write they raced with.
+    """
+
+    def __init__(self, config: GameConfig, path: Path = DEFAULT_LIVE_FILE):
+        self.cfg = config
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, SIZE)
+            self._map = mmap.mmap(fd, SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        self._seq = 0
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, os.getpid())
+        _SEQ.pack_into(self._map, _SEQ_OFFSET, self._seq)
+
+    def publish(self, state: GameState, now: float):
+        pet_seconds_left = -1.0
+        flags = 0
+        if state.bug_active:
+            flags |= _FLAG_BUG
+        if state.water_ever_depleted:
+            flags |= _FLAG_WATER_DEPLETED
+        if state.active_pet:
+            pet_stats = self.cfg.PET_STATS[state.active_pet]
+            pet_seconds_left = max(0.0, pet_stats.work_duration_sec - (now - state.pet_last_fed_ts))
+            if pet_seconds_left <= 0:
+                flags |= _FLAG_PET_HUNGRY
+
+        self._seq += 1
+        _SEQ.pack_into(self._map, _SEQ_OFFSET, self._seq)
+        _PAYLOAD.pack_into(
+            self._map, _PAYLOAD_OFFSET,
+            now, state.growth, state.water, state.money, state.level, state.exp, pet_seconds_left, flags,
+        )
+        self._seq += 1
+        _SEQ.pack_into(self._map, _SEQ_OFFSET, self._seq)
+
+    def close(self):
+        self._map.close()
+
+
+class LiveSnapshotReader:
+    """Lock-free reader for a file published by LiveSnapshotWriter"""
+
+    def __init__(self, path: Path = DEFAULT_LIVE_FILE):
+        self.path = path
+        with path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+        magic, version, self.pid = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a growpot live snapshot (version {_VERSION})")
+
+    def read(self, timeout: float = 1.0) -> LiveSnapshot:
+        """Copy a consistent snapshot, retrying while the writer is mid-update"""
+        deadline = None
+        while True:
+            (before,) = _SEQ.unpack_from(self._map, _SEQ_OFFSET)
+            if not before & 1:
+                payload = _PAYLOAD.unpack_from(self._map, _PAYLOAD_OFFSET)
+                (after,) = _SEQ.unpack_from(self._map, _SEQ_OFFSET)
+                if before == after:
+                    return self._decode(payload)
+
+            # Raced with a write: give the writer a chance to finish (it may have been preempted)
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + timeout
+            elif now > deadline:
+                raise TimeoutError(f"{self.path}: no consistent snapshot (writer stuck or gone)")
+            time.sleep(0)
+
+    def _decode(self, payload: tuple) -> LiveSnapshot:
+        published_ts, growth, water, money, level, exp, pet_seconds_left, flags = payload
+        return LiveSnapshot(
+            pid=self.pid,
+            published_ts=published_ts,
+            growth=growth,
+            water=water,
+            money=money,
+            level=level,
+            exp=exp,
+            pet_seconds_left=None if pet_seconds_left < 0 else pet_seconds_left,
+            pet_hungry=bool(flags & _FLAG_PET_HUNGRY),
+            bug_active=bool(flags & _FLAG_BUG),
+            water_ever_depleted=bool(flags & _FLAG_WATER_DEPLETED),
+        )
+
+    def close(self):
+        self._map.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Watch the live snapshots of running growpot instances")
+    parser.add_argument("paths", type=Path, nargs="*", default=[DEFAULT_LIVE_FILE])
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between refreshes (0: print once)")
+    args = parser.parse_args(argv)
+
+    readers = [LiveSnapshotReader(path) for path in args.paths]
+    while True:
+        now = time.time()
+        for reader in readers:
+            snap = reader.read()
+            pet = "-" if snap.pet_seconds_left is None else f"{snap.pet_seconds_left / 60:.0f}m"
+            print(
+                f"{str(reader.path):<24} pid {snap.pid:<7} age {now - snap.published_ts:6.1f}s  "
+                f"growth {snap.growth:7.2f}  water {snap.water:5.2f}  money {snap.money:<8} "
+                f"lv {snap.level:<3} pet {pet:<5}{' HUNGRY' if snap.pet_hungry else ''}"
+                f"{' BUG' if snap.bug_active else ''}"
+            )
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
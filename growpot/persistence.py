@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from growpot.state import DEFAULT_STATE_FILE, GameState, StateLog, state_to_dict
+
+
+# Fields the engine derives from elapsed time. Offline progress recomputes them exactly from the
+# last save, so a change in these alone is not worth a disk write - unless the player caused it
+# (watering, resetting the plant), which is why action handlers save with force=True.
+SIMULATED_FIELDS = frozenset({
+    "growth",
+    "water",
+    "growth_water_deficit",
+    "water_ever_depleted",
+    "last_update_ts",
+    "pet_last_worked_ts",
+})
+
+
+class StateSaver:
+    """Write-behind persistence for GameState.
+
+    save() snapshots the state on the caller's thread and diffs it against the last write; only
+    when a non-simulated field changed is the snapshot handed to a background thread. Requests that
+    arrive within coalesce_sec of each other collapse into a single write of the latest snapshot,
+    which the StateLog appends as a delta of the fields that changed.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STATE_FILE, coalesce_sec: float = 0.5,
+                 fsync: str = "interval", compact_bytes: int = 64 * 1024):
+        self.path = path
+        self.coalesce_sec = coalesce_sec
+        self.log = StateLog(path, fsync=fsync, compact_bytes=compact_bytes)
+        self.writes = 0
+        self.last_error: Exception | None = None
+
+        self._saved: dict | None = None  # Last snapshot handed to the writer
+        self._pending: dict | None = None
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="state-saver", daemon=True)
+        self._thread.start()
+
+    def dirty_fields(self, data: dict) -> set[str]:
+        """Fields of a snapshot that differ from the last one written"""
+        if self._saved is None:
+            return set(data)
+        return {name for name, value in data.items() if self._saved.get(name) != value}
+
+    def save(self, state: GameState, force: bool = False) -> bool:
+        """Queue a write if anything worth saving changed. Returns True if a write was queued.
+
+        Without force, changes to SIMULATED_FIELDS are ignored; pass force=True after a player action,
+        whose effect on those fields offline progress could not recompute.
+        """
+        data = state_to_dict(state)
+        dirty = self.dirty_fields(data)
+        if not force:
+            dirty -= SIMULATED_FIELDS
+        if not dirty:
+            return False
+
+        with self._cond:
+            self._saved = data
+            self._pending = data
+            self._cond.notify()
+        return True
+
+    def flush(self, state: GameState | None = None, timeout: float | None = 5.0):
+        """Write state (if given and changed at all) and wait until the writer is idle"""
+        if state is not None:
+            self.save(state, force=True)
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
+            self._flush_requested = False
+
+    def close(self, state: GameState | None = None, timeout: float = 5.0):
+        """Flush and stop the writer thread"""
+        self.flush(state, timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Still inside a slow write: leave the log open for it rather than close it underneath
+            self.last_error = TimeoutError(f"state writer still busy with {self.path} after {timeout}s")
+            return
+        self.log.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                # Let a burst of saves settle, unless someone is waiting on a flush
+                deadline = time.monotonic() + self.coalesce_sec
+                while not (self._flush_requested or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data = self._pending
+                self._pending = None
+                self._flush_requested = False
+                self._writing = True
+
+            try:
+                self.log.write(data)
+                self.writes += 1
+            except Exception as e:
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
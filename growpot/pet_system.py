@@ -2,17 +2,19 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import Toplevel, Menu
-from growpot.state import GameState, now_ts
+from growpot.state import GameState
 from growpot.game_config import GameConfig
 from growpot.ui_config import UIConfig
+from growpot.clock import Clock, SystemClock
 
 
 class PetManager:
     """Manages the pet system including status, feeding, and activation"""
     
-    def __init__(self, config: GameConfig, ui_config: UIConfig):
+    def __init__(self, config: GameConfig, ui_config: UIConfig, clock: Clock | None = None):
         self.cfg = config
         self.ui = ui_config
+        self.clock = clock or SystemClock()
     
     def show_pet_status(self, root: tk.Tk, state: GameState, growth: float, water: float, plant_at: float,
                        feed_callback: callable, activate_callback: callable,
@@ -235,7 +237,7 @@ class PetManager:
         pet_stats = self.cfg.PET_STATS[state.active_pet]
         work_duration = pet_stats.work_duration_sec
         time_fed = state.pet_last_fed_ts
-        time_remaining = work_duration - (now_ts() - time_fed)
+        time_remaining = work_duration - (self.clock.now() - time_fed)
         
         if time_remaining <= 0:
             return "Hungry now!"
@@ -270,9 +272,10 @@ class PetManager:
             return False
         
         # Activate the pet
+        now = self.clock.now()
         state.active_pet = pet_type
-        state.pet_last_fed_ts = now_ts()
-        state.pet_last_worked_ts = now_ts()
+        state.pet_last_fed_ts = now
+        state.pet_last_worked_ts = now
         return True
     
     def deactivate_pet_transaction(self, state: GameState) -> bool:
@@ -293,9 +296,10 @@ class PetManager:
             return False  # No pet food available
         
         # Feed the pet (consume pet food and reset working time)
+        now = self.clock.now()
         state.pet_food -= 1
-        state.pet_last_fed_ts = now_ts()
-        state.pet_last_worked_ts = now_ts()
+        state.pet_last_fed_ts = now
+        state.pet_last_worked_ts = now
         return True
     
     def _feed_pet(self, pet_win: Toplevel, feed_callback: callable):
@@ -332,7 +336,7 @@ class PetManager:
             return False
         
         pet_stats = self.cfg.PET_STATS[state.active_pet]
-        time_since_fed = now_ts() - state.pet_last_fed_ts
+        time_since_fed = self.clock.now() - state.pet_last_fed_ts
         return time_since_fed >= pet_stats.work_duration_sec
     
     def can_pet_work(self, state: GameState) -> bool:
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import time
+from typing import Iterable
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig
+from growpot.clock import Clock, SystemClock
+
+
+# Stage codes used by PotBatch.stage
+STAGE_EMPTY = -1
+STAGE_SEED = 0
+STAGE_SPROUT = 1
+STAGE_PLANT = 2
+
+
+class PotBatch:
+    """Struct-of-arrays store for many pots, advanced together in one vectorized step.
+
+    Mirrors GameEngine.advance_simulation: every array slot is one pot, plant and pot types are
+    small integer ids into the GameConfig catalogs, and per-type stats live in lookup tables.
+    """
+
+    def __init__(self, config: GameConfig, size: int = 0, seed: int | None = None, clock: Clock | None = None):
+        if np is None:
+            raise ImportError("PotBatch requires numpy (python -m pip install numpy)")
+
+        self.cfg = config
+        self.clock = clock or SystemClock()
+        self.plant_types = list(config.PLANT_STATS)
+        self.pot_types = list(config.POT_STATS)
+        self._plant_index = {name: i for i, name in enumerate(self.plant_types)}
+        self._pot_index = {name: i for i, name in enumerate(self.pot_types)}
+
+        # Lookup tables indexed by plant/pot id
+        self._plant_base_rate = np.array(
+            [config.plant_at / stats.growth_time_sec for stats in config.PLANT_STATS.values()], dtype=np.float64
+        )
+        self._pot_multiplier = np.array(
+            [1 + stats.growth_time_reduction_percent for stats in config.POT_STATS.values()], dtype=np.float64
+        )
+        self._pot_decay = np.array(
+            [config.water_decay_per_sec * (1.0 - stats.water_decay_reduction_percent)
+             for stats in config.POT_STATS.values()],
+            dtype=np.float64
+        )
+
+        # Per-pot state
+        self.growth = np.zeros(size, dtype=np.float64)
+        self.water = np.zeros(size, dtype=np.float64)
+        self.water_deficit = np.zeros(size, dtype=np.float64)
+        self.water_ever_depleted = np.zeros(size, dtype=bool)
+        self.bug_active = np.zeros(size, dtype=bool)
+        self.bug_appearance_time = np.zeros(size, dtype=np.float64)
+        self.plant_id = np.zeros(size, dtype=np.int16)
+        self.pot_id = np.zeros(size, dtype=np.int16)
+
+        self._rng = np.random.default_rng(seed)
+        self.refresh_rates()
+
+    def __len__(self) -> int:
+        return len(self.growth)
+
+    @classmethod
+    def from_states(cls, config: GameConfig, states: Iterable[GameState], seed: int | None = None,
+                    clock: Clock | None = None) -> PotBatch:
+        """Build a batch from GameState objects (one pot per state)"""
+        states = list(states)
+        batch = cls(config, len(states), seed=seed, clock=clock)
+        for i, state in enumerate(states):
+            batch.growth[i] = state.growth
+            batch.water[i] = state.water
+            batch.water_deficit[i] = state.growth_water_deficit
+            batch.water_ever_depleted[i] = state.water_ever_depleted
+            batch.bug_active[i] = state.bug_active
+            batch.bug_appearance_time[i] = state.bug_appearance_time
+            batch.plant_id[i] = batch._plant_index[state.plant_type]
+            batch.pot_id[i] = batch._pot_index[state.pot_type]
+        batch.refresh_rates()
+        return batch
+
+    def write_back(self, states: Iterable[GameState]):
+        """Copy batch values back onto the GameState objects it was built from"""
+        for i, state in enumerate(states):
+            state.growth = float(self.growth[i])
+            state.water = float(self.water[i])
+            state.growth_water_deficit = float(self.water_deficit[i])
+            state.water_ever_depleted = bool(self.water_ever_depleted[i])
+            state.bug_active = bool(self.bug_active[i])
+            state.bug_appearance_time = float(self.bug_appearance_time[i])
+            state.plant_type = self.plant_types[self.plant_id[i]]
+            state.pot_type = self.pot_types[self.pot_id[i]]
+
+    def refresh_rates(self):
+        """Recompute per-pot growth rate and water decay; call after changing plant_id or pot_id"""
+        self._growth_rate = self._plant_base_rate[self.plant_id] * self._pot_multiplier[self.pot_id]
+        self._water_decay = self._pot_decay[self.pot_id]
+
+    def stage(self) -> np.ndarray:
+        """Stage code per pot (STAGE_EMPTY, STAGE_SEED, STAGE_SPROUT or STAGE_PLANT)"""
+        stages = np.full(len(self), STAGE_SEED, dtype=np.int8)
+        stages[self.growth >= self.cfg.sprout_at] = STAGE_SPROUT
+        stages[self.growth >= self.cfg.plant_at] = STAGE_PLANT
+        stages[self.growth < 0] = STAGE_EMPTY
+        return stages
+
+    def step(self, dt: float, now: float | None = None) -> np.ndarray:
+        """Advance every pot by dt seconds and return a mask of pots that changed stage"""
+        cfg = self.cfg
+        growth = self.growth
+        water = self.water
+
+        # Empty pots are not simulated
+        active = growth >= 0
+
+        # Water decays (only where there is water left)
+        watered = active & (water > 0)
+        np.maximum(water - self._water_decay * dt, 0.0, out=water, where=watered)
+
+        # Track if water ever reached zero
+        self.water_ever_depleted |= active & (water <= 0.01)
+
+        # Same operation order as the scalar engine so results match to the last bit
+        water_factor = 1.0 - np.exp(-water)
+        growth_rate = self._growth_rate + water_factor * cfg.water_boost_growth_per_sec
+        prev_growth = growth.copy()
+        np.add(growth, growth_rate * dt, out=growth, where=active)
+
+        # Bug spawning as one Bernoulli draw per pot that crossed into the spawn range
+        window = cfg.bug_growth_end - cfg.bug_growth_start
+        growth_in_range = np.minimum(growth, cfg.bug_growth_end) - np.maximum(prev_growth, cfg.bug_growth_start)
+        candidates = (
+            active & ~self.bug_active
+            & (prev_growth < cfg.bug_growth_end) & (growth >= cfg.bug_growth_start)
+            & (growth_in_range > 0)
+        )
+        if candidates.any():
+            spawn_chance = cfg.bug_appearance_chance * (growth_in_range / window)
+            spawned = candidates & (self._rng.random(len(self)) < spawn_chance)
+            self.bug_active |= spawned
+            self.bug_appearance_time[spawned] = self.clock.now() if now is None else now
+
+        # Stage crossings happen when a threshold lies in (prev_growth, growth]
+        crossed = np.zeros(len(self), dtype=bool)
+        for threshold in (cfg.sprout_at, cfg.plant_at):
+            crossed |= active & (prev_growth < threshold) & (growth >= threshold)
+        return crossed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time PotBatch.step against GameEngine.advance_simulation per pot")
+    parser.add_argument("--pots", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    from growpot.game_logic import GameEngine
+
+    config = dataclasses.replace(GameConfig(), bug_appearance_chance=0.0)
+    plant_types = list(config.PLANT_STATS)
+    pot_types = list(config.POT_STATS)
+
+    print(f"{'pots':>7} {'scalar':>12} {'batch':>12}  (per step)")
+    for pots in args.pots:
+        states = [
+            GameState(growth=(i % 30) / 10, water=(i % 50) / 10,
+                      plant_type=plant_types[i % len(plant_types)], pot_type=pot_types[i % len(pot_types)])
+            for i in range(pots)
+        ]
+        batch = PotBatch.from_states(config, states, seed=0)
+        engine = GameEngine(config)
+
+        started = time.perf_counter()
+        for _ in range(args.steps):
+            for state in states:
+                engine.advance_simulation(state, 0.1, 0.0)
+        scalar_sec = (time.perf_counter() - started) / args.steps
+
+        started = time.perf_counter()
+        for _ in range(args.steps):
+            batch.step(0.1, 0.0)
+        batch_sec = (time.perf_counter() - started) / args.steps
+        print(f"{pots:>7} {scalar_sec * 1000:10.2f}ms {batch_sec * 1000:10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
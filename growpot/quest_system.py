@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig, QuestTemplate
+
+
+# Requirement types quests can track; each one is also a game event type
+REQUIREMENT_TYPES = ("harvest", "sell", "water", "catch_bug", "earn_money")
+
+# plant_type of quests that count any item (and of events that carry none)
+ANY_ITEM = ""
+
+EventHandler = Callable[[GameState, int, str], None]
+
+
+class GameEvents:
+    """Publish/subscribe stream of game events, e.g. ("harvest", amount=1, item="leaf")"""
+
+    def __init__(self):
+        self._handlers: dict[str, list[EventHandler]] = defaultdict(list)
+
+    def subscribe(self, event_type: str, handler: EventHandler):
+        """Call handler(state, amount, item) for every event of this type"""
+        self._handlers[event_type].append(handler)
+
+    def publish(self, state: GameState, event_type: str, amount: int = 1, item: str | None = None):
+        for handler in self._handlers.get(event_type, ()):
+            handler(state, amount, item or ANY_ITEM)
+
+
+@dataclass
+class Quest:
+    """Typed view of one daily quest; progress is written through to the saved quest dict"""
+    id: str
+    requirement_type: str
+    plant_type: str
+    requirement_count: int
+    record: dict  # The entry in state.daily_quests (saved and shown in the UI)
+
+    @classmethod
+    def from_record(cls, record: dict) -> Quest:
+        return cls(
+            id=record["id"],
+            requirement_type=record["requirement_type"],
+            plant_type=record.get("plant_type") or ANY_ITEM,
+            requirement_count=record["requirement_count"],
+            record=record,
+        )
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.requirement_type, self.plant_type
+
+    @property
+    def completed(self) -> bool:
+        return self.record["completed"]
+
+    def advance(self, amount: int) -> bool:
+        """Add progress. Returns True if this completed the quest."""
+        record = self.record
+        record["current_progress"] = min(self.requirement_count, record["current_progress"] + amount)
+        if record["current_progress"] >= self.requirement_count and not record["completed"]:
+            record["completed"] = True
+            return True
+        return False
+
+
+class QuestEngine:
+    """Tracks daily quest progress from game events.
+
+    Open quests are indexed by (requirement_type, plant_type), so an event only touches the quests
+    that count it. The index is rebuilt whenever state.daily_quests is replaced (daily reset, load).
+    """
+
+    def __init__(self, config: GameConfig, events: GameEvents):
+        self.cfg = config
+        self._bound: list[dict] | None = None
+        self._bound_len = 0
+        self._open: dict[tuple[str, str], dict[int, Quest]] = {}
+        self._by_id: dict[str, Quest] = {}
+        for requirement_type in REQUIREMENT_TYPES:
+            events.subscribe(requirement_type, partial(self._on_event, requirement_type))
+
+    def compile(self, template: QuestTemplate) -> dict:
+        """Fresh quest record for a template"""
+        return {
+            "id": template.id,
+            "name": template.name,
+            "description": template.description,
+            "requirement_type": template.requirement_type,
+            "plant_type": template.plant_type,
+            "requirement_count": template.requirement_count,
+            "current_progress": 0,
+            "reward_money": template.reward_money,
+            "completed": False
+        }
+
+    def assign(self, state: GameState, template_ids: list[str]):
+        """Replace the daily quests with fresh instances of the given templates"""
+        state.daily_quests = [self.compile(self.cfg.QUEST_TEMPLATES[template_id]) for template_id in template_ids]
+        self._bind(state)
+
+    def find(self, state: GameState, quest_id: str) -> Quest | None:
+        self._bind(state)
+        return self._by_id.get(quest_id)
+
+    def _bind(self, state: GameState):
+        """Rebuild the index if the quest list is not the one it was built from"""
+        quests = state.daily_quests
+        if quests is self._bound and len(quests) == self._bound_len:
+            return
+
+        self._bound = quests
+        self._bound_len = len(quests)
+        self._open = {}
+        self._by_id = {}
+        for position, record in enumerate(quests):
+            quest = Quest.from_record(record)
+            self._by_id.setdefault(quest.id, quest)
+            if not quest.completed:
+                self._open.setdefault(quest.key, {})[position] = quest
+
+    def _on_event(self, requirement_type: str, state: GameState, amount: int, item: str):
+        self._bind(state)
+        keys = [(requirement_type, ANY_ITEM)]
+        if item != ANY_ITEM:
+            keys.append((requirement_type, item))
+
+        for key in keys:
+            bucket = self._open.get(key)
+            if not bucket:
+                continue
+            for position, quest in list(bucket.items()):
+                if quest.advance(amount):
+                    del bucket[position]
+                    state.completed_quests_today += 1
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+
+DEFAULT_RGBA_CACHE_DIR = Path("frame_cache")
+
+_MAGIC = b"GPRB"
+_VERSION = 1
+# magic, version, width, height, source mtime_ns, source size; RGBA rows follow
+_HEADER = struct.Struct("<4sHxxIIqq")
+
+
+class RGBACache:
+    """Decoded RGBA copies of image files, memory-mapped instead of decoded again.
+
+    Each source gets one file in path (named after a hash of its resolved path) holding the raw
+    RGBA pixels behind a header with the source's mtime and size. A source that changed no longer
+    matches its header and is decoded and written again, so the cache never needs clearing.
+    """
+
+    def __init__(self, path: Path = DEFAULT_RGBA_CACHE_DIR):
+        self.path = path
+
+    def decode(self, source: Path) -> Image.Image:
+        """source as an RGBA image, mapped from the cache when it holds an up-to-date copy"""
+        stat = source.stat()
+        entry = self.path / (hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest() + ".rgba")
+        image = self._read(entry, stat.st_mtime_ns, stat.st_size)
+        if image is None:
+            image = Image.open(source).convert("RGBA")
+            self._write(entry, image, stat.st_mtime_ns, stat.st_size)
+        return image
+
+    @staticmethod
+    def _read(entry: Path, mtime_ns: int, size: int) -> Image.Image | None:
+        try:
+            with entry.open("rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError: empty file
+            return None
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            return None
+        magic, version, width, height, cached_mtime, cached_size = _HEADER.unpack_from(mapped, 0)
+        if (magic != _MAGIC or version != _VERSION or cached_mtime != mtime_ns or cached_size != size
+                or len(mapped) != _HEADER.size + width * height * 4):
+            mapped.close()
+            return None
+        # The image reads straight from the mapping (read-only; Pillow copies it if it is ever modified)
+        return Image.frombuffer("RGBA", (width, height), memoryview(mapped)[_HEADER.size:], "raw", "RGBA", 0, 1)
+
+    def _write(self, entry: Path, image: Image.Image, mtime_ns: int, size: int):
+        # Best effort: without a writable cache directory frames are simply decoded every time
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, image.width, image.height, mtime_ns, size))
+                f.write(image.tobytes())
+            os.replace(tmp_path, entry)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+
+# Used by anim and atlas for every frame decode
+shared_rgba_cache = RGBACache()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time loading every asset set with a cold and a warm RGBA cache")
+    parser.add_argument("assets", type=Path, nargs="?", default=Path("assets"))
+    parser.add_argument("--cache", type=Path, default=Path("frame_cache.bench"))
+    parser.add_argument("--runs", type=int, default=3, help="warm runs (each in a fresh process)")
+    args = parser.parse_args(argv)
+
+    # Each run is a fresh interpreter, as at game startup
+    child = (
+        "import sys, time; from pathlib import Path; started = time.perf_counter()\n"
+        "from growpot import rgba_cache; rgba_cache.shared_rgba_cache.path = Path(sys.argv[2])\n"
+        "from growpot.anim import FrameSetCache; from growpot.atlas import asset_folders\n"
+        "FrameSetCache(1 << 40).load_many(asset_folders(Path(sys.argv[1])))\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    for old in args.cache.glob("*.rgba"):
+        old.unlink()
+    for label, runs in (("cold", 1), ("warm", args.runs)):
+        times = []
+        for _ in range(runs):
+            result = subprocess.run(
+                [sys.executable, "-c", child, str(args.assets), str(args.cache)],
+                check=True, capture_output=True, text=True,
+            )
+            times.append(float(result.stdout))
+        print(f"{label}: {min(times) * 1000:7.1f} ms to load every set in {args.assets}")
+
+
+if __name__ == "__main__":
+    main()
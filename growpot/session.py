@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import random
+
+from growpot.state import GameState
+from growpot.game_config import GameConfig, ShopConfig
+from growpot.ui_config import UIConfig
+from growpot.clock import Clock, SystemClock
+from growpot.journal import InputJournal
+from growpot.ledger import Ledger
+from growpot.game_logic import GameEngine
+from growpot.warehouse_system import WarehouseManager
+from growpot.pet_system import PetManager
+from growpot.shop_system import ShopManager
+from growpot.profile_system import ProfileManager
+
+
+class GameSession:
+    """Game logic for one GameState without any UI: engine, managers and player actions"""
+
+    def __init__(self, config: GameConfig, state: GameState, ui_config: UIConfig | None = None,
+                 clock: Clock | None = None, rng: random.Random | None = None,
+                 journal: InputJournal | None = None, ledger: Ledger | None = None):
+        self.cfg = config
+        self.ui = ui_config or UIConfig()
+        self.state = state
+        self.clock = clock or SystemClock()
+        self.journal = journal
+        self.ledger = ledger
+
+        # Subsystems (the managers only need ui_config to build their windows)
+        self.game_engine = GameEngine(self.cfg, self.clock, rng)
+        self.warehouse_manager = WarehouseManager(self.cfg, self.ui)
+        self.pet_manager = PetManager(self.cfg, self.ui, self.clock)
+        self.shop_manager = ShopManager(self.cfg, self.ui)
+        self.profile_manager = ProfileManager(self.ui)
+
+    def initialize_shop_inventory(self) -> bool:
+        """Give starting seeds and pet food to a new game. Returns True if anything changed."""
+        shop_cfg = ShopConfig()
+
+        # Only initialize if inventories are empty (new game)
+        if not self.state.seed_inventory and self.state.pet_food == 0:
+            self.state.seed_inventory = shop_cfg.initial_seed_stock.copy()
+            self.state.pet_food = shop_cfg.initial_pet_food
+            return True
+        return False
+
+    def tick(self, dt: float, now: float | None = None):
+        """Advance the simulation by dt seconds and let the pet work"""
+        now = self.clock.now() if now is None else now
+        had_bug = self.state.bug_active
+        if dt > self.cfg.tick_ms / 1000.0:
+            # Long sleeps between scheduled events are integrated exactly
+            self.game_engine.advance_offline(self.state, dt, now - dt)
+        else:
+            self.game_engine.advance_simulation(self.state, dt, now)
+        self.game_engine.check_pet_auto_watering(self.state, now)
+        if self.state.bug_active and not had_bug:
+            self._record_at(self.state.bug_appearance_time, "bug_spawn")
+
+    def apply_offline_progress(self, now: float | None = None):
+        """Catch up on the time the app was closed"""
+        now = self.clock.now() if now is None else now
+        offline_from = float(self.state.last_update_ts or now)
+        had_bug = self.state.bug_active
+        self._record_at(now, "resume", offline_from)
+        self.game_engine.apply_offline_progress(self.state, now)
+        if self.state.bug_active and not had_bug:
+            self._record_at(self.state.bug_appearance_time, "bug_spawn")
+
+    def check_daily_quest_reset(self, now: float | None = None) -> bool:
+        """Reroll daily quests after midnight. Returns True if they were reset."""
+        now = self.clock.now() if now is None else now
+        if not self.game_engine.check_daily_quest_reset(self.state, now):
+            return False
+        self._record_at(now, "daily_quests", *(quest["id"] for quest in self.state.daily_quests))
+        return True
+
+    def _record(self, action: str, *args):
+        """Journal a player action at the current time"""
+        if self.journal is not None:
+            self.journal.record(self.clock.now(), action, *args)
+
+    def _record_at(self, timestamp: float, action: str, *args):
+        if self.journal is not None:
+            self.journal.record(timestamp, action, *args)
+
+    def _logged(self, ok: bool, money_before: int, kind: str, item: str, quantity: int, quality: str = "") -> bool:
+        """Add a successful action to the ledger (with its money delta) and pass ok through"""
+        if ok and self.ledger is not None:
+            self.ledger.record(self.clock.now(), kind, item, quantity, self.state.money - money_before, quality)
+        return ok
+
+    # Player actions
+    def water(self):
+        """Water the plant"""
+        self._record("water")
+        self.game_engine.water_plant(self.state)
+
+    def harvest(self) -> tuple[int, str]:
+        """Harvest into the inventory and award EXP. Returns the yield amount and quality."""
+        self._record("harvest")
+        yield_amount, quality = self.game_engine.harvest_plant(self.state)
+        if yield_amount > 0:
+            # Add to inventory
+            if self.state.plant_type not in self.state.inventory:
+                self.state.inventory[self.state.plant_type] = 0
+            self.state.inventory[self.state.plant_type] += yield_amount
+
+            # Update harvested_count for backward compatibility
+            self.state.harvested_count += yield_amount
+
+            # Award EXP for harvesting
+            plant_stats = self.cfg.PLANT_STATS[self.state.plant_type]
+            self.profile_manager.add_exp(self.state, plant_stats.harvest_exp_reward)
+            self._logged(True, self.state.money, "harvest", self.state.plant_type, yield_amount, quality)
+        return yield_amount, quality
+
+    def reset(self):
+        """Reset the plant"""
+        self._record("reset")
+        self.game_engine.reset_plant(self.state)
+
+    def plant_seed(self, plant_type: str) -> bool:
+        """Plant a seed from the seed inventory"""
+        self._record("plant_seed", plant_type)
+
+        # Check if planting is allowed (pot must be empty)
+        if not self.game_engine.can_plant_seed(self.state):
+            return False  # Cannot plant on occupied pot
+
+        # Check if player has seeds in inventory
+        current_stock = self.state.seed_inventory.get(plant_type, 0)
+        if current_stock <= 0:
+            return False  # No seeds available, cannot plant
+
+        # Check if player level meets unlock requirement
+        plant_stats = self.cfg.PLANT_STATS[plant_type]
+        if self.state.level < plant_stats.unlock_level:
+            return False  # Player level too low, cannot plant
+
+        # Use existing seeds (these get consumed)
+        self.state.seed_inventory[plant_type] -= 1
+        if self.state.seed_inventory[plant_type] == 0:
+            del self.state.seed_inventory[plant_type]
+
+        return self.game_engine.plant_seed(self.state, plant_type)
+
+    def change_pot(self, pot_type: str) -> bool:
+        """Switch to another unlocked pot"""
+        self._record("change_pot", pot_type)
+        return self.game_engine.change_pot(self.state, pot_type)
+
+    def unlock_pot(self, pot_type: str, cost: int) -> bool:
+        """Unlock a pot"""
+        self._record("unlock_pot", pot_type, cost)
+        money = self.state.money
+        ok = self.game_engine.unlock_pot(self.state, pot_type, cost)
+        return self._logged(ok, money, "unlock_pot", pot_type, 1)
+
+    def sell(self, plant_type: str, quantity: int, price_per_item: int) -> bool:
+        """Sell items from the warehouse"""
+        self._record("sell", plant_type, quantity, price_per_item)
+        money = self.state.money
+        if not self.warehouse_manager.sell_items_transaction(self.state, plant_type, quantity, price_per_item):
+            return False
+        self._logged(True, money, "sell", plant_type, quantity)
+        self.game_engine.update_quest_progress(self.state, "sell", quantity, plant_type)
+        self.game_engine.update_quest_progress(self.state, "earn_money", quantity * price_per_item)
+        return True
+
+    def buy_pet_food(self, quantity: int, cost: int) -> bool:
+        """Buy pet food"""
+        self._record("buy_pet_food", quantity, cost)
+        money = self.state.money
+        ok = self.shop_manager.buy_pet_food_transaction(self.state, quantity, cost)
+        return self._logged(ok, money, "buy_pet_food", "pet_food", quantity)
+
+    def buy_net(self, quantity: int, cost: int) -> bool:
+        """Buy nets"""
+        self._record("buy_net", quantity, cost)
+        money = self.state.money
+        ok = self.shop_manager.buy_net_transaction(self.state, quantity, cost)
+        return self._logged(ok, money, "buy_net", "net", quantity)
+
+    def buy_seeds(self, plant_type: str, quantity: int, cost: int) -> bool:
+        """Buy seeds"""
+        self._record("buy_seeds", plant_type, quantity, cost)
+        money = self.state.money
+        ok = self.shop_manager.buy_seeds_transaction(self.state, plant_type, quantity, cost)
+        return self._logged(ok, money, "buy_seeds", plant_type, quantity)
+
+    def buy_pot(self, pot_type: str, cost: int) -> bool:
+        """Buy a pot"""
+        self._record("buy_pot", pot_type, cost)
+        money = self.state.money
+        ok = self.shop_manager.buy_pot_transaction(self.state, pot_type, cost)
+        return self._logged(ok, money, "buy_pot", pot_type, 1)
+
+    def buy_pet(self, pet_type: str, cost: int) -> bool:
+        """Buy a pet"""
+        self._record("buy_pet", pet_type, cost)
+        money = self.state.money
+        ok = self.shop_manager.buy_pet_transaction(self.state, pet_type, cost)
+        return self._logged(ok, money, "buy_pet", pet_type, 1)
+
+    def feed_pet(self) -> bool:
+        """Feed the active pet"""
+        self._record("feed_pet")
+        return self.pet_manager.feed_pet_transaction(self.state)
+
+    def activate_pet(self, pet_type: str) -> bool:
+        """Activate a pet"""
+        self._record("activate_pet", pet_type)
+        return self.pet_manager.activate_pet_transaction(self.state, pet_type)
+
+    def deactivate_pet(self) -> bool:
+        """Deactivate the active pet"""
+        self._record("deactivate_pet")
+        return self.pet_manager.deactivate_pet_transaction(self.state)
+
+    def unlock_pet(self, pet_type: str, cost: int) -> bool:
+        """Unlock a pet"""
+        self._record("unlock_pet", pet_type, cost)
+        money = self.state.money
+        ok = self.pet_manager.unlock_pet_transaction(self.state, pet_type, cost)
+        return self._logged(ok, money, "unlock_pet", pet_type, 1)
+
+    def catch_bug(self) -> bool:
+        """Catch the active bug with a net"""
+        self._record("catch_bug")
+        money = self.state.money
+        ok = self.game_engine.catch_bug(self.state)
+        return self._logged(ok, money, "catch_bug", "bug", 1)
+
+    def claim_quest(self, quest_id: str) -> bool:
+        """Claim the reward of a completed quest"""
+        self._record("claim_quest", quest_id)
+        money = self.state.money
+        ok = self.game_engine.complete_quest(self.state, quest_id)
+        return self._logged(ok, money, "quest_reward", quest_id, 1)
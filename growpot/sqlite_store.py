@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from growpot.state import GameState, load_state, save_state
+
+
+DEFAULT_DB_FILE = Path("profiles.db")
+
+# GameState fields kept in child tables; every other field is a column of the profiles table
+_COUNT_TABLES = {"inventory": "inventory", "seed_inventory": "seed_inventory"}
+_NAME_TABLES = {"unlocked_pots": "unlocked_pots", "unlocked_pets": "unlocked_pets"}
+_QUEST_COLUMNS = (
+    "id", "name", "description", "requirement_type", "plant_type",
+    "requirement_count", "current_progress", "reward_money", "completed", "claimed",
+)
+# Quest keys outside _QUEST_COLUMNS are kept as a JSON object in daily_quests.extra
+_SQL_TYPES = {"float": "REAL", "int": "INTEGER", "bool": "INTEGER", "str": "TEXT"}
+
+_SCALAR_FIELDS = [
+    field for field in dataclasses.fields(GameState)
+    if field.name not in _COUNT_TABLES and field.name not in _NAME_TABLES and field.name != "daily_quests"
+]
+_BOOL_FIELDS = [field.name for field in _SCALAR_FIELDS if field.type == "bool"]
+_SCALAR_NAMES = [field.name for field in _SCALAR_FIELDS]
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS profiles (profile_id INTEGER PRIMARY KEY, profile_name TEXT NOT NULL UNIQUE)",
+    *(
+        f"""CREATE TABLE IF NOT EXISTS {table} (
+            profile_id INTEGER NOT NULL REFERENCES profiles(profile_id) ON DELETE CASCADE,
+            item TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (profile_id, item)
+        ) WITHOUT ROWID"""
+        for table in _COUNT_TABLES.values()
+    ),
+    *(
+        f"""CREATE TABLE IF NOT EXISTS {table} (
+            profile_id INTEGER NOT NULL REFERENCES profiles(profile_id) ON DELETE CASCADE,
+            item TEXT NOT NULL,
+            PRIMARY KEY (profile_id, item)
+        ) WITHOUT ROWID"""
+        for table in _NAME_TABLES.values()
+    ),
+    """CREATE TABLE IF NOT EXISTS daily_quests (
+        profile_id INTEGER NOT NULL REFERENCES profiles(profile_id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        quest_id TEXT NOT NULL,
+        name TEXT, description TEXT, requirement_type TEXT NOT NULL, plant_type TEXT,
+        requirement_count INTEGER NOT NULL, current_progress INTEGER NOT NULL, reward_money INTEGER NOT NULL,
+        completed INTEGER NOT NULL, claimed INTEGER, extra TEXT,
+        PRIMARY KEY (profile_id, position)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS daily_quests_by_type ON daily_quests (profile_id, requirement_type, plant_type)",
+]
+
+
+def _quest_extra(quest: dict) -> str | None:
+    """JSON of the quest's keys that have no column, or None if it has none"""
+    extra = {key: value for key, value in quest.items() if key not in _QUEST_COLUMNS}
+    return json.dumps(extra, separators=(",", ":")) if extra else None
+
+
+class SQLiteStateStore:
+    """Many named GameStates in one SQLite database (WAL mode).
+
+    Scalar fields are columns of a profiles table, looked up through the unique index on the
+    profile name; inventories, unlocked pots/pets and quests live in child tables keyed by
+    (profile_id, ...). Each thread gets its own connection, so readers run alongside the writer.
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            # Columns for scalar fields, including ones GameState gained since the database was made
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(profiles)")}
+            for field in _SCALAR_FIELDS:
+                if field.name not in existing:
+                    sql_type = _SQL_TYPES.get(field.type.split(" |")[0], "")
+                    conn.execute(f"ALTER TABLE profiles ADD COLUMN {field.name} {sql_type}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def save(self, name: str, state: GameState):
+        self.save_many([(name, state)])
+
+    def save_many(self, profiles: Iterable[tuple[str, GameState]]):
+        """Write several profiles in one transaction"""
+        conn = self._conn()
+        columns = ", ".join(_SCALAR_NAMES)
+        placeholders = ", ".join("?" for _ in _SCALAR_NAMES)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in _SCALAR_NAMES)
+        upsert = (
+            f"INSERT INTO profiles (profile_name, {columns}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(profile_name) DO UPDATE SET {updates} RETURNING profile_id"
+        )
+
+        with conn:
+            for name, state in profiles:
+                values = [getattr(state, field) for field in _SCALAR_NAMES]
+                (profile_id,) = conn.execute(upsert, [name, *values]).fetchone()
+
+                for field, table in _COUNT_TABLES.items():
+                    conn.execute(f"DELETE FROM {table} WHERE profile_id = ?", (profile_id,))
+                    conn.executemany(
+                        f"INSERT INTO {table} (profile_id, item, quantity) VALUES (?, ?, ?)",
+                        [(profile_id, item, quantity) for item, quantity in getattr(state, field).items()],
+                    )
+                for field, table in _NAME_TABLES.items():
+                    conn.execute(f"DELETE FROM {table} WHERE profile_id = ?", (profile_id,))
+                    conn.executemany(
+                        f"INSERT INTO {table} (profile_id, item) VALUES (?, ?)",
+                        [(profile_id, item) for item in getattr(state, field)],
+                    )
+                conn.execute("DELETE FROM daily_quests WHERE profile_id = ?", (profile_id,))
+                conn.executemany(
+                    "INSERT INTO daily_quests (profile_id, position, quest_id, "
+                    f"{', '.join(_QUEST_COLUMNS[1:])}, extra) VALUES (?, ?, {', '.join('?' for _ in _QUEST_COLUMNS)}, ?)",
+                    [
+                        (profile_id, position, *(quest.get(column) for column in _QUEST_COLUMNS), _quest_extra(quest))
+                        for position, quest in enumerate(state.daily_quests)
+                    ],
+                )
+
+    def load(self, name: str) -> GameState | None:
+        """Load one profile by name, or None if there is no such profile"""
+        conn = self._conn()
+        # One read transaction, so the profile is never seen half-written
+        with conn:
+            conn.execute("BEGIN")
+            cursor = conn.execute(
+                f"SELECT profile_id, {', '.join(_SCALAR_NAMES)} FROM profiles WHERE profile_name = ?", (name,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            profile_id, *values = row
+            fields = dict(zip(_SCALAR_NAMES, values))
+            for field in _BOOL_FIELDS:
+                fields[field] = bool(fields[field])
+
+            for field, table in _COUNT_TABLES.items():
+                fields[field] = dict(conn.execute(
+                    f"SELECT item, quantity FROM {table} WHERE profile_id = ?", (profile_id,)
+                ))
+            for field, table in _NAME_TABLES.items():
+                fields[field] = {item for (item,) in conn.execute(
+                    f"SELECT item FROM {table} WHERE profile_id = ?", (profile_id,)
+                )}
+            quests = []
+            for quest_row in conn.execute(
+                f"SELECT quest_id, {', '.join(_QUEST_COLUMNS[1:])}, extra FROM daily_quests "
+                "WHERE profile_id = ? ORDER BY position", (profile_id,)
+            ):
+                *columns, extra = quest_row
+                quest = dict(zip(_QUEST_COLUMNS, columns))
+                if extra is not None:
+                    quest.update(json.loads(extra))
+                quest["completed"] = bool(quest["completed"])
+                if quest["claimed"] is None:
+                    del quest["claimed"]
+                else:
+                    quest["claimed"] = bool(quest["claimed"])
+                quests.append(quest)
+            fields["daily_quests"] = quests
+        return GameState(**fields)
+
+    def list_profiles(self) -> list[str]:
+        return [name for (name,) in self._conn().execute("SELECT profile_name FROM profiles ORDER BY profile_name")]
+
+    def delete(self, name: str) -> bool:
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM profiles WHERE profile_name = ?", (name,)).rowcount > 0
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage growpot profiles in a SQLite database")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list profile names")
+    import_cmd = commands.add_parser("import", help="store a state file as a profile")
+    import_cmd.add_argument("name")
+    import_cmd.add_argument("state", type=Path)
+    export_cmd = commands.add_parser("export", help="write a profile out as a state file")
+    export_cmd.add_argument("name")
+    export_cmd.add_argument("state", type=Path)
+    args = parser.parse_args(argv)
+
+    store = SQLiteStateStore(args.db)
+    if args.command == "list":
+        for name in store.list_profiles():
+            print(name)
+    elif args.command == "import":
+        store.save(args.name, load_state(args.state))
+    elif args.command == "export":
+        state = store.load(args.name)
+        if state is None:
+            raise SystemExit(f"no profile named {args.name!r}")
+        save_state(state, args.state)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
 import time
-from dataclasses import asdict, dataclass
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
 
+from growpot.state_codec import LegacyCount, build_codec
+
 
 @dataclass
 class GameState:
@@ -76,11 +80,62 @@ class GameState:
 
 DEFAULT_STATE_FILE = Path("state.json")
 
+# Key in a snapshot naming the delta log that continues it
+_LOG_ID_KEY = "_log_id"
+
 
 def now_ts() -> float:
     return time.time()
 
 
+# Load/save code generated from the GameState annotations. Keys a save does not have get the
+# dataclass defaults except where listed here; keys GameState does not have are ignored.
+_codec = build_codec(
+    GameState,
+    missing={
+        "last_update_ts": now_ts,
+        "plant_type": lambda: "basic",
+    },
+    legacy=(
+        # Saves from before the inventory only counted harvests; treat them as "basic" plants
+        LegacyCount(source="harvested_count", target="inventory", key="basic"),
+    ),
+)
+
+
+def state_log_path(path: Path = DEFAULT_STATE_FILE) -> Path:
+    """Delta log that belongs to a snapshot file"""
+    return path.with_name(path.name + ".log")
+
+
+def _read_log_tail(path: Path, log_id: str | None) -> list[dict]:
+    """Deltas appended after the snapshot with this log id (stops at a torn last line)"""
+    log_path = state_log_path(path)
+    if log_id is None or not log_path.exists():
+        return []
+
+    deltas = []
+    with log_path.open("rb") as f:
+        for i, line in enumerate(f):
+            if not line.endswith(b"\n"):
+                break  # Cut short by a crash
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if i == 0:
+                if entry.get(_LOG_ID_KEY) != log_id:
+                    return []  # Log of an older snapshot
+                continue
+            deltas.append(entry)
+    return deltas
+
+
+def state_from_dict(data: dict) -> GameState:
+    """Build a GameState from saved data, filling in defaults for missing fields"""
+    return _codec.decode(data)
+
+
 def load_state(path: Path = DEFAULT_STATE_FILE) -> GameState:
     if not path.exists():
         return GameState(last_update_ts=now_ts())
@@ -88,61 +143,111 @@ def load_state(path: Path = DEFAULT_STATE_FILE) -> GameState:
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
 
-        # Load inventory, migrating old harvested_count if needed
-        inventory = data.get("inventory", {})
-        harvested_count = int(data.get("harvested_count", 0))
-
-        # Migrate existing harvested_count to inventory if not already done
-        # We'll assume they were "basic" plants for migration purposes
-        if harvested_count > 0 and not inventory:
-            inventory["basic"] = harvested_count
-
-        return GameState(
-            growth=float(data.get("growth", 0.0)),
-            water=float(data.get("water", 0.0)),
-            growth_water_deficit=float(data.get("growth_water_deficit", 0.0)),
-            water_ever_depleted=bool(data.get("water_ever_depleted", False)),
-            x=data.get("x"),
-            y=data.get("y"),
-            last_update_ts=float(data.get("last_update_ts", now_ts())),
-            pot_type=data.get("pot_type", "earth"),
-            plant_type=data.get("plant_type", "basic"),
-            harvested_count=harvested_count,  # Keep for backward compatibility
-            last_harvest_ts=float(data.get("last_harvest_ts", 0.0)),
-            money=int(data.get("money", 0)),
-            inventory=inventory,
-            seed_inventory=data.get("seed_inventory", {}),
-            unlocked_pots=set(data.get("unlocked_pots", ["earth"])),
-            active_pet=data.get("active_pet"),
-            pet_last_fed_ts=float(data.get("pet_last_fed_ts", 0.0)),
-            pet_last_worked_ts=float(data.get("pet_last_worked_ts", 0.0)),
-            pet_food=int(data.get("pet_food", 0)),
-            unlocked_pets=set(data.get("unlocked_pets", [])),
-            bug_active=bool(data.get("bug_active", False)),
-            bug_appearance_time=float(data.get("bug_appearance_time", 0.0)),
-            net_quantity=int(data.get("net_quantity", 0)),
-            daily_quests=data.get("daily_quests", []),
-            quest_last_reset_ts=float(data.get("quest_last_reset_ts", 0.0)),
-            completed_quests_today=int(data.get("completed_quests_today", 0)),
-            player_name=data.get("player_name", "Player"),
-            level=int(data.get("level", 1)),
-            exp=int(data.get("exp", 0)),
-            avatar=data.get("avatar", "👤"),
-        )
+        # Replay field changes logged since the snapshot
+        for delta in _read_log_tail(path, data.get(_LOG_ID_KEY)):
+            data.update(delta)
+
+        return state_from_dict(data)
     except Exception:
         # If state is corrupt, start fresh.
         return GameState(last_update_ts=now_ts())
 
 
+def state_to_dict(state: GameState) -> dict:
+    """JSON-ready copy of the state (safe to hand to another thread)"""
+    return _codec.snapshot(state)
+
+
+def write_state_data(data: dict, path: Path = DEFAULT_STATE_FILE):
+    """Write through a temp file and rename, so a crash never leaves a half-written save"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def save_state(state: GameState, path: Path = DEFAULT_STATE_FILE) -> bool:
     try:
-        data = asdict(state)
-        # Convert sets to list for JSON serialization
-        if "unlocked_pots" in data and isinstance(data["unlocked_pots"], set):
-            data["unlocked_pots"] = list(data["unlocked_pots"])
-        if "unlocked_pets" in data and isinstance(data["unlocked_pets"], set):
-            data["unlocked_pets"] = list(data["unlocked_pets"])
-        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        write_state_data(_codec.encode(state), path)
+        # A full save supersedes any delta log (which no longer matches the snapshot anyway)
+        state_log_path(path).unlink(missing_ok=True)
         return True
     except Exception:
         return False
+
+
+class StateLog:
+    """Write-ahead log of field-level changes on top of a full JSON snapshot.
+
+    write() appends only the fields that changed since the previous write as one JSON line; once
+    the log grows past compact_bytes it is folded into a fresh snapshot. The log starts with the id
+    of the snapshot it continues, so a crash between writing a snapshot and truncating the log
+    cannot replay stale values. fsync is "always" (every write), "interval" (at most once per
+    fsync_interval seconds) or "never" (left to the OS).
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
+
+    def __init__(self, path: Path = DEFAULT_STATE_FILE, fsync: str = "interval",
+                 fsync_interval: float = 1.0, compact_bytes: int = 64 * 1024):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {self.FSYNC_POLICIES}, got {fsync!r}")
+        self.path = path
+        self.log_path = state_log_path(path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+
+        self._last: dict | None = None  # State as of the last write
+        self._log = None
+        self._log_size = 0
+        self._last_fsync = 0.0
+
+    def write(self, data: dict):
+        """Persist a state_to_dict snapshot, appending only what changed"""
+        if self._last is None or self._log_size >= self.compact_bytes:
+            self.compact(data)
+            return
+
+        delta = {name: value for name, value in data.items() if self._last.get(name) != value}
+        if not delta:
+            return
+        self._append(delta)
+        self._last = data
+
+    def compact(self, data: dict):
+        """Write a full snapshot and start a new, empty log for it"""
+        self.close()
+        log_id = uuid.uuid4().hex
+        snapshot = dict(data)
+        snapshot[_LOG_ID_KEY] = log_id
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot, indent=2))
+            if self.fsync != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self._log = self.log_path.open("wb")
+        self._log_size = 0
+        self._append({_LOG_ID_KEY: log_id})
+        self._last = data
+
+    def close(self):
+        if self._log is not None:
+            if self.fsync != "never":
+                os.fsync(self._log.fileno())
+            self._log.close()
+            self._log = None
+
+    def _append(self, entry: dict):
+        line = json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+        self._log.write(line)
+        self._log.flush()
+        self._log_size += len(line)
+
+        now = time.monotonic()
+        if self.fsync == "always" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._log.fileno())
+            self._last_fsync = now
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable
+
+from growpot.state import GameState, load_state, now_ts, save_state
+
+
+DEFAULT_BINARY_STATE_FILE = Path("state.bin")
+
+MAGIC = b"GPS"
+SCHEMA_VERSION = 1
+_HEADER = struct.Struct("<3sH")  # magic, schema version
+_LEN = struct.Struct("<I")
+_NONE_LEN = 0xFFFFFFFF  # Length of an optional string that is None
+
+# GameState field layout per schema version. Kinds:
+#   f float, i int, b bool, oi int or None (all packed into one fixed struct after the header)
+#   s str, os str or None, counts dict[str, int], names set[str], records list[dict] (length-prefixed)
+# Old layouts stay here so old saves keep loading. When GameState changes, add a new version and,
+# if fields were renamed or changed meaning, a migration from the previous one.
+LAYOUTS: dict[int, tuple[tuple[str, str], ...]] = {
+    1: (
+        ("growth", "f"),
+        ("water", "f"),
+        ("growth_water_deficit", "f"),
+        ("water_ever_depleted", "b"),
+        ("x", "oi"),
+        ("y", "oi"),
+        ("last_update_ts", "f"),
+        ("pot_type", "s"),
+        ("plant_type", "s"),
+        ("harvested_count", "i"),
+        ("last_harvest_ts", "f"),
+        ("money", "i"),
+        ("inventory", "counts"),
+        ("seed_inventory", "counts"),
+        ("unlocked_pots", "names"),
+        ("active_pet", "os"),
+        ("pet_last_fed_ts", "f"),
+        ("pet_last_worked_ts", "f"),
+        ("pet_food", "i"),
+        ("unlocked_pets", "names"),
+        ("bug_active", "b"),
+        ("bug_appearance_time", "f"),
+        ("net_quantity", "i"),
+        ("daily_quests", "records"),
+        ("quest_last_reset_ts", "f"),
+        ("completed_quests_today", "i"),
+        ("player_name", "s"),
+        ("level", "i"),
+        ("exp", "i"),
+        ("avatar", "s"),
+    ),
+}
+
+# MIGRATIONS[v] turns data decoded with schema v into schema v + 1
+MIGRATIONS: dict[int, Callable[[dict], dict]] = {}
+
+_SCALAR_CODES = {"f": "d", "i": "q", "b": "?", "oi": "q"}
+_RECORDS_JSON = b"j"  # Records that hold nested values: plain JSON
+_RECORDS_COLUMNS = b"c"  # Flat records: one index column per key into a shared table of distinct values
+
+
+class _Layout:
+    """A schema version compiled into one scalar struct plus an ordered list of sections"""
+
+    def __init__(self, fields: tuple[tuple[str, str], ...]):
+        self.scalars = [(name, kind) for name, kind in fields if kind in _SCALAR_CODES]
+        self.sections = [(name, kind) for name, kind in fields if kind not in _SCALAR_CODES]
+        # Bit mask of which optional scalars are present, then the scalars themselves
+        self.struct = struct.Struct("<Q" + "".join(_SCALAR_CODES[kind] for _, kind in self.scalars))
+
+
+_COMPILED = {version: _Layout(fields) for version, fields in LAYOUTS.items()}
+
+
+def _encode_str(value: str | None) -> bytes:
+    if value is None:
+        return _LEN.pack(_NONE_LEN)
+    data = value.encode("utf-8")
+    return _LEN.pack(len(data)) + data
+
+
+def _decode_str(buf: bytes, offset: int) -> tuple[str | None, int]:
+    (length,) = _LEN.unpack_from(buf, offset)
+    offset += _LEN.size
+    if length == _NONE_LEN:
+        return None, offset
+    return buf[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _encode_str_list(values: Iterable[str]) -> bytes:
+    """Count, then each string length-prefixed, so any string (even "") survives"""
+    encoded = [_encode_str(value) for value in values]
+    return _LEN.pack(len(encoded)) + b"".join(encoded)
+
+
+def _decode_str_list(buf: bytes, offset: int) -> tuple[list[str], int]:
+    (count,) = _LEN.unpack_from(buf, offset)
+    offset += _LEN.size
+    values = []
+    for _ in range(count):
+        value, offset = _decode_str(buf, offset)
+        values.append(value)
+    return values, offset
+
+
+def _decode_int_values(buf: bytes, offset: int, count: int) -> tuple[array, int]:
+    values = array("q")
+    values.frombytes(buf[offset:offset + count * values.itemsize])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, offset + count * values.itemsize
+
+
+def _encode_counts(counts: dict[str, int]) -> bytes:
+    values = array("q", counts.values())
+    if sys.byteorder != "little":
+        values.byteswap()
+    return _encode_str_list(counts) + values.tobytes()
+
+
+def _decode_counts(buf: bytes, offset: int) -> tuple[dict[str, int], int]:
+    keys, offset = _decode_str_list(buf, offset)
+    values, offset = _decode_int_values(buf, offset, len(keys))
+    return dict(zip(keys, values)), offset
+
+
+def _encode_names(names: set[str]) -> bytes:
+    return _encode_str_list(sorted(names))
+
+
+def _decode_names(buf: bytes, offset: int) -> tuple[set[str], int]:
+    names, offset = _decode_str_list(buf, offset)
+    return set(names), offset
+
+
+def _encode_json(value) -> bytes:
+    return _encode_str(json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+
+
+def _decode_json(buf: bytes, offset: int) -> tuple[object, int]:
+    text, offset = _decode_str(buf, offset)
+    return json.loads(text), offset
+
+
+def _encode_records(records: list[dict]) -> bytes:
+    keys = list(dict.fromkeys(key for record in records for key in record))
+    table: list = []
+    table_index: dict[tuple, int] = {}
+    missing = object()
+    columns = []
+    for key in keys:
+        # Index 0 marks a record without this key, so table entries start at 1
+        column = array("I")
+        for record in records:
+            value = record.get(key, missing)
+            if value is missing:
+                column.append(0)
+                continue
+            if isinstance(value, (dict, list)):
+                return _RECORDS_JSON + _encode_json(records)
+            # Keyed by type too, so True and 1 stay distinct
+            index = table_index.setdefault((type(value), value), len(table) + 1)
+            if index > len(table):
+                table.append(value)
+            column.append(index)
+        if sys.byteorder != "little":
+            column.byteswap()
+        columns.append(column.tobytes())
+
+    return b"".join([
+        _RECORDS_COLUMNS,
+        _LEN.pack(len(records)),
+        _encode_str_list(keys),
+        _encode_json(table),
+        *columns,
+    ])
+
+
+def _decode_records(buf: bytes, offset: int) -> tuple[list[dict], int]:
+    kind = buf[offset:offset + 1]
+    offset += 1
+    if kind == _RECORDS_JSON:
+        return _decode_json(buf, offset)
+
+    (count,) = _LEN.unpack_from(buf, offset)
+    keys, offset = _decode_str_list(buf, offset + _LEN.size)
+    values, offset = _decode_json(buf, offset)
+    if not keys:
+        return [{} for _ in range(count)], offset
+
+    missing = object()
+    table = [missing] + values
+    columns = []
+    for _ in keys:
+        column = array("I")
+        column.frombytes(buf[offset:offset + count * column.itemsize])
+        if sys.byteorder != "little":
+            column.byteswap()
+        offset += count * column.itemsize
+        columns.append(list(map(table.__getitem__, column)))
+
+    records = [dict(zip(keys, row)) for row in zip(*columns)]
+    if any(missing in column for column in columns):
+        records = [{key: value for key, value in record.items() if value is not missing} for record in records]
+    return records, offset
+
+
+_SECTION_CODECS = {
+    "s": (_encode_str, _decode_str),
+    "os": (_encode_str, _decode_str),
+    "counts": (_encode_counts, _decode_counts),
+    "names": (_encode_names, _decode_names),
+    "records": (_encode_records, _decode_records),
+}
+
+
+def encode_state(state: GameState) -> bytes:
+    """Encode with the current schema"""
+    layout = _COMPILED[SCHEMA_VERSION]
+    present = 0
+    scalars = []
+    for bit, (name, kind) in enumerate(layout.scalars):
+        value = getattr(state, name)
+        if kind == "oi":
+            if value is None:
+                value = 0
+            else:
+                present |= 1 << bit
+        scalars.append(value)
+
+    parts = [_HEADER.pack(MAGIC, SCHEMA_VERSION), layout.struct.pack(present, *scalars)]
+    for name, kind in layout.sections:
+        parts.append(_SECTION_CODECS[kind][0](getattr(state, name)))
+    return b"".join(parts)
+
+
+def decode_state_data(buf: bytes) -> dict:
+    """Decode into a dict of fields, migrated to the current schema"""
+    magic, version = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("not a growpot binary save")
+    if version not in _COMPILED:
+        raise ValueError(f"unsupported save schema version {version} (this build reads up to {SCHEMA_VERSION})")
+
+    layout = _COMPILED[version]
+    present, *scalars = layout.struct.unpack_from(buf, _HEADER.size)
+    data = {}
+    for bit, ((name, kind), value) in enumerate(zip(layout.scalars, scalars)):
+        if kind == "oi" and not (present >> bit) & 1:
+            value = None
+        data[name] = value
+
+    offset = _HEADER.size + layout.struct.size
+    for name, kind in layout.sections:
+        data[name], offset = _SECTION_CODECS[kind][1](buf, offset)
+    return migrate(data, version)
+
+
+def migrate(data: dict, version: int) -> dict:
+    """Run the migration chain from version up to SCHEMA_VERSION"""
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+    return data
+
+
+def decode_state(buf: bytes) -> GameState:
+    return GameState(**decode_state_data(buf))
+
+
+def is_binary_save(path: Path) -> bool:
+    with path.open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_state_binary(state: GameState, path: Path = DEFAULT_BINARY_STATE_FILE) -> bool:
+    try:
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(encode_state(state))
+        os.replace(tmp_path, path)
+        return True
+    except Exception:
+        return False
+
+
+def load_state_binary(path: Path = DEFAULT_BINARY_STATE_FILE) -> GameState:
+    if not path.exists():
+        return GameState(last_update_ts=now_ts())
+
+    try:
+        return decode_state(path.read_bytes())
+    except Exception:
+        # If state is corrupt, start fresh.
+        return GameState(last_update_ts=now_ts())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert a growpot save between JSON and the binary format")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("dest", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.source.exists() and is_binary_save(args.source):
+        state = load_state_binary(args.source)
+    else:
+        state = load_state(args.source)
+
+    if args.dest.suffix == ".json":
+        ok = save_state(state, args.dest)
+    else:
+        ok = save_state_binary(state, args.dest)
+    if not ok:
+        raise SystemExit(f"could not write {args.dest}")
+    print(f"{args.source} -> {args.dest} ({args.dest.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+# How a value of each annotated type is decoded from JSON data, and encoded for JSON without copying
+# (as-is unless listed). {v} is the raw value.
+_DECODE = {
+    "float": "float({v})",
+    "int": "int({v})",
+    "bool": "bool({v})",
+    "str": "{v}",
+    "set[str]": "set({v})",
+    "dict[str, int]": "{v}",
+    "list[dict]": "{v}",
+}
+_ENCODE = {
+    "set[str]": "list({v})",
+}
+# Snapshot encoding: every container is copied so the result can be handed to another thread
+_SNAPSHOT = {
+    "set[str]": "list({v})",
+    "dict[str, int]": "dict({v})",
+    "list[dict]": "[dict(item) for item in {v}]",
+}
+
+
+@dataclass(frozen=True)
+class LegacyCount:
+    """Old saves counted `source`; seed dict field `target` with {key: source} when it is empty"""
+    source: str
+    target: str
+    key: str
+
+
+@dataclass
+class Codec:
+    decode: Callable[[dict], object]  # JSON data -> instance; unknown keys are ignored
+    encode: Callable[[object], dict]  # instance -> JSON-ready dict sharing the instance's containers
+    snapshot: Callable[[object], dict]  # instance -> JSON-ready dict with copied containers
+    source: str  # The generated code, for debugging
+
+
+def build_codec(cls, missing: dict[str, Callable[[], object]] | None = None,
+                legacy: tuple[LegacyCount, ...] = ()) -> Codec:
+    """Generate a decoder and encoders for a dataclass from its field annotations.
+
+    missing overrides the value used for absent keys (a factory), where it should differ from the
+    dataclass default. Annotations are read as strings, so the supported forms are the keys of
+    _DECODE, optionally with "| None".
+    """
+    missing = missing or {}
+    namespace: dict = {"cls": cls, "missing": missing}
+    decode_lines = ["def decode(data):", "    get = data.get"]
+    encode_items = []
+    snapshot_items = []
+    kwargs = []
+
+    for field in dataclasses.fields(cls):
+        name = field.name
+        type_name = field.type
+        optional = type_name.endswith(" | None")
+        if optional:
+            type_name = type_name[: -len(" | None")]
+        if type_name not in _DECODE:
+            raise TypeError(f"{cls.__name__}.{name}: no codec for annotation {field.type!r}")
+
+        if name in missing:
+            default = f"missing[{name!r}]()"
+        elif field.default is not dataclasses.MISSING:
+            namespace[f"default_{name}"] = field.default
+            default = f"default_{name}"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"factory_{name}"] = field.default_factory
+            default = f"factory_{name}()"
+        else:
+            raise TypeError(f"{cls.__name__}.{name}: field needs a default to be decoded from partial data")
+
+        converted = _DECODE[type_name].format(v="v")
+        decode_lines.append(f"    v = get({name!r})")
+        decode_lines.append(f"    {name} = {default} if v is None else {converted}")
+        kwargs.append(f"{name}={name}")
+
+        attr = f"state.{name}"
+        plain = _ENCODE.get(type_name, "{v}").format(v=attr)
+        copied = _SNAPSHOT.get(type_name, "{v}").format(v=attr)
+        if optional and plain != attr:
+            plain = f"None if {attr} is None else {plain}"
+        if optional and copied != attr:
+            copied = f"None if {attr} is None else {copied}"
+        encode_items.append(f"        {name!r}: {plain},")
+        snapshot_items.append(f"        {name!r}: {copied},")
+
+    for rule in legacy:
+        decode_lines.append(f"    if not {rule.target}:")
+        decode_lines.append(f"        v = int(get({rule.source!r}) or 0)")
+        decode_lines.append("        if v > 0:")
+        decode_lines.append(f"            {rule.target} = {{{rule.key!r}: v}}")
+
+    decode_lines.append(f"    return cls({', '.join(kwargs)})")
+    source = "\n".join([
+        *decode_lines,
+        "",
+        "def encode(state):",
+        "    return {",
+        *encode_items,
+        "    }",
+        "",
+        "def snapshot(state):",
+        "    return {",
+        *snapshot_items,
+        "    }",
+        "",
+    ])
+    exec(compile(source, f"<{cls.__name__} codec>", "exec"), namespace)
+    return Codec(namespace["decode"], namespace["encode"], namespace["snapshot"], source)
+
+
+def _bench(fn, repeat: int) -> float:
+    """Best-of-5 microseconds per call"""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    from growpot.state import GameState, _codec
+
+    parser = argparse.ArgumentParser(description="Benchmark the generated GameState codec against dataclasses.asdict")
+    parser.add_argument("--items", type=int, nargs="+", default=[0, 100, 10000], help="inventory sizes")
+    parser.add_argument("--quests", type=int, nargs="+", default=[3, 300], help="quest list lengths")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    def legacy_encode(state):
+        data = dataclasses.asdict(state)
+        data["unlocked_pots"] = list(data["unlocked_pots"])
+        data["unlocked_pets"] = list(data["unlocked_pets"])
+        return data
+
+    print(f"{'items':>6} {'quests':>6}   {'asdict':>9} {'encode':>9} {'snapshot':>9} {'decode':>9}  (us per call)")
+    for items in args.items:
+        for quests in args.quests:
+            state = GameState(last_update_ts=time.time())
+            state.inventory = {f"item{i}": i for i in range(items)}
+            state.seed_inventory = {f"seed{i}": i for i in range(items // 10)}
+            state.daily_quests = [
+                {"id": f"quest{i}", "name": "Quest", "description": "Harvest 3 leaf", "requirement_type": "harvest",
+                 "plant_type": "leaf", "requirement_count": 3, "current_progress": i % 3, "reward_money": 50,
+                 "completed": False}
+                for i in range(quests)
+            ]
+            data = json.loads(json.dumps(_codec.encode(state)))
+            print(
+                f"{items:>6} {quests:>6}   "
+                f"{_bench(lambda: legacy_encode(state), args.repeat):9.1f} "
+                f"{_bench(lambda: _codec.encode(state), args.repeat):9.1f} "
+                f"{_bench(lambda: _codec.snapshot(state), args.repeat):9.1f} "
+                f"{_bench(lambda: _codec.decode(data), args.repeat):9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
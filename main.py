@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import argparse
+import multiprocessing
 import tkinter as tk
 from pathlib import Path
 
 from growpot.app import GrowPlotApp
 from growpot.assets_gen import generate_assets
+from growpot.live_snapshot import DEFAULT_LIVE_FILE
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="GrowPlot desktop pet plant")
+    parser.add_argument("--live-file", type=Path, default=DEFAULT_LIVE_FILE,
+                        help="where this instance publishes its live snapshot (give each instance its own)")
+    args = parser.parse_args(argv)
+
     assets_dir = Path("assets")
     generate_assets(assets_dir)
 
@@ -15,9 +23,11 @@ def main() -> None:
     root.title("GrowPlot")
 
     # Start app
-    GrowPlotApp(root, assets_dir=assets_dir)
+    GrowPlotApp(root, assets_dir=assets_dir, live_file=args.live_file)
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # generate_assets may draw in worker processes, which a frozen executable has to dispatch
+    multiprocessing.freeze_support()
     main()
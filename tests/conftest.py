@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def write_frames():
+    """write_frames(folder, sizes): a frame_NN.png per size, each a different colour"""
+    def write(folder, sizes=((8, 8),) * 3):
+        folder.mkdir(parents=True)
+        for i, size in enumerate(sizes):
+            Image.new("RGBA", size, (i, 255, 0, 255)).save(folder / f"frame_{i:02d}.png")
+    return write
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+
+from PIL import Image
+
+from growpot import anim
+from growpot.anim import FrameSetCache, LRUCache
+
+
+def test_lru_evicts_oldest_by_size():
+    cache = LRUCache(10, len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.get("a")
+    cache.put("c", "xxxx")
+    assert cache.get("b") is None
+    assert cache.get("a") == "xxxx" and cache.get("c") == "xxxx"
+    assert cache.size_bytes == 8 and cache.evictions == 1
+
+    cache.put("huge", "x" * 11)
+    assert cache.get("huge") is None and len(cache) == 2
+    cache.invalidate(lambda key: key == "a")
+    assert cache.size_bytes == 4 and len(cache) == 1
+
+
+def test_frame_set_cache_decodes_a_folder_once_across_threads(tmp_path, monkeypatch, write_frames):
+    folder = tmp_path / "pot"
+    write_frames(folder)
+    submitted = []
+    real_submit = anim.submit_frames
+    monkeypatch.setattr(anim, "submit_frames", lambda path: submitted.append(path) or real_submit(path))
+
+    cache = FrameSetCache(1 << 20)
+    start = threading.Barrier(4)
+    results = []
+
+    def load():
+        start.wait()
+        results.append(cache.load(folder))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4 and all(frames is results[0] for frames in results)
+    assert len(submitted) == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_frame_set_cache_reloads_edited_folders(tmp_path, write_frames):
+    folder = tmp_path / "pot"
+    write_frames(folder)
+    cache = FrameSetCache(1 << 20)
+    first = cache.load(folder)
+    assert cache.load(folder) is first
+
+    Image.new("RGBA", (8, 8)).save(folder / "frame_03.png")
+    assert len(cache.load(folder).frames) == 4
+    assert cache.stats()["bytes"] == 4 * 8 * 8 * 4
+
+
+def test_stale_atlas_falls_back_to_frames(tmp_path, write_frames):
+    from growpot.atlas import build_atlas
+
+    folder = tmp_path / "pot"
+    write_frames(folder)
+    build_atlas(folder)
+    assert len(anim.load_frames(folder).frames) == 3
+
+    # The atlas goes stale after the loader saw atlas.json: load_atlas finds it out of date
+    Image.new("RGBA", (8, 8)).save(folder / "frame_03.png")
+    assert anim.load_atlas(folder) is None
+    assert len(anim.load_frames(folder).frames) == 4
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import time
+
+from growpot.animation_system import AnimationManager
+from growpot.game_config import GameConfig
+
+
+def test_broken_prefetched_stage_keeps_the_current_one(tmp_path, write_frames):
+    config = GameConfig()
+    write_frames(tmp_path / "plants" / "leaf" / "seed", [(8, 8)] * 2)
+    write_frames(tmp_path / "plants" / "leaf" / "sprout", [(8, 8), (9, 9)])  # Mixed sizes: ValueError
+    manager = AnimationManager(config)
+    assert manager.load_plant_frames(tmp_path, "leaf", 0.0)
+
+    growth = config.sprout_at - config.stage_prefetch_ahead / 2
+    manager.poll_stage_frames(growth)
+    deadline = time.monotonic() + 5.0
+    while manager._prefetching and time.monotonic() < deadline:
+        time.sleep(0.01)
+        manager.poll_stage_frames(growth)
+
+    assert "sprout" in manager._missing_stages
+    assert manager.get_displayed_stage(config.sprout_at) == "seed"
+    # Not submitted again on every tick
+    manager.poll_stage_frames(config.sprout_at)
+    assert not manager._prefetching
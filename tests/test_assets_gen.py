@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import shutil
+
+from growpot.assets_gen import generate_assets
+
+
+def test_deleted_folder_is_drawn_again(tmp_path):
+    generate_assets(tmp_path, size=16, frames_per_stage=2)
+    sprout = tmp_path / "plants" / "leaf" / "sprout"
+    pot = tmp_path / "pots" / "earth" / "frame_001.png"
+    pot_mtime = pot.stat().st_mtime_ns
+
+    shutil.rmtree(sprout)
+    generate_assets(tmp_path, size=16, frames_per_stage=2)
+    assert sorted(path.name for path in sprout.glob("frame_*.png")) == ["frame_001.png", "frame_002.png"]
+    # Folders that were still there are left alone
+    assert pot.stat().st_mtime_ns == pot_mtime
+
+
+def test_user_frames_are_never_overwritten(tmp_path):
+    generate_assets(tmp_path, size=16, frames_per_stage=2)
+    user_frame = tmp_path / "pots" / "flame" / "frame_001.png"
+    user_frame.write_bytes(b"not generated")
+
+    generate_assets(tmp_path, size=16, frames_per_stage=3)
+    assert user_frame.read_bytes() == b"not generated"
+    assert len(list((tmp_path / "pots" / "earth").glob("frame_*.png"))) == 3
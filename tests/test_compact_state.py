@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+
+from growpot.compact_state import Catalog, CompactGameState
+from growpot.game_config import GameConfig
+from growpot.state import GameState
+
+
+def _pair() -> tuple[GameState, CompactGameState]:
+    state = GameState(
+        inventory={"leaf": 3, "bug": 1, "unknown": 2}, seed_inventory={"dark": 5},
+        unlocked_pots={"earth", "old_pot"}, unlocked_pets={"cat"},
+    )
+    compact = CompactGameState.from_state(GameState(**vars(state)), Catalog.from_config(GameConfig()))
+    return state, compact
+
+
+def _plain(value):
+    return dict(value) if isinstance(value, dict) or hasattr(value, "items") else set(value)
+
+
+def _check(field, change):
+    state, compact = _pair()
+    change(state, field)
+    change(compact, field)
+    assert _plain(getattr(compact, field)) == _plain(getattr(state, field))
+    assert compact.to_state() == state
+
+
+def _assign(value):
+    def change(state, field):
+        setattr(state, field, value)
+    return change
+
+
+def _self_assign(state, field):
+    setattr(state, field, getattr(state, field))
+
+
+def _augmented(op, other):
+    def change(state, field):
+        value = getattr(state, field)
+        if op == "|":
+            value |= other
+        elif op == "&":
+            value &= other
+        else:
+            value -= other
+        setattr(state, field, value)  # What `state.field op= other` does
+    return change
+
+
+@pytest.mark.parametrize("field", ["inventory", "seed_inventory"])
+@pytest.mark.parametrize("change", [
+    _assign({"fire": 2, "mystery": 7}),
+    _assign({}),
+    _self_assign,
+    _augmented("|", {"leaf": 9, "mystery": 1}),
+], ids=["assign", "assign-empty", "self", "ior"])
+def test_counter_fields_match_game_state(field, change):
+    _check(field, change)
+
+
+@pytest.mark.parametrize("field", ["unlocked_pots", "unlocked_pets"])
+@pytest.mark.parametrize("change", [
+    _assign({"sea", "new_thing"}),
+    _assign(set()),
+    _self_assign,
+    _augmented("|", {"sea", "new_thing"}),
+    _augmented("&", {"earth", "cat"}),
+    _augmented("-", {"earth", "old_pot", "cat"}),
+], ids=["assign", "assign-empty", "self", "ior", "iand", "isub"])
+def test_flag_fields_match_game_state(field, change):
+    _check(field, change)
+
+
+def test_augmented_assignment_through_the_attribute():
+    state, compact = _pair()
+    for target in (state, compact):
+        target.unlocked_pots |= {"sea"}
+        target.inventory |= {"fire": 4}
+    assert set(compact.unlocked_pots) == state.unlocked_pots == {"earth", "old_pot", "sea"}
+    assert dict(compact.inventory) == state.inventory
+    assert compact.unlocked_pots | {"x"} == state.unlocked_pots | {"x"}
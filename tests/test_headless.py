@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import dataclasses
+
+from growpot.game_config import GameConfig
+from growpot.headless import GreedyPolicy
+from growpot.session import GameSession
+from growpot.state import GameState
+
+
+def test_greedy_policy_without_any_known_pot():
+    config = GameConfig()
+    # No free pot and no money: the player ends up owning none of the configured pots
+    pots = {pot_type: dataclasses.replace(stats, price=100) for pot_type, stats in config.POT_STATS.items()}
+    config = dataclasses.replace(config, POT_STATS=pots)
+    state = GameState(money=0, growth=-1.0, pot_type="old_pot", unlocked_pots={"old_pot"})
+
+    GreedyPolicy().act(GameSession(config, state), 0.0)
+    assert state.pot_type == "old_pot"
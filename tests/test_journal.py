@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from growpot.clock import ManualClock
+from growpot.game_config import GameConfig
+from growpot.journal import InputJournal, Replayer, read_journal
+from growpot.session import GameSession
+from growpot.state import GameState
+
+
+def _write(path, entries):
+    journal = InputJournal(path)
+    for timestamp, action, *args in entries:
+        journal.record(timestamp, action, *args)
+    journal.close()
+
+
+def test_truncated_payload_ends_the_stream(tmp_path):
+    path = tmp_path / "journal.bin"
+    _write(path, [(1.0, "water"), (2.0, "plant_seed", "leaf"), (3.0, "sell", "leaf", 2, 15)])
+    data = path.read_bytes()
+
+    # Every cut, including ones inside an argument's tag, length or payload, keeps the whole records before it
+    complete = [entry.action for entry in read_journal(path)]
+    for cut in range(len(data)):
+        path.write_bytes(data[:cut])
+        actions = [entry.action for entry in read_journal(path)]
+        assert actions == complete[:len(actions)]
+    assert complete == ["water", "plant_seed", "sell"]
+
+
+def test_replay_matches_a_session_driven_like_the_app(tmp_path):
+    config = GameConfig()
+    state = GameState(money=500, seed_inventory={"leaf": 50}, last_update_ts=1000.0)
+    snapshot = copy.deepcopy(state)
+    clock = ManualClock(1000.0)
+    journal = InputJournal(tmp_path / "journal.bin")
+    session = GameSession(config, state, clock=clock, rng=random.Random(7), journal=journal)
+
+    # The app sleeps until the next event, then catches the simulation up before every action
+    rng = random.Random(1)
+    for _ in range(300):
+        dt = rng.uniform(0.2, 3.0)
+        clock.advance(dt)
+        session.tick(dt, clock.now())
+        action = rng.choice(["water", "plant_seed", "harvest", "catch_bug", None, None])
+        if action == "plant_seed":
+            session.plant_seed("leaf")
+        elif action is not None:
+            getattr(session, action)()
+    journal.close()
+
+    replayed = Replayer(config).replay(snapshot, read_journal(tmp_path / "journal.bin"), until=clock.now())
+    assert replayed.money == state.money
+    assert replayed.inventory == state.inventory
+    assert replayed.seed_inventory == state.seed_inventory
+    assert replayed.bug_active == state.bug_active
+    # The replayer splits time at other instants, so the closed-form segments round differently
+    assert replayed.growth == pytest.approx(state.growth, rel=1e-6)
+    assert replayed.water == pytest.approx(state.water, rel=1e-6, abs=1e-9)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from growpot.ledger import DAY, HOUR, HOURLY_RETENTION_SEC, Ledger
+
+
+def test_torn_flush_is_cut_back_on_open(tmp_path):
+    ledger = Ledger(tmp_path)
+    ledger.record(1000.0, "sell", "leaf", 2, 30)
+    ledger.record(1001.0, "harvest", "leaf", 3, 0, "excellent")
+    ledger.close()
+
+    # A crash mid-flush: some columns got a third row, one only part of it
+    with (tmp_path / "timestamp.d").open("ab") as f:
+        f.write(b"\0" * 8)
+    with (tmp_path / "money.q").open("ab") as f:
+        f.write(b"\0" * 3)
+    with (tmp_path / "items.txt").open("a", encoding="utf-8") as f:
+        f.write("fi")
+
+    ledger = Ledger(tmp_path)
+    assert len(ledger) == 2
+    ledger.record(1002.0, "sell", "dark", 1, 90)
+    ledger.close()
+
+    events = list(Ledger(tmp_path).events())
+    assert [(event.timestamp, event.kind, event.item, event.money) for event in events] == [
+        (1000.0, "sell", "leaf", 30),
+        (1001.0, "harvest", "leaf", 0),
+        (1002.0, "sell", "dark", 90),
+    ]
+    assert events[1].quality == "excellent"
+
+
+def test_background_flush_writes_everything(tmp_path):
+    ledger = Ledger(tmp_path)
+    for i in range(500):
+        ledger.record(1000.0 + i, "sell", f"plant{i % 7}", 1, 10)
+        if i % 50 == 0:
+            ledger.flush_in_background()
+    ledger.close()
+
+    reopened = Ledger(tmp_path)
+    assert len(reopened) == 500
+    assert sum(money for _, money in reopened.income(0.0, 2000.0, DAY)) == 5000
+    assert sorted(reopened.items) == sorted({f"plant{i}" for i in range(7)})
+
+
+def test_old_hours_are_pruned_but_days_are_kept(tmp_path):
+    assert HOURLY_RETENTION_SEC >= 30 * DAY
+    now = 100 * DAY
+    ledger = Ledger(tmp_path)
+    ledger.record(now - 29 * DAY, "sell", "leaf", 1, 5)
+    ledger.record(now - 40 * DAY, "sell", "leaf", 1, 10)
+    ledger.record(now, "sell", "leaf", 1, 20)
+    ledger.close()
+
+    reopened = Ledger(tmp_path)
+    # "Income per hour over the last 30 days" still sees every hour
+    hourly = dict(reopened.income(now - 30 * DAY, now + HOUR, HOUR))
+    assert hourly[now - 29 * DAY] == 5 and hourly[now] == 20
+    assert (now - 40 * DAY) // HOUR not in reopened.hourly
+    assert dict(reopened.income(now - 41 * DAY, now + DAY, DAY))[now - 40 * DAY] == 10
+    reopened.close()
+
+    shorter = Ledger(tmp_path, hourly_retention_sec=DAY)
+    assert list(shorter.hourly) == [now // HOUR]
+
+
+def test_events_survive_a_flush_midway(tmp_path):
+    ledger = Ledger(tmp_path)
+    for i in range(10):
+        ledger.record(1000.0 + i, "sell", "leaf", 1, i)
+    ledger.flush()
+    for i in range(10, 15):
+        ledger.record(1000.0 + i, "sell", "leaf", 1, i)
+
+    events = ledger.events()
+    first = next(events)
+    ledger.record(2000.0, "sell", "leaf", 1, 99)
+    ledger.flush()  # Remaps the columns and shortens the tail under the running reader
+    rest = list(events)
+    assert [event.money for event in [first, *rest]] == list(range(15))
+    assert [event.money for event in ledger.events()] == [*range(15), 99]
+    ledger.close()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from growpot import live_snapshot
+from growpot.game_config import GameConfig
+from growpot.live_snapshot import LiveSnapshotReader, LiveSnapshotWriter
+from growpot.state import GameState
+
+
+def test_reader_sees_the_published_snapshot(tmp_path):
+    path = tmp_path / "live.bin"
+    writer = LiveSnapshotWriter(GameConfig(), path)
+    state = GameState(growth=1.5, water=2.25, money=120, level=3, exp=40, bug_active=True,
+                      active_pet="cat", pet_last_fed_ts=1000.0)
+    writer.publish(state, 1600.0)
+
+    reader = LiveSnapshotReader(path)
+    snap = reader.read()
+    assert snap.pid == os.getpid()
+    assert (snap.published_ts, snap.growth, snap.water, snap.money, snap.level, snap.exp) == (
+        1600.0, 1.5, 2.25, 120, 3, 40
+    )
+    assert snap.pet_seconds_left == GameConfig().PET_STATS["cat"].work_duration_sec - 600.0
+    assert snap.bug_active and not snap.pet_hungry and not snap.water_ever_depleted
+
+    state.money = 130
+    writer.publish(state, 1601.0)
+    assert reader.read().money == 130
+    reader.close()
+    writer.close()
+
+
+def test_reader_retries_an_odd_sequence_until_it_times_out(tmp_path):
+    path = tmp_path / "live.bin"
+    writer = LiveSnapshotWriter(GameConfig(), path)
+    writer.publish(GameState(), 1.0)
+    # A writer that died mid-publish leaves the sequence odd
+    live_snapshot._SEQ.pack_into(writer._map, live_snapshot._SEQ_OFFSET, 3)
+
+    reader = LiveSnapshotReader(path)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        reader.read(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+
+    # The write completes: the next read succeeds
+    live_snapshot._SEQ.pack_into(writer._map, live_snapshot._SEQ_OFFSET, 4)
+    assert reader.read(timeout=0.05).published_ts == 1.0
+    reader.close()
+    writer.close()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import random
+
+import pytest
+
+from growpot.game_config import GameConfig
+from growpot.game_logic import GameEngine
+from growpot.state import GameState
+
+
+TICK = 0.1  # The app's tick_ms
+
+
+def _tick(engine: GameEngine, state: GameState, seconds: float, start: float):
+    """The reference: the app's 100 ms loop"""
+    now = start
+    for _ in range(round(seconds / TICK)):
+        now += TICK
+        engine.advance_simulation(state, TICK, now)
+        engine.check_pet_auto_watering(state, now)
+
+
+@pytest.mark.parametrize("fields, seconds", [
+    (dict(growth=0.0, water=0.0, plant_type="leaf"), 20.0),
+    (dict(growth=0.0, water=5.0, plant_type="dark", pot_type="sea"), 60.0),
+    (dict(growth=0.5, water=3.0, plant_type="fire", pot_type="mistic"), 120.0),
+    # Pet refilling the pot many times, and a pet that gets hungry halfway
+    (dict(growth=0.0, water=2.0, plant_type="dark", active_pet="cat", pet_last_fed_ts=0.0), 600.0),
+    (dict(growth=0.0, water=2.0, plant_type="dark", active_pet="cat", pet_last_fed_ts=-7100.0), 300.0),
+])
+def test_advance_offline_matches_ticking(fields, seconds):
+    config = dataclasses.replace(GameConfig(), bug_appearance_chance=0.0)
+    ticked = GameState(**fields)
+    offline = GameState(**fields)
+
+    _tick(GameEngine(config), ticked, seconds, 0.0)
+    GameEngine(config).advance_offline(offline, seconds, 0.0)
+
+    # Ticking is a forward Euler step of what advance_offline integrates exactly
+    assert offline.growth == pytest.approx(ticked.growth, rel=1e-3)
+    assert offline.water == pytest.approx(ticked.water, abs=1e-6)
+    assert offline.water_ever_depleted == ticked.water_ever_depleted
+    assert offline.pet_last_worked_ts == pytest.approx(ticked.pet_last_worked_ts, abs=TICK)
+
+
+def test_bug_spawn_matches_ticking_statistically():
+    config = GameConfig()
+    window = config.bug_growth_end - config.bug_growth_start
+    trials = 3000
+
+    def run(advance) -> tuple[float, float]:
+        spawned = []
+        for seed in range(trials):
+            state = GameState(growth=config.bug_growth_start - 0.1, water=0.0, plant_type="leaf")
+            advance(GameEngine(config, rng=random.Random(seed)), state)
+            if state.bug_active:
+                spawned.append(state.bug_appearance_time)
+        return len(spawned) / trials, sum(spawned) / len(spawned)
+
+    seconds = 5.0  # Well past the bug window at leaf speed
+    ticked_rate, ticked_mean = run(lambda engine, state: _tick(engine, state, seconds, 0.0))
+    offline_rate, offline_mean = run(lambda engine, state: engine.advance_offline(state, seconds, 0.0))
+
+    expected_rate = 1.0 - math.exp(-config.bug_appearance_chance)
+    assert ticked_rate == pytest.approx(expected_rate, abs=0.03)
+    assert offline_rate == pytest.approx(ticked_rate, abs=0.03)
+    # Mean spawn time inside the window (it lasts window / growth rate seconds)
+    window_sec = window / GameEngine(config)._effective_growth_rate(GameState(plant_type="leaf"))
+    assert offline_mean == pytest.approx(ticked_mean, abs=0.1 * window_sec)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import threading
+
+from growpot.persistence import StateSaver
+from growpot.state import GameState
+
+
+def test_close_leaves_the_log_open_for_a_busy_writer(tmp_path):
+    saver = StateSaver(tmp_path / "state.json", coalesce_sec=0.0)
+    writing, release = threading.Event(), threading.Event()
+    real_write = saver.log.write
+
+    def slow_write(data):
+        writing.set()
+        release.wait(5.0)
+        real_write(data)
+
+    saver.log.write = slow_write
+    saver.save(GameState(money=1))
+    assert writing.wait(5.0)
+    closed = []
+    saver.log.close = lambda: closed.append(True)
+
+    saver.close(timeout=0.05)
+    assert isinstance(saver.last_error, TimeoutError)
+    assert not closed
+
+    release.set()
+    saver._thread.join(5.0)
+    assert saver.writes == 1
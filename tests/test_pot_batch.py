@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from growpot.clock import ManualClock
+from growpot.game_config import GameConfig
+from growpot.game_logic import GameEngine
+from growpot.pot_batch import STAGE_EMPTY, STAGE_PLANT, STAGE_SEED, STAGE_SPROUT, PotBatch
+from growpot.state import GameState
+
+
+def _states(config: GameConfig) -> list[GameState]:
+    plant_types = list(config.PLANT_STATS)
+    pot_types = list(config.POT_STATS)
+    states = [
+        GameState(growth=(i % 31) / 10, water=(i % 13) / 2.0,
+                  plant_type=plant_types[i % len(plant_types)], pot_type=pot_types[i // 3 % len(pot_types)])
+        for i in range(60)
+    ]
+    states[0].growth = -1.0  # Empty pot
+    return states
+
+
+@pytest.mark.parametrize("bug_chance", [0.0, 1e9])
+def test_step_matches_scalar_engine(bug_chance):
+    # A huge chance makes every pot spawn its bug on the step it enters the window, in both engines
+    config = dataclasses.replace(GameConfig(), bug_appearance_chance=bug_chance)
+    clock = ManualClock(1000.0)
+    scalar = _states(config)
+    batch = PotBatch.from_states(config, _states(config), seed=0, clock=clock)
+    engine = GameEngine(config, clock)
+
+    for _ in range(150):
+        clock.advance(0.1)
+        for state in scalar:
+            engine.advance_simulation(state, 0.1)
+        batch.step(0.1)
+
+    batched = _states(config)
+    batch.write_back(batched)
+    # Same operation order, so the values match exactly
+    for expected, actual in zip(scalar, batched):
+        assert actual == expected
+
+
+def test_stage_codes():
+    config = GameConfig()
+    batch = PotBatch.from_states(config, [
+        GameState(growth=-1.0), GameState(growth=0.0), GameState(growth=config.sprout_at), GameState(growth=config.plant_at),
+    ])
+    assert batch.stage().tolist() == [STAGE_EMPTY, STAGE_SEED, STAGE_SPROUT, STAGE_PLANT]
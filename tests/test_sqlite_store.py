@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import sqlite3
+
+from growpot.sqlite_store import SQLiteStateStore
+from growpot.state import GameState
+
+
+_QUEST = {
+    "id": "harvest_leaf", "name": "Harvest", "description": "Harvest 3 leaf", "requirement_type": "harvest",
+    "plant_type": "leaf", "requirement_count": 3, "current_progress": 1, "reward_money": 50, "completed": False,
+}
+
+
+def test_quest_keys_without_a_column_round_trip(tmp_path):
+    store = SQLiteStateStore(tmp_path / "profiles.db")
+    quests = [dict(_QUEST, bonus={"exp": 5}, tier=2), dict(_QUEST, id="sell_leaf", claimed=True)]
+    store.save("alice", GameState(daily_quests=quests))
+    assert store.load("alice").daily_quests == quests
+    store.close()
+
+
+def test_quest_index_is_scoped_to_the_profile(tmp_path):
+    store = SQLiteStateStore(tmp_path / "profiles.db")
+    conn = sqlite3.connect(tmp_path / "profiles.db")
+    columns = [row[2] for row in conn.execute("PRAGMA index_info(daily_quests_by_type)")]
+    assert columns == ["profile_id", "requirement_type", "plant_type"]
+    conn.close()
+    store.close()
+
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from growpot.state import GameState
+from growpot.state_binary import decode_state, encode_state
+
+
+@pytest.mark.parametrize("fields", [
+    dict(unlocked_pots={""}, unlocked_pets=set()),
+    dict(unlocked_pots={"", "earth"}, unlocked_pets={"a\0b"}),
+    dict(inventory={"": 1, "x\0y": 2}, seed_inventory={}),
+    dict(daily_quests=[{}, {}]),
+    dict(daily_quests=[{"": 1, "a\0b": "c"}, {"id": "q"}]),
+])
+def test_round_trip_keeps_any_name(fields):
+    state = GameState(last_update_ts=1000.0, **fields)
+    assert dataclasses.asdict(decode_state(encode_state(state))) == dataclasses.asdict(state)
+